@@ -22,7 +22,7 @@ from utils.logger import get_custom_logger
 
 logging.getLogger("asyncio").setLevel(logging.CRITICAL)
 logger = get_custom_logger()
-from database import get_db_price_usd_public, update_prices_from_market
+from database import get_db_prices_usd_public, update_prices_from_market
 
 PASS_CURRENCY_CAPITAL = "VND"
 PASS_CURRENCY = PASS_CURRENCY_CAPITAL.lower()
@@ -37,13 +37,6 @@ async def reccomender() -> str:
         async with session.get(currencies_api) as response:
             currencies_json = await response.json()
     star_usd_value = PASS_VALUE * currencies_json[PASS_CURRENCY]["usd"] / stars
-    # Use asyncio and a semaphore to run get_db_price_usd_public calls concurrently, max 10 at a time
-    semaphore = asyncio.Semaphore(10)
-
-    async def get_price(name, currency="USD") -> float:
-        async with semaphore:
-            return await get_db_price_usd_public(name)
-
     # List of all item names to fetch prices for
     price_names = [
         "Sticker | High Heat",
@@ -108,8 +101,9 @@ async def reccomender() -> str:
         items_by_currency=items_by_currency, update_prices_in_usd=True
     )
 
-    # Run all price fetches concurrently
-    prices = await asyncio.gather(*(get_price(name) for name in price_names))
+    # Price everything in one batch through the pooled public clients
+    prices_by_name = await get_db_prices_usd_public(price_names)
+    prices = [prices_by_name[name] for name in price_names]
 
     # Unpack prices into variables as before
     (
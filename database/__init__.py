@@ -1,3 +1,4 @@
 from .utils.account_utils import *  # noqa: F403
 from .utils.farmlabs_api_utils import *  # noqa: F403
 from .utils.price_utils import *  # noqa: F403
+from .utils.price_refresher import *  # noqa: F403
@@ -17,6 +17,9 @@ def load_config():
 _config = load_config()
 ROOT_DIR = _config["ROOT_DIR"]
 sys.path.insert(0, ROOT_DIR)
+from database.utils import price_store
+from database.utils.item_catalog import MAIN_ITEMS
+from utils.instrumentation import instrumentation
 from utils.logger import get_custom_logger
 
 logger = get_custom_logger()
@@ -579,19 +582,16 @@ def get_all_items() -> dict:
     Returns:
         dict: A dictionary with market_hash_name as keys and item_id as values
     """
-    # Define the path to the database
-    db_path = PRICES_DB_PATH
-
     # Create a connection to the database
     conn = None
     result = {}
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = price_store.connect()
         cursor = conn.cursor()
 
         # Execute query to get market_hash_name and item_id
-        cursor.execute("SELECT market_hash_name, item_id FROM prices")
+        cursor.execute("SELECT market_hash_name, item_id FROM items")
 
         # Fetch all results and add to dictionary
         for row in cursor.fetchall():
@@ -614,33 +614,22 @@ def get_main_items() -> dict:
 
     Returns:
         dict: A dictionary with market_hash_name as keys and item_id as values
-              for the specified main items.
+              for the main items of the item catalog.
     """
-    # Define the path to the database
-    db_path = PRICES_DB_PATH
-
-    # List of main items to filter
-    main_items = [
-        "Dreams & Nightmares Case",
-        "Kilowatt Case",
-        "Revolution Case",
-        "Fracture Case",
-        "Recoil Case",
-        "Gallery Case",
-    ]
+    main_items = list(MAIN_ITEMS)
 
     # Create a connection to the database
     conn = None
     result = {}
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = price_store.connect()
         cursor = conn.cursor()
 
         # Use a parameterized query to filter by main items
         query = """
             SELECT market_hash_name, item_id 
-            FROM prices 
+            FROM items 
             WHERE market_hash_name IN ({})
         """.format(
             ",".join("?" for _ in main_items)
@@ -662,34 +651,46 @@ def get_main_items() -> dict:
     return result
 
 
-def get_specific_items(item_names) -> dict[Any, None]:
+def get_specific_items(item_names, currency: str | None = None) -> dict[Any, None]:
     """
     Connect to prices.db and return a dictionary
     of market_hash_name to item_id and time mappings for the specified items.
 
     Args:
         item_names (set): A set of market_hash_names to filter by.
+        currency (str, optional): Only consider the price fetch time of this currency.
+            By default the most recent fetch time across all currencies is used.
 
     Returns:
         dict: A dictionary with market_hash_name as keys and a dict containing
               'item_id' and 'time' as values for the specified items.
-              If an item is not found, its value will be None.
+              If an item is not found, its value will be None. 'time' is None
+              if the item has no stored price.
     """
-    db_path = PRICES_DB_PATH
     conn = None
     result = {name: None for name in item_names}
 
+    if not result:
+        return result
+
     try:
-        conn = sqlite3.connect(db_path)
+        price_store.flush_pending_prices()
+        conn = price_store.connect()
         cursor = conn.cursor()
 
         query = """
-            SELECT market_hash_name, item_id, time 
-            FROM prices 
-            WHERE market_hash_name IN ({})
-        """.format(",".join("?" for _ in item_names))
-
-        cursor.execute(query, list(item_names))
+            SELECT i.market_hash_name, i.item_id, MAX(p.fetched_at)
+            FROM items i
+            LEFT JOIN prices p
+                ON p.market_hash_name = i.market_hash_name
+                AND (? IS NULL OR p.currency = ?)
+            WHERE i.market_hash_name IN ({})
+            GROUP BY i.market_hash_name
+        """.format(",".join("?" for _ in result))
+
+        if currency is not None:
+            currency = currency.upper()
+        cursor.execute(query, [currency, currency, *result])
 
         for row in cursor.fetchall():
             market_hash_name, item_id, timestamp = row
@@ -1402,6 +1403,40 @@ def update_account_inventory_value(steam_username: str, total_value: str) -> boo
         return False
 
 
+def get_held_item_counts() -> dict[tuple[str, str], int]:
+    """
+    Counts held items across all accounts, grouped by the currency of the account holding them.
+
+    Returns:
+        dict: (market_hash_name, currency) -> number of items held. Accounts without a
+              currency are counted as USD.
+    """
+    conn = None
+    result = {}
+
+    try:
+        conn = sqlite3.connect(DB_FILE)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT i.market_hash_name, COALESCE(a.currency, 'USD'), COUNT(*)
+            FROM items i
+            JOIN accounts a ON a.steam_username = i.steam_username
+            GROUP BY i.market_hash_name, COALESCE(a.currency, 'USD')
+            """
+        )
+        for market_hash_name, currency, count in cursor.fetchall():
+            result[(market_hash_name, currency.upper())] = count
+
+    except sqlite3.Error as e:
+        logger.critical(f"database error: {e}")
+    finally:
+        if conn:
+            conn.close()
+
+    return result
+
+
 def get_account_inventory_database(steam_username: str) -> dict[str, int]:
     """ "gets the account inventory as a list of dicts with their market hash name and the count
 
@@ -1424,3 +1459,7 @@ def get_account_inventory_database(steam_username: str) -> dict[str, int]:
 
     except Exception as e:
         logger.error(f"Error during db operation {e}")
+
+
+# Times every helper above as "db.account_utils.<name>" when instrumentation is enabled
+instrumentation.instrument_functions(globals(), "db.account_utils")
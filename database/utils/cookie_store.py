@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+
+COOKIE_CACHE_DIR = _config.get(
+    "COOKIE_CACHE_DIR",
+    r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\utils\cache\cookies",
+)
+COOKIES_DB_PATH = str(Path(COOKIE_CACHE_DIR) / "cookies.db")
+
+# One row per account with its jsonable cookie jar and a fingerprint of it,
+# so unchanged jars are never written again
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cookies (
+        steam_username TEXT PRIMARY KEY,
+        cookies TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        updated_at INTEGER NOT NULL
+    )
+"""
+
+# steam_username -> (cookies, fingerprint), filled by one bulk read per process
+_jars: dict[str, tuple[list, str]] | None = None
+_load_lock = asyncio.Lock()
+_stats = {"reads": 0, "writes": 0, "unchanged": 0}
+
+
+def _serialize(cookies: list) -> str:
+    return json.dumps(cookies, sort_keys=True, separators=(",", ":"))
+
+
+def _fingerprint(serialized: str) -> str:
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _connect() -> sqlite3.Connection:
+    Path(COOKIES_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(COOKIES_DB_PATH)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def _import_legacy_files(conn: sqlite3.Connection, known: set[str]) -> int:
+    """Copies <username>_cookies.json files of accounts that are not in the store yet."""
+    rows = []
+    for path in Path(COOKIE_CACHE_DIR).glob("*_cookies.json"):
+        username = path.name.removesuffix("_cookies.json")
+        if username in known:
+            continue
+        try:
+            cookies = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Skipping unreadable cookie file {path.name}: {e}")
+            continue
+        if not cookies:
+            continue
+        serialized = _serialize(cookies)
+        rows.append(
+            (username, serialized, _fingerprint(serialized), int(path.stat().st_mtime))
+        )
+
+    if rows:
+        conn.executemany(
+            "INSERT OR IGNORE INTO cookies (steam_username, cookies, fingerprint, updated_at) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+        logger.info(f"Imported {len(rows)} legacy cookie files into {COOKIES_DB_PATH}")
+    return len(rows)
+
+
+def _read_all() -> dict[str, tuple[list, str]]:
+    conn = _connect()
+    try:
+        known = {
+            username
+            for (username,) in conn.execute("SELECT steam_username FROM cookies")
+        }
+        _import_legacy_files(conn, known)
+        return {
+            username: (json.loads(cookies), fingerprint)
+            for username, cookies, fingerprint in conn.execute(
+                "SELECT steam_username, cookies, fingerprint FROM cookies"
+            )
+        }
+    finally:
+        conn.close()
+
+
+def _write(username: str, serialized: str, fingerprint: str) -> None:
+    conn = _connect()
+    try:
+        conn.execute(
+            """
+            INSERT INTO cookies (steam_username, cookies, fingerprint, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (steam_username) DO UPDATE SET
+                cookies = excluded.cookies,
+                fingerprint = excluded.fingerprint,
+                updated_at = excluded.updated_at
+            """,
+            (username, serialized, fingerprint, int(time.time())),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def load_all_cookies() -> dict[str, list]:
+    """Reads every stored cookie jar in one query (once per process) and returns steam_username -> cookies."""
+    global _jars
+    if _jars is None:
+        async with _load_lock:
+            if _jars is None:
+                _jars = await asyncio.to_thread(_read_all)
+                _stats["reads"] += 1
+                logger.trace(f"Loaded cookies for {len(_jars)} accounts")
+    return {username: cookies for username, (cookies, _) in _jars.items()}
+
+
+async def load_cookies(username: str) -> list | None:
+    """Returns the stored cookie jar for an account, or None if there is none."""
+    await load_all_cookies()
+    jar = _jars.get(username)
+    return jar[0] if jar else None
+
+
+async def save_cookies(username: str, cookies: list) -> bool:
+    """
+    Stores an account's cookie jar if it differs from the stored one.
+
+    Returns:
+        bool: True if the jar changed and was written
+    """
+    await load_all_cookies()
+    serialized = _serialize(cookies)
+    fingerprint = _fingerprint(serialized)
+
+    stored = _jars.get(username)
+    if stored is not None and stored[1] == fingerprint:
+        _stats["unchanged"] += 1
+        return False
+
+    await asyncio.to_thread(_write, username, serialized, fingerprint)
+    _jars[username] = (cookies, fingerprint)
+    _stats["writes"] += 1
+    return True
+
+
+def get_cookie_store_stats() -> dict[str, int]:
+    return {**_stats, "accounts": len(_jars or {})}
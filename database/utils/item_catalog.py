@@ -0,0 +1,202 @@
+import atexit
+import json
+import os
+import sys
+import threading
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+
+OUTDATED_TIME_SECONDS = _config.get("OUTDATED_TIME_SECONDS")
+OUTDATED_TIME_SECONDS_MAIN = _config.get("OUTDATED_TIME_SECONDS_MAIN")
+PRICE_TTL_MIN_SECONDS = _config.get("PRICE_TTL_MIN_SECONDS", 15)
+PRICE_TTL_MAX_SECONDS = _config.get("PRICE_TTL_MAX_SECONDS", 3600)
+PRICE_TTL_TOLERANCE = _config.get("PRICE_TTL_TOLERANCE", 0.005)
+PRICE_TTL_MIN_SAMPLES = _config.get("PRICE_TTL_MIN_SAMPLES", 3)
+PRICE_VOLATILITY_PATH = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\utils\cache\miscellaneous\price_volatility.json"
+
+# The cases the farm sells into buy orders. Their prices move fastest and they
+# are always priced from histograms and relisted until sold.
+MAIN_ITEMS = (
+    "Dreams & Nightmares Case",
+    "Kilowatt Case",
+    "Revolution Case",
+    "Fracture Case",
+    "Recoil Case",
+    "Gallery Case",
+    "Fever Case",
+)
+
+# Weight of the newest observation in the volatility moving average
+_VOLATILITY_ALPHA = 0.2
+# Price moves of up to one tick are noise, not volatility. Prices are stored in
+# minor units, where one unit is far below the real price step in currencies such
+# as IDR and VND, so the tick is roughly one USD cent in each currency's minor units.
+_DEFAULT_TICK_MINOR_UNITS = 1.0
+_TICK_MINOR_UNITS = {
+    "INR": 100.0,
+    "IDR": 15000.0,
+    "VND": 25000.0,
+    "RUB": 100.0,
+    "KZT": 500.0,
+    "UAH": 50.0,
+    **(_config.get("PRICE_TICK_MINOR_UNITS") or {}),
+}
+# Save the learned volatilities after this many new observations
+_SAVE_EVERY = 100
+
+
+def is_main_item(market_hash_name: str) -> bool:
+    return market_hash_name in MAIN_ITEMS
+
+
+class PriceTtlModel:
+    """
+    Per-item price TTLs learned from how much prices move between successive fetches.
+
+    Every fetched price is compared with the previous fetch of the same item and
+    currency. The squared relative change per second is averaged per item as a
+    volatility estimate v, and the TTL is the time after which the expected move
+    sqrt(v * ttl) reaches PRICE_TTL_TOLERANCE, clamped to [PRICE_TTL_MIN_SECONDS,
+    PRICE_TTL_MAX_SECONDS]. Main items never go above OUTDATED_TIME_SECONDS_MAIN.
+    Items with fewer than PRICE_TTL_MIN_SAMPLES observations keep the fixed
+    OUTDATED_TIME_SECONDS / OUTDATED_TIME_SECONDS_MAIN tiers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # market_hash_name -> [volatility per second, samples]
+        self._volatility: dict[str, list[float]] | None = None
+        # (market_hash_name, currency) -> (price in cents, fetched_at)
+        self._last: dict[tuple[str, str], tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+    def _loaded(self) -> dict[str, list[float]]:
+        if self._volatility is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._volatility = json.load(f)
+            except FileNotFoundError:
+                self._volatility = {}
+            except Exception as e:
+                logger.warning(f"Failed to read price volatility snapshot: {e}")
+                self._volatility = {}
+        return self._volatility
+
+    def observe(
+        self, market_hash_name: str, currency: str, price: float, fetched_at: int
+    ) -> None:
+        """Feeds a freshly fetched price (in cents) into the item's volatility estimate."""
+        key = (market_hash_name, currency.upper())
+        with self._lock:
+            previous = self._last.get(key)
+            self._last[key] = (price, fetched_at)
+            if previous is None:
+                return
+
+            previous_price, previous_at = previous
+            elapsed = fetched_at - previous_at
+            if elapsed < 1 or not previous_price:
+                return
+
+            change = abs(price - previous_price)
+            tick = _TICK_MINOR_UNITS.get(key[1], _DEFAULT_TICK_MINOR_UNITS)
+            change = 0.0 if change <= tick else change / previous_price
+            sample = change * change / elapsed
+
+            volatility = self._loaded()
+            entry = volatility.get(market_hash_name)
+            if entry is None:
+                volatility[market_hash_name] = [sample, 1]
+            else:
+                entry[0] = (1 - _VOLATILITY_ALPHA) * entry[0] + _VOLATILITY_ALPHA * sample
+                entry[1] += 1
+
+            self._unsaved += 1
+            save_now = self._unsaved >= _SAVE_EVERY
+
+        if save_now:
+            self.save()
+
+    def ttl_seconds(self, market_hash_name: str) -> int:
+        main = is_main_item(market_hash_name)
+        default = OUTDATED_TIME_SECONDS_MAIN if main else OUTDATED_TIME_SECONDS
+
+        entry = self._loaded().get(market_hash_name)
+        if entry is None or entry[1] < PRICE_TTL_MIN_SAMPLES:
+            return default
+
+        volatility = entry[0]
+        ttl = (
+            PRICE_TTL_MAX_SECONDS
+            if volatility <= 0
+            else PRICE_TTL_TOLERANCE**2 / volatility
+        )
+        upper = OUTDATED_TIME_SECONDS_MAIN if main else PRICE_TTL_MAX_SECONDS
+        return int(max(PRICE_TTL_MIN_SECONDS, min(upper, ttl)))
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._unsaved:
+                return
+            data = json.dumps(self._loaded(), separators=(",", ":"))
+            self._unsaved = 0
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save price volatility snapshot: {e}")
+
+    def stats(self) -> dict[str, int]:
+        volatility = self._loaded()
+        ttls = sorted(self.ttl_seconds(name) for name in volatility)
+        return {
+            "items": len(volatility),
+            "learned": sum(
+                1 for entry in volatility.values() if entry[1] >= PRICE_TTL_MIN_SAMPLES
+            ),
+            "ttl_min": ttls[0] if ttls else None,
+            "ttl_median": ttls[len(ttls) // 2] if ttls else None,
+            "ttl_max": ttls[-1] if ttls else None,
+        }
+
+
+_ttl_model = PriceTtlModel(PRICE_VOLATILITY_PATH)
+atexit.register(_ttl_model.save)
+
+
+def price_ttl_seconds(market_hash_name: str) -> int:
+    """Returns how long a stored price for this item stays fresh, in seconds."""
+    return _ttl_model.ttl_seconds(market_hash_name)
+
+
+def observe_price(
+    market_hash_name: str, currency: str, price: float, fetched_at: int
+) -> None:
+    """Records a fetched price so the item's TTL can adapt to how much it moves."""
+    _ttl_model.observe(market_hash_name, currency, price, fetched_at)
+
+
+def get_price_ttl_stats() -> dict[str, int]:
+    """Returns how many items have a learned TTL and the spread of current TTLs."""
+    return _ttl_model.stats()
@@ -0,0 +1,338 @@
+import atexit
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from database.utils import price_store
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+
+ORDERBOOK_DIR = _config.get(
+    "ORDERBOOK_DIR", r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\database\db\orderbooks"
+)
+ORDERBOOK_DEPTH = _config.get("ORDERBOOK_DEPTH", 10)
+ORDERBOOK_BUFFER_MAX_ROWS = _config.get("ORDERBOOK_BUFFER_MAX_ROWS", 200)
+ORDERBOOK_BUFFER_MAX_DELAY_MS = _config.get("ORDERBOOK_BUFFER_MAX_DELAY_MS", 5000)
+
+# One file per UTC day (YYYY-MM-DD.db), so old days can be archived or deleted
+# as a whole. Rows are only ever inserted. Prices are in cents; bids and asks
+# hold the top ORDERBOOK_DEPTH levels of the order graph as compact JSON
+# [[price, cumulative quantity], ...], best price first.
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        item_id INTEGER NOT NULL,
+        currency TEXT NOT NULL,
+        fetched_at INTEGER NOT NULL,
+        best_bid INTEGER,
+        best_ask INTEGER,
+        bid_count INTEGER NOT NULL,
+        ask_count INTEGER NOT NULL,
+        bids TEXT NOT NULL,
+        asks TEXT NOT NULL,
+        PRIMARY KEY (item_id, currency, fetched_at)
+    ) WITHOUT ROWID
+"""
+
+_INSERT_SNAPSHOT = """
+    INSERT OR IGNORE INTO snapshots
+        (item_id, currency, fetched_at, best_bid, best_ask, bid_count, ask_count, bids, asks)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_COLUMNS = (
+    "item_id",
+    "currency",
+    "fetched_at",
+    "best_bid",
+    "best_ask",
+    "bid_count",
+    "ask_count",
+    "bids",
+    "asks",
+)
+
+
+def _day_of(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _partition_path(day: str) -> Path:
+    return Path(ORDERBOOK_DIR) / f"{day}.db"
+
+
+def _connect(day: str) -> sqlite3.Connection:
+    path = _partition_path(day)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def _depth(graph: list, depth: int) -> str:
+    return json.dumps(
+        [[entry.price, entry.quantity] for entry in graph[:depth]],
+        separators=(",", ":"),
+    )
+
+
+def snapshot_row(
+    item_id: int, currency: str, histogram: Any, fetched_at: int | None = None
+) -> tuple:
+    """Turns an ItemOrdersHistogram into a snapshots row."""
+    return (
+        item_id,
+        currency.upper(),
+        int(time.time()) if fetched_at is None else fetched_at,
+        histogram.highest_buy_order,
+        histogram.lowest_sell_order,
+        histogram.buy_order_count or 0,
+        histogram.sell_order_count or 0,
+        _depth(histogram.buy_order_graph or [], ORDERBOOK_DEPTH),
+        _depth(histogram.sell_order_graph or [], ORDERBOOK_DEPTH),
+    )
+
+
+def append_snapshots(rows: list[tuple]) -> int:
+    """
+    Appends snapshot rows to their day partitions, one transaction per day.
+
+    Returns:
+        int: number of rows inserted (rows already stored are skipped)
+    """
+    rows_by_day: dict[str, list[tuple]] = {}
+    for row in rows:
+        rows_by_day.setdefault(_day_of(row[2]), []).append(row)
+
+    inserted = 0
+    for day, day_rows in rows_by_day.items():
+        conn = _connect(day)
+        try:
+            before = conn.total_changes
+            conn.executemany(_INSERT_SNAPSHOT, day_rows)
+            conn.commit()
+            inserted += conn.total_changes - before
+        finally:
+            conn.close()
+    return inserted
+
+
+class SnapshotBuffer:
+    """
+    Collects snapshot rows in memory and appends them with append_snapshots once
+    max_rows are pending or max_delay_ms after the first pending row. Also
+    flushed at interpreter exit and before every read.
+    """
+
+    def __init__(self, max_rows: int, max_delay_ms: int):
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self._pending: list[tuple] = []
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    def _arm_timer(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(self.max_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def add(self, row: tuple) -> None:
+        with self._lock:
+            self._pending.append(row)
+            flush_now = len(self._pending) >= self.max_rows
+            if not flush_now:
+                self._arm_timer()
+
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> int:
+        """Appends all pending rows and returns how many were inserted."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            rows = self._pending
+            if not rows:
+                return 0
+
+            try:
+                written = append_snapshots(rows)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to store {len(rows)} order book snapshots: {e}")
+                self._arm_timer()
+                return 0
+
+            self._pending = []
+            self.flushes += 1
+            self.rows_written += written
+            logger.trace(f"Stored {written} order book snapshots")
+            return written
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+        }
+
+
+_snapshot_buffer = SnapshotBuffer(
+    ORDERBOOK_BUFFER_MAX_ROWS, ORDERBOOK_BUFFER_MAX_DELAY_MS
+)
+atexit.register(_snapshot_buffer.flush)
+
+
+def record_histogram(
+    item_id: int, currency: str, histogram: Any, fetched_at: int | None = None
+) -> None:
+    """Queues a fetched ItemOrdersHistogram for the order book history."""
+    try:
+        row = snapshot_row(item_id, currency, histogram, fetched_at)
+    except Exception as e:
+        # History is best effort and must never break a price lookup
+        logger.warning(f"Could not snapshot histogram of item_id {item_id}: {e}")
+        return
+    _snapshot_buffer.add(row)
+
+
+def flush_snapshots() -> int:
+    """Writes all buffered snapshots now. Returns the number of rows inserted."""
+    return _snapshot_buffer.flush()
+
+
+def read_snapshots(
+    market_hash_name: str,
+    currency: str,
+    start: int,
+    end: int | None = None,
+    with_depth: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Returns the stored snapshots of an item in one currency between two unix times, oldest first.
+
+    Args:
+        market_hash_name: The market hash name of the item
+        currency: The 3 letter currency code of the snapshots
+        start: Unix time of the first snapshot to include
+        end: Unix time of the last snapshot to include, defaults to now
+        with_depth: Also decode the bids and asks depth lists
+
+    Returns:
+        list: dicts with fetched_at, best_bid, best_ask, bid_count and ask_count
+              (plus bids and asks when with_depth is set), prices in cents
+    """
+    item_id = price_store.get_item_ids([market_hash_name]).get(market_hash_name)
+    if item_id is None:
+        return []
+
+    end = int(time.time()) if end is None else end
+    flush_snapshots()
+
+    snapshots = []
+    day = datetime.fromtimestamp(start, tz=timezone.utc).date()
+    last_day = datetime.fromtimestamp(end, tz=timezone.utc).date()
+    while day <= last_day:
+        path = _partition_path(day.isoformat())
+        day += timedelta(days=1)
+        if not path.exists():
+            continue
+
+        conn = sqlite3.connect(path)
+        try:
+            cursor = conn.execute(
+                f"""
+                SELECT {", ".join(_COLUMNS)} FROM snapshots
+                WHERE item_id = ? AND currency = ? AND fetched_at BETWEEN ? AND ?
+                ORDER BY fetched_at
+                """,
+                (item_id, currency.upper(), start, end),
+            )
+            for row in cursor.fetchall():
+                snapshot = dict(zip(_COLUMNS, row))
+                del snapshot["item_id"], snapshot["currency"]
+                if with_depth:
+                    snapshot["bids"] = json.loads(snapshot["bids"])
+                    snapshot["asks"] = json.loads(snapshot["asks"])
+                else:
+                    del snapshot["bids"], snapshot["asks"]
+                snapshots.append(snapshot)
+        finally:
+            conn.close()
+
+    return snapshots
+
+
+def downsample(
+    snapshots: list[dict[str, Any]], bucket_seconds: int
+) -> list[dict[str, Any]]:
+    """
+    Groups snapshots (oldest first) into fixed time buckets.
+
+    Returns:
+        list: one dict per non-empty bucket with its start time, the number of
+              snapshots, the last best bid and ask, and the low, high and mean best bid
+    """
+    buckets: list[dict[str, Any]] = []
+    for snapshot in snapshots:
+        bucket_start = snapshot["fetched_at"] - snapshot["fetched_at"] % bucket_seconds
+        if not buckets or buckets[-1]["start"] != bucket_start:
+            buckets.append({"start": bucket_start, "count": 0, "_bids": []})
+        bucket = buckets[-1]
+        bucket["count"] += 1
+        bucket["best_bid"] = snapshot["best_bid"]
+        bucket["best_ask"] = snapshot["best_ask"]
+        if snapshot["best_bid"] is not None:
+            bucket["_bids"].append(snapshot["best_bid"])
+
+    for bucket in buckets:
+        bids = bucket.pop("_bids")
+        bucket["bid_low"] = min(bids) if bids else None
+        bucket["bid_high"] = max(bids) if bids else None
+        bucket["bid_mean"] = sum(bids) / len(bids) if bids else None
+    return buckets
+
+
+def read_downsampled(
+    market_hash_name: str,
+    currency: str,
+    start: int,
+    end: int | None = None,
+    bucket_seconds: int = 3600,
+) -> list[dict[str, Any]]:
+    """read_snapshots followed by downsample, hourly by default."""
+    return downsample(
+        read_snapshots(market_hash_name, currency, start, end), bucket_seconds
+    )
+
+
+def get_orderbook_store_stats() -> dict[str, int]:
+    partitions = list(Path(ORDERBOOK_DIR).glob("*.db"))
+    return {
+        **_snapshot_buffer.stats(),
+        "partitions": len(partitions),
+        "bytes": sum(path.stat().st_size for path in partitions),
+    }
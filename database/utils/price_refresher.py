@@ -0,0 +1,305 @@
+import asyncio
+import heapq
+import sys
+import time
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from database.utils import price_store
+from database.utils.account_utils import get_all_steam_accounts, get_held_item_counts
+from database.utils.item_catalog import MAIN_ITEMS, price_ttl_seconds
+from database.utils.price_utils import (
+    get_cached_price_fetched_at,
+    get_cached_prices_fetched_at,
+    get_single_item_price,
+    update_price_in_db,
+)
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+
+PRICE_REFRESHER_WORKERS = _config.get("PRICE_REFRESHER_WORKERS", 2)
+PRICE_REFRESHER_REFRESH_FRACTION = _config.get("PRICE_REFRESHER_REFRESH_FRACTION", 0.8)
+PRICE_REFRESHER_REBUILD_SECONDS = _config.get("PRICE_REFRESHER_REBUILD_SECONDS", 300)
+PRICE_REFRESHER_VALUE_WEIGHT = _config.get("PRICE_REFRESHER_VALUE_WEIGHT", 4.0)
+PRICE_REFRESHER_MAIN_ITEM_WEIGHT = _config.get("PRICE_REFRESHER_MAIN_ITEM_WEIGHT", 2.0)
+
+# Staleness given to prices that were never fetched, so they go first
+_MISSING_PRICE_STALENESS = 10.0
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class PriceRefresher:
+    """
+    Keeps stored prices of held items and main items fresh in the background.
+
+    Every (market_hash_name, currency) key is ranked by how far its price is
+    through its TTL, weighted by the item's share of held value in that currency
+    and by main-item status. Keys are refreshed once they pass refresh_fraction
+    of their TTL, highest priority first. Fetches go through get_single_item_price,
+    so they share the histogram single-flight, the per-account governors and the
+    rate limiter with the lister instead of adding traffic on top of them.
+    """
+
+    def __init__(self, workers: int, refresh_fraction: float, rebuild_seconds: float):
+        self.workers = workers
+        self.refresh_fraction = refresh_fraction
+        self.rebuild_seconds = rebuild_seconds
+        # (-priority, market_hash_name, currency, item_id)
+        self._queue: list[tuple[float, str, str, int]] = []
+        # (market_hash_name, currency) -> fetched_at of the stored price, None if never fetched
+        self._fetched_at: dict[tuple[str, str], int | None] = {}
+        self._next_due: float | None = None
+        self._task: asyncio.Task | None = None
+        self.refreshed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.rebuilds = 0
+
+    def _tracked_keys(self) -> dict[tuple[str, str], int]:
+        """Held (item, currency) counts plus the main items in every account currency."""
+        held = get_held_item_counts()
+        currencies = {
+            (account.get("currency") or "USD").upper()
+            for account in get_all_steam_accounts()
+        }
+        currencies.update(currency for _, currency in held)
+        for currency in currencies:
+            for name in MAIN_ITEMS:
+                held.setdefault((name, currency), 0)
+        return held
+
+    def _priority(
+        self, market_hash_name: str, fetched_at: int | None, value_share: float, now: int
+    ) -> float:
+        if fetched_at is None:
+            staleness = _MISSING_PRICE_STALENESS
+        else:
+            staleness = (now - fetched_at) / price_ttl_seconds(market_hash_name)
+        priority = staleness * (1 + PRICE_REFRESHER_VALUE_WEIGHT * value_share)
+        if market_hash_name in MAIN_ITEMS:
+            priority *= PRICE_REFRESHER_MAIN_ITEM_WEIGHT
+        return priority
+
+    def _known_fetched_at(self) -> dict[tuple[str, str], int]:
+        """Newest fetch time the loop knows of per key, from the price cache and past refreshes."""
+        known = {key: fetched_at for key, fetched_at in self._fetched_at.items() if fetched_at}
+        for key, fetched_at in get_cached_prices_fetched_at().items():
+            known[key] = max(known.get(key, 0), fetched_at)
+        return known
+
+    def _rebuild(self, known_fetched_at: dict[tuple[str, str], int]) -> None:
+        """
+        Re-reads held items and stored prices and rebuilds the queue of due keys.
+        Runs in a thread, so the price cache is only read through known_fetched_at,
+        a snapshot taken on the loop.
+        """
+        counts = self._tracked_keys()
+        names_by_currency: dict[str, list[str]] = {}
+        for name, currency in counts:
+            names_by_currency.setdefault(currency, []).append(name)
+
+        now = int(time.time())
+        queue = []
+        fetched_at_by_key = {}
+        next_due = None
+
+        for currency, names in names_by_currency.items():
+            rows = price_store.read_prices(names, currency)
+            values = {
+                name: counts[(name, currency)] * (price or 0)
+                for name, (_, price, _) in rows.items()
+            }
+            total_value = sum(values.values())
+
+            # Items without an item id are added on their first lookup, not here
+            for name, (item_id, _, fetched_at) in rows.items():
+                fetched_at = (
+                    max(
+                        fetched_at or 0,
+                        known_fetched_at.get((name, currency), 0),
+                    )
+                    or None
+                )
+                fetched_at_by_key[(name, currency)] = fetched_at
+
+                due_at = (
+                    0
+                    if fetched_at is None
+                    else fetched_at
+                    + self.refresh_fraction * price_ttl_seconds(name)
+                )
+                if due_at > now:
+                    next_due = due_at if next_due is None else min(next_due, due_at)
+                    continue
+
+                value_share = values[name] / total_value if total_value else 0.0
+                priority = self._priority(name, fetched_at, value_share, now)
+                queue.append((-priority, name, currency, item_id))
+
+        heapq.heapify(queue)
+        self._queue = queue
+        self._fetched_at = fetched_at_by_key
+        self._next_due = next_due
+        self.rebuilds += 1
+        logger.trace(
+            f"Price refresher queued {len(queue)} of {len(fetched_at_by_key)} tracked prices"
+        )
+
+    async def _refresh(self, market_hash_name: str, currency: str, item_id: int) -> None:
+        key = (market_hash_name, currency)
+        # The lister may have fetched it since the queue was built
+        fetched_at = max(
+            self._fetched_at.get(key) or 0,
+            get_cached_price_fetched_at(market_hash_name, currency) or 0,
+        )
+        due_at = fetched_at + self.refresh_fraction * price_ttl_seconds(market_hash_name)
+        if fetched_at and time.time() < due_at:
+            self._fetched_at[key] = fetched_at
+            self.skipped += 1
+            return
+
+        try:
+            price = await get_single_item_price(item_id=item_id, currency=currency)
+        except Exception as e:
+            self.failed += 1
+            logger.warning(
+                f"Background refresh of {market_hash_name} in {currency} failed: {e}"
+            )
+            return
+
+        update_price_in_db(market_hash_name, price, currency)
+        self._fetched_at[key] = int(time.time())
+        self.refreshed += 1
+
+    async def _worker(self, deadline: float) -> None:
+        while self._queue and time.monotonic() < deadline:
+            _, name, currency, item_id = heapq.heappop(self._queue)
+            await self._refresh(name, currency, item_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self._rebuild, self._known_fetched_at())
+            except Exception as e:
+                logger.error(f"Price refresher could not rebuild its queue: {e}")
+                await asyncio.sleep(self.rebuild_seconds)
+                continue
+
+            if self._queue:
+                refreshed = self.refreshed
+                deadline = time.monotonic() + self.rebuild_seconds
+                await asyncio.gather(
+                    *(self._worker(deadline) for _ in range(self.workers))
+                )
+                price_store.flush_pending_prices()
+                if self.refreshed > refreshed:
+                    continue
+                # Every fetch failed, so wait instead of retrying the same keys at once
+                await asyncio.sleep(self.rebuild_seconds)
+                continue
+
+            # Nothing is due, sleep until the next price is
+            delay = self.rebuild_seconds
+            if self._next_due is not None:
+                delay = min(delay, max(1.0, self._next_due - time.time()))
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        """Starts refreshing in the background of the running event loop, if not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+            logger.info("Started background price refresher")
+
+    async def stop(self) -> None:
+        """Stops the background refresh and writes out the prices it fetched."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        price_store.flush_pending_prices()
+
+    def stats(self) -> dict[str, int | float | bool | None]:
+        now = time.time()
+        ages = sorted(
+            now - fetched_at
+            for fetched_at in self._fetched_at.values()
+            if fetched_at is not None
+        )
+
+        def age(fraction: float) -> float | None:
+            value = _percentile(ages, fraction)
+            return round(value) if value is not None else None
+
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queue_length": len(self._queue),
+            "tracked": len(self._fetched_at),
+            "never_fetched": len(self._fetched_at) - len(ages),
+            "refreshed": self.refreshed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "rebuilds": self.rebuilds,
+            "age_p50_seconds": age(0.5),
+            "age_p90_seconds": age(0.9),
+            "age_p99_seconds": age(0.99),
+            "age_max_seconds": round(ages[-1]) if ages else None,
+        }
+
+
+price_refresher = PriceRefresher(
+    PRICE_REFRESHER_WORKERS,
+    PRICE_REFRESHER_REFRESH_FRACTION,
+    PRICE_REFRESHER_REBUILD_SECONDS,
+)
+
+
+def start_price_refresher() -> None:
+    price_refresher.start()
+
+
+async def stop_price_refresher() -> None:
+    await price_refresher.stop()
+
+
+def get_price_refresher_stats() -> dict[str, int | float | bool | None]:
+    """Returns queue length, refresh counters and price age percentiles (seconds) of the background refresher."""
+    return price_refresher.stats()
+
+
+async def run_price_refresher(log_interval_seconds: float = 600) -> None:
+    """Runs the refresher until interrupted, logging its stats periodically."""
+    price_refresher.start()
+    try:
+        while True:
+            await asyncio.sleep(log_interval_seconds)
+            logger.info(f"Price refresher stats: {get_price_refresher_stats()}")
+    finally:
+        await price_refresher.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_price_refresher())
@@ -0,0 +1,358 @@
+import atexit
+import sqlite3
+import sys
+import threading
+from typing import Iterable
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.instrumentation import instrumentation
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+
+PRICES_DB_PATH = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\database\db\prices.db"
+PRICE_WRITE_BUFFER_MAX_ROWS = _config.get("PRICE_WRITE_BUFFER_MAX_ROWS", 200)
+PRICE_WRITE_BUFFER_MAX_DELAY_MS = _config.get("PRICE_WRITE_BUFFER_MAX_DELAY_MS", 2000)
+
+# prices.db layout:
+#   items  - one row per item, maps market_hash_name to the Steam item name id
+#   prices - one row per (item, currency) with the buy order price in cents and
+#            the unix time it was fetched, so every currency has its own staleness
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS items (
+        market_hash_name TEXT PRIMARY KEY,
+        item_id INTEGER UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS prices (
+        market_hash_name TEXT NOT NULL,
+        currency TEXT NOT NULL,
+        price_cents REAL,
+        fetched_at INTEGER NOT NULL,
+        PRIMARY KEY (market_hash_name, currency)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_prices_currency_fetched_at
+        ON prices (currency, fetched_at, price_cents)
+    """,
+)
+
+_UPSERT_PRICE = """
+    INSERT INTO prices (market_hash_name, currency, price_cents, fetched_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (market_hash_name, currency) DO UPDATE SET
+        price_cents = excluded.price_cents,
+        fetched_at = excluded.fetched_at
+    WHERE excluded.fetched_at >= prices.fetched_at
+"""
+
+_schema_ready = False
+
+
+def _migrate_legacy_prices(cursor: sqlite3.Cursor) -> None:
+    """
+    Moves the old wide prices table (one buy_order_price_<currency> column per currency
+    and a single shared time column) into the items and long-format prices tables.
+    The old table is kept as prices_legacy.
+    """
+    cursor.execute("PRAGMA table_info(prices)")
+    legacy_columns = [info[1] for info in cursor.fetchall()]
+    currency_columns = [
+        column for column in legacy_columns if column.startswith("buy_order_price_")
+    ]
+
+    logger.info(
+        f"Migrating prices table to per-currency rows for {len(currency_columns)} currencies"
+    )
+    cursor.execute("ALTER TABLE prices RENAME TO prices_legacy")
+    for statement in _SCHEMA:
+        cursor.execute(statement)
+
+    cursor.execute(
+        """
+        INSERT OR IGNORE INTO items (market_hash_name, item_id)
+        SELECT market_hash_name, item_id FROM prices_legacy
+        """
+    )
+    for column in currency_columns:
+        currency = column.removeprefix("buy_order_price_").upper()
+        # Zero was the column default for items that were never priced
+        cursor.execute(
+            f"""
+            INSERT OR IGNORE INTO prices (market_hash_name, currency, price_cents, fetched_at)
+            SELECT market_hash_name, ?, {column}, COALESCE(time, 0) FROM prices_legacy
+            WHERE {column} IS NOT NULL AND {column} > 0
+            """,
+            (currency,),
+        )
+
+
+def ensure_prices_schema(conn: sqlite3.Connection) -> None:
+    """Creates the prices.db tables, migrating the legacy layout if needed. Runs once per process."""
+    global _schema_ready
+    if _schema_ready:
+        return
+
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(prices)")
+    existing_columns = {info[1] for info in cursor.fetchall()}
+
+    if existing_columns and "currency" not in existing_columns:
+        try:
+            cursor.execute("BEGIN")
+            _migrate_legacy_prices(cursor)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+    else:
+        for statement in _SCHEMA:
+            cursor.execute(statement)
+        conn.commit()
+
+    _schema_ready = True
+
+
+def connect() -> sqlite3.Connection:
+    """Opens prices.db with the current schema in place."""
+    conn = sqlite3.connect(PRICES_DB_PATH)
+    ensure_prices_schema(conn)
+    return conn
+
+
+def _placeholders(values: list) -> str:
+    return ",".join("?" for _ in values)
+
+
+def get_item_ids(market_hash_names: Iterable[str]) -> dict[str, int]:
+    """Returns market_hash_name -> item_id for the names that are stored."""
+    names = list(market_hash_names)
+    if not names:
+        return {}
+
+    conn = connect()
+    try:
+        cursor = conn.execute(
+            f"SELECT market_hash_name, item_id FROM items WHERE market_hash_name IN ({_placeholders(names)})",
+            names,
+        )
+        return dict(cursor.fetchall())
+    finally:
+        conn.close()
+
+
+def read_prices(
+    market_hash_names: Iterable[str], currency: str
+) -> dict[str, tuple[int, float | None, int | None]]:
+    """
+    Reads stored items and their price in one currency with a single query.
+
+    Returns:
+        dict: market_hash_name -> (item_id, price in cents, fetched_at). Price and
+              fetched_at are None when the item has no price in this currency yet.
+              Items missing from the items table are left out.
+    """
+    names = list(market_hash_names)
+    if not names:
+        return {}
+
+    # Taken before the query, so a flush in between still leaves the newer price in hand
+    pending = _write_buffer.pending_many(names, currency)
+
+    conn = connect()
+    try:
+        cursor = conn.execute(
+            f"""
+            SELECT i.market_hash_name, i.item_id, p.price_cents, p.fetched_at
+            FROM items i
+            LEFT JOIN prices p
+                ON p.market_hash_name = i.market_hash_name AND p.currency = ?
+            WHERE i.market_hash_name IN ({_placeholders(names)})
+            """,
+            [currency.upper(), *names],
+        )
+        prices = {
+            name: (item_id, price_cents, fetched_at)
+            for name, item_id, price_cents, fetched_at in cursor.fetchall()
+        }
+    finally:
+        conn.close()
+
+    # Buffered writes are newer than what is on disk, unless a later one was flushed meanwhile
+    for name, (item_id, _, fetched_at) in prices.items():
+        row = pending.get(name)
+        if row is not None and row[3] >= (fetched_at or 0):
+            prices[name] = (item_id, row[2], row[3])
+    return prices
+
+
+def upsert_items(rows: Iterable[tuple[str, int]]) -> None:
+    """Stores (market_hash_name, item_id) pairs, keeping existing ones."""
+    conn = connect()
+    try:
+        conn.executemany(
+            "INSERT OR IGNORE INTO items (market_hash_name, item_id) VALUES (?, ?)",
+            rows,
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def upsert_prices(rows: Iterable[tuple[str, str, float, int]]) -> int:
+    """
+    Inserts or replaces (market_hash_name, currency, price_cents, fetched_at) rows
+    in a single transaction.
+
+    Returns:
+        int: number of rows written
+    """
+    rows = [
+        (name, currency.upper(), price_cents, fetched_at)
+        for name, currency, price_cents, fetched_at in rows
+    ]
+    if not rows:
+        return 0
+
+    conn = connect()
+    try:
+        conn.executemany(_UPSERT_PRICE, rows)
+        conn.commit()
+        return len(rows)
+    finally:
+        conn.close()
+
+
+class PriceWriteBuffer:
+    """
+    Write-behind buffer for single price updates.
+
+    Rows are collected in memory (the latest row per item and currency wins) and
+    written with upsert_prices in one transaction once max_rows are pending or
+    max_delay_ms after the first pending row, whichever comes first. The buffer
+    is also flushed at interpreter exit.
+    """
+
+    def __init__(self, max_rows: int, max_delay_ms: int):
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self._pending: dict[tuple[str, str], tuple[str, str, float, int]] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    def add(
+        self, market_hash_name: str, currency: str, price_cents: float, fetched_at: int
+    ) -> None:
+        currency = currency.upper()
+        with self._lock:
+            self._pending[(market_hash_name, currency)] = (
+                market_hash_name,
+                currency,
+                price_cents,
+                fetched_at,
+            )
+            flush_now = len(self._pending) >= self.max_rows
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            self.flush()
+
+    def pending(
+        self, market_hash_name: str, currency: str
+    ) -> tuple[str, str, float, int] | None:
+        with self._lock:
+            return self._pending.get((market_hash_name, currency.upper()))
+
+    def pending_many(
+        self, market_hash_names: Iterable[str], currency: str
+    ) -> dict[str, tuple[str, str, float, int]]:
+        """Snapshot of the pending rows of these items in one currency, taken under one lock."""
+        currency = currency.upper()
+        with self._lock:
+            return {
+                name: row
+                for name in market_hash_names
+                if (row := self._pending.get((name, currency))) is not None
+            }
+
+    def flush(self) -> int:
+        """Writes all pending rows in one transaction and returns how many were written."""
+        # The lock is held during the write so readers never miss a row that is in flight
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            rows = list(self._pending.values())
+            if not rows:
+                return 0
+
+            try:
+                written = upsert_prices(rows)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to flush {len(rows)} buffered prices: {e}")
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return 0
+
+            self._pending.clear()
+            self.flushes += 1
+            self.rows_written += written
+            logger.trace(f"Flushed {written} buffered prices to prices.db")
+            return written
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+        }
+
+
+_write_buffer = PriceWriteBuffer(
+    PRICE_WRITE_BUFFER_MAX_ROWS, PRICE_WRITE_BUFFER_MAX_DELAY_MS
+)
+atexit.register(_write_buffer.flush)
+
+
+def buffer_price(
+    market_hash_name: str, currency: str, price_cents: float, fetched_at: int
+) -> None:
+    """Queues a price row for the next batched write to prices.db."""
+    _write_buffer.add(market_hash_name, currency, price_cents, fetched_at)
+
+
+def flush_pending_prices() -> int:
+    """Writes all buffered price rows now. Returns the number of rows written."""
+    return _write_buffer.flush()
+
+
+def get_write_buffer_stats() -> dict[str, int]:
+    return _write_buffer.stats()
+
+
+# Times every helper above as "db.price_store.<name>" when instrumentation is enabled
+instrumentation.instrument_functions(globals(), "db.price_store")
@@ -3,9 +3,11 @@ import logging
 import random
 import sqlite3
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 
 import aiohttp
-from aiosteampy import Currency, SteamClient, SteamPublicClient
+from aiosteampy import App, Currency, SteamClient, SteamPublicClient
 from aiosteampy.constants import AppContext
 from aiosteampy.ext.user_agents import UserAgentsService
 from aiosteampy.models import EconItem, ItemOrdersHistogram
@@ -29,19 +31,33 @@ def load_config():
 _config = load_config()
 ROOT_DIR = _config["ROOT_DIR"]
 sys.path.insert(0, ROOT_DIR)
+from utils.instrumentation import instrumentation
 from utils.logger import get_custom_logger
-from utils.proxy import generate_proxy
+from utils.proxy import proxy_pool, redact_proxy
+from utils.rate_limiter import ENDPOINT_BY_METHOD, rate_limiter
+from utils.retry_policy import (
+    AUTH_EXPIRED,
+    PERMANENT,
+    RATE_LIMITED,
+    TRANSIENT,
+    CircuitOpenError,
+    backoff_delay,
+    classify_error,
+    get_breaker,
+    retry_after_hint,
+)
 
 logger = get_custom_logger()
 
 import json
-from pathlib import Path
 
 from aiosteampy.helpers import restore_from_cookies
 from aiosteampy.utils import get_jsonable_cookies
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from database.utils.account_utils import get_all_steam_accounts, get_specific_items
+from database.utils import cookie_store, orderbook_store, price_store
+from database.utils.item_catalog import MAIN_ITEMS, observe_price, price_ttl_seconds
+from database.utils.account_utils import get_all_steam_accounts
 
 
 def load_config() -> dict:
@@ -53,18 +69,23 @@ def load_config() -> dict:
 
 _config = load_config()
 
-PRICES_DB_PATH = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\database\db\prices.db"
+PRICES_DB_PATH = price_store.PRICES_DB_PATH
 PERCENTAGE_OF_LOWEST_BUY_THRESHOLD = _config.get("PERCENTAGE_OF_LOWEST_BUY_THRESHOLD")
 USE_PROXIES = _config.get("USE_PROXIES")
-OUTDATED_TIME_SECONDS = _config.get("OUTDATED_TIME_SECONDS")
-OUTDATED_TIME_SECONDS_MAIN = _config.get("OUTDATED_TIME_SECONDS_MAIN")
 GET_INVENTORY_COUNT = _config.get("GET_INVENTORY_COUNT")
 PRICE_SEMAPHORE = _config.get("PRICE_SEMAPHORE")
-COOKIE_CACHE_DIR = _config.get(
-    "COOKIE_CACHE_DIR",
-    r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\utils\cache\cookies",
-)
 MAX_RETRIES = _config.get("STEAM_API_CALL_MAX_RETRIES", 3)
+PRICE_CACHE_MAX_ENTRIES = _config.get("PRICE_CACHE_MAX_ENTRIES", 5000)
+CLIENT_POOL_MAX_SIZE = _config.get("CLIENT_POOL_MAX_SIZE", 100)
+CLIENT_POOL_IDLE_SECONDS = _config.get("CLIENT_POOL_IDLE_SECONDS", 3600)
+CLIENT_POOL_HEALTH_CHECK_SECONDS = _config.get("CLIENT_POOL_HEALTH_CHECK_SECONDS", 600)
+PUBLIC_CLIENT_POOL_SIZE = _config.get("PUBLIC_CLIENT_POOL_SIZE", 4)
+BULK_PRICING = _config.get("BULK_PRICING", True)
+BULK_PRICE_MAX_PAGES = _config.get("BULK_PRICE_MAX_PAGES", 5)
+FX_DERIVED_PRICING = _config.get("FX_DERIVED_PRICING", True)
+FX_RATIO_ERROR_BOUND = _config.get("FX_RATIO_ERROR_BOUND", 0.03)
+FX_RATIO_CALIBRATION_SECONDS = _config.get("FX_RATIO_CALIBRATION_SECONDS", 6 * 3600)
+FX_RATIO_CALIBRATION_SAMPLES = _config.get("FX_RATIO_CALIBRATION_SAMPLES", 3)
 
 # Define functions that should use a simple retry instead of a session refresh
 SPECIAL_CASES = {"login", "logout", "close"}
@@ -96,7 +117,8 @@ def _recreate_client_from_existing(existing_client: SteamClient) -> SteamClient:
         wallet_country=existing_client.wallet_country,
         tz_offset=existing_client.tz_offset,
         user_agent=getattr(existing_client, "user_agent", None),
-        # Note: proxy settings are part of the session and will be handled by cookie restoration
+        # Keeps the account on its pinned proxy unless that proxy was retired
+        session=generate_session(account=existing_client.username),
     )
 
 
@@ -107,15 +129,13 @@ async def get_client_from_cookies(client_to_recreate: SteamClient) -> SteamClien
     Retries on failure using an exponential backoff.
     """
     username = client_to_recreate.username
-    cookie_cache_path = Path(COOKIE_CACHE_DIR) / f"{username}_cookies.json"
 
     # Create a new client instance with the same credentials
     new_client = _recreate_client_from_existing(client_to_recreate)
 
-    if cookie_cache_path.is_file():
+    cookies = await cookie_store.load_cookies(username)
+    if cookies:
         logger.info(f"Attempting to restore session from cookies for '{username}'.")
-        with cookie_cache_path.open("r") as f:
-            cookies = json.load(f)
         await restore_from_cookies(cookies, new_client)
     else:
         # If cookies are somehow missing, fall back to a full login.
@@ -131,23 +151,57 @@ async def get_client_from_cookies(client_to_recreate: SteamClient) -> SteamClien
 @helper_retry_decorator
 async def save_cookies_and_close_session(client: SteamClient) -> None:
     """
-    Saves the client's session cookies to a file and closes the session.
-    Retries on failure (e.g., file write error) using an exponential backoff.
+    Saves the client's session cookies to the cookie store if they changed.
+    Retries on failure (e.g., database write error) using an exponential backoff.
     """
     if not client or not client.session or client.session.closed:
         return
 
     username = client.username
-    cookie_cache_path = Path(COOKIE_CACHE_DIR) / f"{username}_cookies.json"
-
-    logger.info(f"Saving cookies for '{username}' and closing session.")
-    with cookie_cache_path.open("w") as f:
-        json.dump(get_jsonable_cookies(client.session), f, indent=4)
+    if await cookie_store.save_cookies(username, get_jsonable_cookies(client.session)):
+        logger.info(f"Saved changed cookies for '{username}'.")
 
 
 # --- Main Retry Function ---
 
 
+def _session_proxy(session: aiohttp.ClientSession) -> str | None:
+    """Returns the proxy a session was patched with by generate_session, if any."""
+    request = getattr(session, "_request", None)
+    return getattr(request, "keywords", {}).get("proxy")
+
+
+async def _refresh_client_for_retry(
+    client: SteamClient | SteamPublicClient,
+) -> SteamClient | SteamPublicClient:
+    """Replaces a client whose session is suspected dead with a fresh one."""
+    if isinstance(client, SteamClient):
+        logger.info(
+            f"Performing session refresh retry for {client.username}. Re-creating client."
+        )
+
+        # Save the old client's cookies
+        await save_cookies_and_close_session(client)
+
+        # Create a new client instance and restore its session from the saved cookies
+        new_client = await get_client_from_cookies(client)
+        _client_pool.replace(client, new_client)
+        logger.info(f"New client session created for {new_client.username}.")
+        return new_client
+
+    if isinstance(client, SteamPublicClient):
+        logger.info(
+            "Performing session refresh retry for SteamPublicClient. Re-creating client."
+        )
+        return _public_client_pool.replace(client)
+
+    # Unintended usage - unknown client class
+    logger.critical(f"Unrecognized client type {type(client)}. Cannot retry.")
+    raise TypeError(
+        f"Unrecognized client type {type(client)} in steam_api_call_with_retry"
+    )
+
+
 async def steam_api_call_with_retry(
     func: Callable[..., Any],
     *args: Any,
@@ -155,7 +209,18 @@ async def steam_api_call_with_retry(
     **kwargs: Any,
 ) -> Any:
     """
-    Execute a Steam API call with a sophisticated, self-contained retry mechanism.
+    Execute a Steam API call, retrying according to the kind of error.
+
+    Errors are classified by utils.retry_policy:
+        - transient: short jittered retry; a second one in a row also refreshes the session
+        - rate limited: exponential back-off, or the Retry-After hint when Steam sends one
+        - auth expired: session refresh, then retry
+        - permanent: raised immediately
+
+    Every attempt first takes a token from the rate limiter bucket of the
+    method's endpoint class for this account, and reports the outcome back.
+    Non-permanent failures count towards the account's and proxy's circuit
+    breakers; while one is open the call fails fast with CircuitOpenError.
 
     Args:
         func: The async function to call (a method of a SteamClient or SteamPublicClient instance).
@@ -167,260 +232,566 @@ async def steam_api_call_with_retry(
         The result of the function call.
     """
     retries = 0
+    transient_failures = 0
     client = func.__self__  # Get the client instance the method is bound to
-
-    while True:
-        try:
-            return await func(*args, **kwargs)
-        except Exception as e:
-            error_message = str(e).lower()
-            if (
-                "no longer in your inventory" in error_message
-                or "you already have a listing for this item pending confirmation"
-                in error_message
-            ):
-                client_name = (
-                    client.username
-                    if isinstance(client, SteamClient)
-                    else "SteamPublicClient"
+    func_name = func.__name__
+    endpoint = ENDPOINT_BY_METHOD.get(func_name)
+    is_steam_client = isinstance(client, SteamClient)
+    limiter_key = client.username if is_steam_client else "public"
+    client_name = client.username if is_steam_client else "SteamPublicClient"
+
+    breakers = [get_breaker(f"account:{client.username}")] if is_steam_client else []
+    proxy = _session_proxy(client.session)
+    if proxy:
+        breakers.append(get_breaker(f"proxy:{redact_proxy(proxy)}"))
+
+    instrumentation.count(f"steam.{func_name}.calls")
+    call_token = instrumentation.call(func_name)
+    try:
+        while True:
+            # Tokens are taken before the breaker check so callers looping over
+            # rejected calls are still paced by the rate limiter
+            if endpoint:
+                waited = await rate_limiter.acquire(endpoint, limiter_key)
+                instrumentation.observe(f"rate_limit_wait.{endpoint}", waited)
+
+            # Check every breaker before reserving any half-open trial, so one
+            # rejecting breaker does not leave another's trial taken
+            if not all(breaker.ready() for breaker in breakers):
+                logger.error(
+                    f"Circuit breaker open for {client_name}, not calling '{func_name}'."
                 )
-                logger.error(f"Non-retriable error for {client_name}: {e}")
-                raise
-
-            if retries >= max_retries:
-                client_name = (
-                    client.username
-                    if isinstance(client, SteamClient)
-                    else "SteamPublicClient"
+                raise CircuitOpenError(
+                    f"Circuit breaker open for {client_name}, skipped {func_name}"
                 )
-                logger.error(
-                    f"Max retries reached for {func.__name__} on account {client_name}. Raising exception."
+            trials = [(breaker, breaker.reserve_trial()) for breaker in breakers]
+
+            started = time.monotonic()
+            try:
+                result = await func(*args, **kwargs)
+                latency = time.monotonic() - started
+                instrumentation.observe(f"steam.{func_name}", latency)
+                if proxy:
+                    proxy_pool.record(proxy, latency=latency)
+                if endpoint:
+                    rate_limiter.report(endpoint, limiter_key)
+                for breaker in breakers:
+                    breaker.record_success()
+                if is_steam_client:
+                    _client_pool.touch(client)
+                return result
+            except Exception as e:
+                instrumentation.observe(
+                    f"steam.{func_name}.failed", time.monotonic() - started
                 )
-                raise
+                if endpoint:
+                    rate_limiter.report(endpoint, limiter_key, error=e)
+                error_class = classify_error(e)
+                instrumentation.count(f"steam.{func_name}.errors.{error_class}")
+                if proxy and error_class != PERMANENT:
+                    proxy_pool.record(
+                        proxy, error=True, throttled=error_class == RATE_LIMITED
+                    )
 
-            retries += 1
-            func_name = func.__name__
+                if error_class == PERMANENT:
+                    logger.error(f"Non-retriable error for {client_name}: {e}")
+                    raise
 
-            client_name = (
-                client.username
-                if isinstance(client, SteamClient)
-                else "SteamPublicClient"
-            )
-            logger.warning(
-                f"Error on attempt {retries - 1} for '{func_name}' on account {client_name}: {e}. "
-                f"Starting retry {retries}/{max_retries}..."
-            )
+                for breaker in breakers:
+                    breaker.record_failure()
 
-            if func_name in SPECIAL_CASES:
-                wait_time = retries * random.uniform(15, 25)
-                logger.info(
-                    f"Performing simple retry. Waiting {wait_time:.2f} seconds."
-                )
-                await asyncio.sleep(wait_time)
-            else:
-                if isinstance(client, SteamClient):
-                    # SteamClient path - existing logic
-                    logger.info(
-                        f"Performing session refresh retry for {client.username}. Re-creating client."
+                if retries >= max_retries:
+                    logger.error(
+                        f"Max retries reached for {func_name} on account {client_name}. Raising exception."
                     )
+                    raise
 
-                    # Save the old client's session and close it
-                    await save_cookies_and_close_session(client)
+                retries += 1
+                instrumentation.count(f"steam.{func_name}.retries")
+                logger.warning(
+                    f"{error_class} error on attempt {retries - 1} for '{func_name}' on account {client_name}: {e}. "
+                    f"Starting retry {retries}/{max_retries}..."
+                )
 
-                    # Create a new client instance and restore its session from the saved cookies
-                    client = await get_client_from_cookies(client)
+                if error_class == TRANSIENT:
+                    transient_failures += 1
 
+                # Repeated unexplained failures are often a dead session as well
+                refresh_session = func_name not in SPECIAL_CASES and (
+                    error_class == AUTH_EXPIRED
+                    or (error_class == TRANSIENT and transient_failures >= 2)
+                )
+                if refresh_session:
+                    client = await _refresh_client_for_retry(client)
                     # Re-bind the function to the new client instance for the next attempt
                     func = getattr(client, func_name)
+                    new_proxy = _session_proxy(client.session)
+                    if new_proxy != proxy:
+                        breakers = breakers[:1] if is_steam_client else []
+                        if new_proxy:
+                            breakers.append(
+                                get_breaker(f"proxy:{redact_proxy(new_proxy)}")
+                            )
+                        proxy = new_proxy
+
+                wait_time = backoff_delay(error_class, retries, retry_after_hint(e))
+                logger.info(f"Retrying '{func_name}' in {wait_time:.2f} seconds.")
+                await asyncio.sleep(wait_time)
+            finally:
+                # Frees trials whose outcome was never recorded (permanent error, cancellation)
+                for breaker, trial in trials:
+                    breaker.release_trial(trial)
+    finally:
+        instrumentation.reset_call(call_token)
 
-                    wait_time = random.uniform(10, 20)
-                    logger.info(
-                        f"New client session created for {client.username}. Waiting {wait_time:.2f} seconds."
-                    )
-                    await asyncio.sleep(wait_time)
 
-                elif isinstance(client, SteamPublicClient):
-                    # SteamPublicClient path - simple session recreation
-                    logger.info(
-                        "Performing session refresh retry for SteamPublicClient. Re-creating client."
-                    )
+FX_RATES_TTL_SECONDS = _config.get("FX_RATES_TTL_SECONDS", 3600)
+FX_SNAPSHOT_PATH = (
+    r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\utils\cache\miscellaneous\fx_rates.json"
+)
+FX_PRIMARY_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json"
+FX_BACKUP_URL = "https://open.er-api.com/v6/latest/USD"
 
-                    wait_time = random.uniform(10, 20)
-                    await asyncio.sleep(wait_time)
+# Units of each currency (lowercase code) per 1 USD. Every cross rate is derived from this table.
+_fx_rates: dict[str, float] = {}
+_fx_fetched_at = 0.0
+_fx_next_refresh = 0.0
+_fx_refresh_task: asyncio.Task | None = None
 
-                    # Close old session
-                    await client.session.close()
 
-                    # Generate new session and create new client
-                    session = generate_session()
-                    client = SteamPublicClient(session=session, country="US")
-                    logger.trace("Created new Steam Public client")
+async def _fetch_fx_table() -> dict[str, float]:
+    """Fetches the full USD based rate table in one request, falling back to the backup source."""
+    async with aiohttp.ClientSession() as session:
+        try:
+            logger.trace(f"Fetching exchange rates from {FX_PRIMARY_URL}")
+            async with session.get(FX_PRIMARY_URL) as response:
+                if response.status != 200:
+                    raise Exception(f"HTTP error: {response.status}")
+                data = await response.json()
+            return {code: float(rate) for code, rate in data["usd"].items() if rate}
+        except Exception as e:
+            logger.warning(f"Exchange rate fetch failed: {e}, trying backup source...")
+
+        async with session.get(FX_BACKUP_URL) as response:
+            if response.status != 200:
+                raise Exception(f"HTTP error: {response.status}")
+            data = await response.json()
+        if data.get("result") != "success":
+            raise Exception(f"Backup exchange rate source returned {data.get('result')}")
+        return {code.lower(): float(rate) for code, rate in data["rates"].items() if rate}
 
-                    # Re-bind the function to the new client instance
-                    func = getattr(client, func_name)
 
-                else:
-                    # Unintended usage - unknown client class
-                    logger.critical(
-                        f"Unrecognized client type {type(client)}. Cannot retry."
-                    )
-                    raise TypeError(
-                        f"Unrecognized client type {type(client)} in steam_api_call_with_retry"
-                    )
+def _load_fx_snapshot() -> None:
+    """Loads the last persisted rate table so a cold start does not need the network."""
+    global _fx_rates, _fx_fetched_at, _fx_next_refresh
+    try:
+        snapshot = _read_json_file(FX_SNAPSHOT_PATH)
+        _fx_rates = snapshot["rates"]
+        _fx_fetched_at = snapshot["fetched_at"]
+        _fx_next_refresh = _fx_fetched_at + FX_RATES_TTL_SECONDS
+        logger.trace(f"Loaded {len(_fx_rates)} exchange rates from snapshot")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Failed to read exchange rate snapshot: {e}")
+
+
+async def _refresh_fx_rates() -> None:
+    global _fx_rates, _fx_fetched_at, _fx_next_refresh
+    try:
+        rates = await _fetch_fx_table()
+    except Exception as e:
+        if _fx_rates:
+            age_hours = (time.time() - _fx_fetched_at) / 3600
+            logger.warning(
+                f"Exchange rate refresh failed: {e}. Using rates from {age_hours:.1f} hours ago."
+            )
+            # Try again in a minute instead of on every call
+            _fx_next_refresh = time.time() + 60
+            return
+        raise Exception(f"Conversion error: {str(e)}")
+
+    _fx_rates = rates
+    _fx_fetched_at = time.time()
+    _fx_next_refresh = _fx_fetched_at + FX_RATES_TTL_SECONDS
+    try:
+        await asyncio.to_thread(
+            _write_json_file,
+            FX_SNAPSHOT_PATH,
+            {"fetched_at": _fx_fetched_at, "rates": rates},
+        )
+    except Exception as e:
+        logger.error(f"Failed to save exchange rate snapshot: {e}")
+
 
+async def _get_fx_rates() -> dict[str, float]:
+    """Returns the current rate table, refreshing it once for all concurrent callers when it expires."""
+    global _fx_refresh_task
+    if not _fx_rates and not _fx_fetched_at:
+        _load_fx_snapshot()
 
-# Cache for exchange rates to reduce API calls
-_exchange_rate_cache = {}
-_cache_expiry = {}
-_cache_duration = 3600  # 1 hour in seconds
-_cache_lock = asyncio.Lock()
+    if time.time() < _fx_next_refresh:
+        return _fx_rates
+
+    if _fx_refresh_task is None or _fx_refresh_task.done():
+        _fx_refresh_task = asyncio.ensure_future(_refresh_fx_rates())
+    await asyncio.shield(_fx_refresh_task)
+    return _fx_rates
+
+
+def _cross_rate(rates: dict[str, float], from_currency: str, to_currency: str) -> float:
+    from_currency = from_currency.lower()
+    to_currency = to_currency.lower()
+    if from_currency == to_currency:
+        return 1.0
+    for currency in (from_currency, to_currency):
+        if currency not in rates:
+            raise Exception(f"Currency {currency} not found in available rates")
+    return rates[to_currency] / rates[from_currency]
+
+
+def _apply_rate(amount: Union[int, float], rate: float) -> Union[int, float]:
+    converted_amount = amount * rate
+    if isinstance(amount, int):
+        return int(round(converted_amount))
+    return float(converted_amount)
+
+
+async def get_exchange_rate(from_currency: str, to_currency: str) -> float:
+    """Returns how many units of to_currency one unit of from_currency buys."""
+    if from_currency.lower() == to_currency.lower():
+        return 1.0
+    return _cross_rate(await _get_fx_rates(), from_currency, to_currency)
 
 
 async def convert(
     from_currency: str, to_currency: str, amount: Union[int, float]
 ) -> Union[int, float]:
     """Convert an amount from one currency to another with caching."""
-    if isinstance(amount, int):
-        amount_type = "int"
-    elif isinstance(amount, float):
-        amount_type = "float"
+    if from_currency.lower() == to_currency.lower():
+        return amount
+    return _apply_rate(amount, await get_exchange_rate(from_currency, to_currency))
 
-    from_currency = from_currency.lower()
-    to_currency = to_currency.lower()
 
-    try:
-        if from_currency == to_currency:
-            return amount
-
-        cache_key = f"{from_currency}_{to_currency}"
-        current_time = time.time()
-        exchange_rate = None
-
-        async with _cache_lock:
-            if (
-                cache_key in _exchange_rate_cache
-                and cache_key in _cache_expiry
-                and current_time < _cache_expiry[cache_key]
-            ):
-                exchange_rate = _exchange_rate_cache[cache_key]
-
-        if exchange_rate is None:
-            url = f"https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/{from_currency}.json"
-            logger.trace(f"Fetching exchange rate from {url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        raise Exception(f"HTTP error: {response.status}")
-                    data = await response.json()
-
-            if from_currency not in data:
-                raise Exception(
-                    f"Currency {from_currency} not found in available rates"
-                )
-            rates = data[from_currency]
+async def convert_many(
+    amounts: list[Union[int, float]],
+    currencies: str | list[str],
+    to_currency: str,
+) -> list[Union[int, float]]:
+    """
+    Convert many amounts into one currency using a single rate table lookup.
 
-            if to_currency not in rates:
-                raise Exception(f"Currency {to_currency} not found in available rates")
+    Args:
+        amounts: Amounts to convert
+        currencies: The currency of every amount, or one currency shared by all of them
+        to_currency: Currency to convert into
 
-            exchange_rate = rates[to_currency]
-            async with _cache_lock:
-                _exchange_rate_cache[cache_key] = exchange_rate
-                _cache_expiry[cache_key] = current_time + _cache_duration
+    Returns:
+        list: Converted amounts in the same order, ints stay ints like in convert
+    """
+    if isinstance(currencies, str):
+        currencies = [currencies] * len(amounts)
+    if len(currencies) != len(amounts):
+        raise ValueError("amounts and currencies must have the same length")
+
+    if all(currency.lower() == to_currency.lower() for currency in currencies):
+        return list(amounts)
+
+    rates = await _get_fx_rates()
+    return [
+        _apply_rate(amount, _cross_rate(rates, currency, to_currency))
+        for amount, currency in zip(amounts, currencies)
+    ]
 
-        converted_amount = amount * exchange_rate
-        if amount_type == "int":
-            return int(round(converted_amount))
-        else:  # amount_type == 'float'
-            return float(converted_amount)
-    except Exception as e:
-        logger.warning(f"Conversion error: {str(e)}, retrying...")
-        await asyncio.sleep(1)
-        try:
-            async with aiohttp.ClientSession() as session:
-                backup_url = (
-                    f"https://open.er-api.com/v6/latest/{from_currency.upper()}"
+
+# Steam prices every currency from the USD price with its own rounding and
+# regional pricing, so each currency is tracked as a ratio to the FX rate
+STEAM_RATIOS_PATH = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\utils\cache\miscellaneous\steam_currency_ratios.json"
+# Derived secondary prices are converted from this currency, priced with public clients
+FX_REFERENCE_CURRENCY = "USD"
+
+
+class SteamPricingRatios:
+    """
+    Learned ratio between Steam's price of an item in a currency and the
+    FX-converted reference currency price of the same item.
+
+    A currency is calibrated from a few real fetches. Its ratio is trusted for
+    calibration_seconds as long as the samples agreed with it within error_bound;
+    when a calibration finds the previous ratio off by more than error_bound the
+    currency is fetched for real until a later calibration agrees again.
+    """
+
+    def __init__(self, path: str, error_bound: float, calibration_seconds: float):
+        self.path = path
+        self.error_bound = error_bound
+        self.calibration_seconds = calibration_seconds
+        self._entries: dict[str, dict[str, float]] | None = None
+        self.calibrations = 0
+        self.drifts = 0
+
+    def _loaded(self) -> dict[str, dict[str, float]]:
+        if self._entries is None:
+            try:
+                self._entries = _read_json_file(self.path)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning(f"Failed to read Steam currency ratios: {e}")
+                self._entries = {}
+        return self._entries
+
+    def ratio(self, currency: str) -> float | None:
+        entry = self._loaded().get(currency.upper())
+        return entry["ratio"] if entry else None
+
+    def trusted(self, currency: str) -> bool:
+        """True if derived prices in this currency can be used without a calibration first."""
+        entry = self._loaded().get(currency.upper())
+        return (
+            entry is not None
+            and entry["error"] <= self.error_bound
+            and time.time() - entry["calibrated_at"] <= self.calibration_seconds
+        )
+
+    async def calibrate(
+        self, currency: str, samples: list[tuple[float, float]]
+    ) -> bool:
+        """
+        Updates a currency's ratio from (real Steam price, FX-converted reference price) pairs.
+
+        Returns:
+            bool: True if the samples agree with the ratio within the error bound
+        """
+        currency = currency.upper()
+        samples = [(real, converted) for real, converted in samples if real and converted]
+        if not samples:
+            return False
+
+        observed = sorted(real / converted for real, converted in samples)
+        ratio = observed[len(observed) // 2]
+        # Spread of the samples around the new ratio, and drift of the old one
+        error = max(abs(ratio * converted - real) / real for real, converted in samples)
+        previous = self.ratio(currency)
+        if previous is not None:
+            drift = max(
+                abs(previous * converted - real) / real for real, converted in samples
+            )
+            if drift > self.error_bound:
+                self.drifts += 1
+                logger.warning(
+                    f"Steam {currency} pricing drifted {drift:.1%} from the learned ratio, "
+                    f"fetching {currency} prices directly"
                 )
-                async with session.get(backup_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("result") == "success":
-                            rates = data.get("rates", {})
-                            if to_currency.upper() in rates:
-                                rate = rates[to_currency.upper()]
-                                converted_amount = amount * rate
-                                return (
-                                    int(round(converted_amount))
-                                    if amount_type == "int"
-                                    else float(converted_amount)
-                                )
+            error = max(error, drift)
+
+        self._loaded()[currency] = {
+            "ratio": ratio,
+            "error": error,
+            "calibrated_at": time.time(),
+        }
+        self.calibrations += 1
+        try:
+            # Written from a copy off the event loop; entries are replaced, never mutated
+            await asyncio.to_thread(_write_json_file, self.path, dict(self._entries))
         except Exception as e:
-            raise Exception(f"Conversion error: {str(e)}")
+            logger.error(f"Failed to save Steam currency ratios: {e}")
+        return error <= self.error_bound
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calibrations": self.calibrations,
+            "drifts": self.drifts,
+            "currencies": {
+                currency: {
+                    "ratio": round(entry["ratio"], 4),
+                    "error": round(entry["error"], 4),
+                    "trusted": self.trusted(currency),
+                }
+                for currency, entry in self._loaded().items()
+            },
+        }
+
+
+_steam_ratios = SteamPricingRatios(
+    STEAM_RATIOS_PATH, FX_RATIO_ERROR_BOUND, FX_RATIO_CALIBRATION_SECONDS
+)
+
 
+async def convert_steam_prices(
+    amounts: list[Union[int, float]], from_currency: str, to_currency: str
+) -> list[float]:
+    """
+    convert_many with Steam's learned pricing ratio of to_currency applied, for
+    deriving prices in one currency from prices fetched in another.
 
-def generate_session(use_proxies=USE_PROXIES) -> aiohttp.ClientSession:
+    Raises:
+        ValueError: If either currency is not the reference currency and has no
+            trusted ratio; a plain FX conversion would misprice regional currencies
+    """
+    converted = await convert_many(amounts, from_currency, to_currency)
+    if from_currency.upper() == to_currency.upper():
+        return converted
+    ratio = _trusted_steam_ratio(to_currency) / _trusted_steam_ratio(from_currency)
+    return [amount * ratio for amount in converted]
+
+
+def _trusted_steam_ratio(currency: str) -> float:
+    """The reference currency's ratio is 1 by definition, other currencies need a trusted one."""
+    if currency.upper() == FX_REFERENCE_CURRENCY:
+        return 1.0
+    if not _steam_ratios.trusted(currency):
+        raise ValueError(f"No trusted Steam pricing ratio for {currency}")
+    return _steam_ratios.ratio(currency)
+
+
+def generate_session(
+    use_proxies=USE_PROXIES,
+    account: str | None = None,
+    exclude_proxy: str | None = None,
+) -> aiohttp.ClientSession:
+    """
+    Creates a session, routed through a proxy from the proxy pool when proxies are
+    enabled. Sessions for an account use the proxy the account is pinned to, and
+    sessions on the same proxy share its connection-capped connector.
+    """
     if use_proxies:
+        proxy = proxy_pool.acquire(account, exclude=exclude_proxy)
         session = patch_session_with_http_proxy(
-            aiohttp.ClientSession(raise_for_status=True), generate_proxy()
+            proxy_pool.session(
+                proxy,
+                raise_for_status=True,
+                trace_configs=instrumentation.trace_configs(),
+            ),
+            proxy,
         )
     else:
-        session = aiohttp.ClientSession(raise_for_status=True)
+        session = aiohttp.ClientSession(
+            raise_for_status=True, trace_configs=instrumentation.trace_configs()
+        )
 
     return session
 
 
-def update_price_in_db(
-    market_hash_name: str, price: float, currency: str
-) -> int | None:
+class PriceCache:
     """
-    Update the price and timestamp for an item in the prices database.
-
-    Args:
-        market_hash_name (str): The market hash name of the item
-        price (float): The new price to set
-        currency (str): The 3 letter currency string to get the column to update price
+    Process-wide LRU cache of buy order prices in front of prices.db.
 
-    Returns:
-        int: 0 if a new column was created, None otherwise
+    Entries are keyed by (market_hash_name, currency) and hold the price in cents,
+    the unix time it was fetched and the item's TTL from the item catalog at that
+    time. update_price_in_db writes through to the cache,
+    so a fresh price is served without opening the database.
     """
-    db_path = PRICES_DB_PATH
-    column_name = f"buy_order_price_{currency.lower()}"
 
-    conn = None
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, int, int]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, market_hash_name: str, currency: str) -> float | None:
+        """Returns the cached price in cents if it is still fresh, None otherwise."""
+        key = (market_hash_name, currency.upper())
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        price, fetched_at, ttl = entry
+        if int(time.time()) - fetched_at > ttl:
+            self.stale += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return price
+
+    def peek(self, market_hash_name: str, currency: str) -> float | None:
+        """Returns the cached price in cents regardless of age, without counting it."""
+        entry = self._entries.get((market_hash_name, currency.upper()))
+        return entry[0] if entry else None
+
+    def fetched_at(self, market_hash_name: str, currency: str) -> int | None:
+        """Returns when the cached price was fetched, without counting a lookup."""
+        entry = self._entries.get((market_hash_name, currency.upper()))
+        return entry[1] if entry else None
+
+    def fetched_at_by_key(self) -> dict[tuple[str, str], int]:
+        """Returns when every cached price was fetched, keyed by (name, currency)."""
+        return {key: entry[1] for key, entry in self._entries.items()}
+
+    def put(
+        self,
+        market_hash_name: str,
+        currency: str,
+        price: float,
+        fetched_at: int | None = None,
+    ) -> None:
+        key = (market_hash_name, currency.upper())
+        if fetched_at is None:
+            fetched_at = int(time.time())
+
+        self._entries[key] = (price, fetched_at, price_ttl_seconds(market_hash_name))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses + self.stale
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
 
-        # Check if the column exists
-        cursor.execute("PRAGMA table_info(prices)")
-        columns = [info[1] for info in cursor.fetchall()]
 
-        column_created = False
-        if column_name not in columns:
-            # Create the column if it doesn't exist
-            query = f"ALTER TABLE prices ADD COLUMN {column_name} REAL"
-            cursor.execute(query)
-            column_created = True
+_price_cache = PriceCache(PRICE_CACHE_MAX_ENTRIES)
 
-        current_time = int(time.time())
 
-        # Update the price in the appropriate column
-        query = (
-            f"UPDATE prices set {column_name} = ?, time = ? WHERE market_hash_name = ?"
-        )
-        cursor.execute(query, (price, current_time, market_hash_name))
+def get_price_cache_stats() -> dict[str, int | float]:
+    """Returns hit/miss/stale counters of the in-process price cache."""
+    return _price_cache.stats()
 
-        conn.commit()
 
-        if column_created:
-            return 0
-        return None
+def get_cached_price_fetched_at(market_hash_name: str, currency: str) -> int | None:
+    """Returns the unix time the in-process cached price was fetched, or None if it is not cached."""
+    return _price_cache.fetched_at(market_hash_name, currency)
 
-    except sqlite3.Error as e:
-        logger.error(f"Database error: {e}")
-        return None
-    finally:
-        if conn:
-            conn.close()
+
+def get_cached_prices_fetched_at() -> dict[tuple[str, str], int]:
+    """Returns a copy of when every in-process cached price was fetched, keyed by (name, currency)."""
+    return _price_cache.fetched_at_by_key()
+
+
+def update_price_in_db(market_hash_name: str, price: float, currency: str) -> None:
+    """
+    Update the price and timestamp of an item in one currency in the prices database.
+    The row goes through the price_store write-behind buffer, which batches writes
+    into one transaction; the in-process price cache is updated immediately. The
+    price is also fed to the item catalog so the item's TTL follows how much it moves.
+
+    Args:
+        market_hash_name (str): The market hash name of the item
+        price (float): The new price to set, in cents
+        currency (str): The 3 letter currency code of the price
+    """
+    if price is None:
+        logger.warning(f"Not storing empty {currency} price for {market_hash_name}")
+        return
+
+    current_time = int(time.time())
+    observe_price(market_hash_name, currency, price, current_time)
+    price_store.buffer_price(market_hash_name, currency, price, current_time)
+    _price_cache.put(market_hash_name, currency, price, current_time)
 
 
 CS2_APP_ID = "730"
@@ -432,12 +803,36 @@ LOCAL_FILE_PATH = (
 REMOTE_JSON_URL = "https://raw.githubusercontent.com/EricZhu-42/SteamTradingSite-ID-Mapper/main/steam/730.json"
 
 
+ITEM_ID_INDEX_PATH = os.path.join(
+    os.path.dirname(LOCAL_FILE_PATH), "730_name_ids.json"
+)
+ITEM_ID_REFRESH_COOLDOWN_SECONDS = _config.get("ITEM_ID_REFRESH_COOLDOWN_SECONDS", 600)
+
+# market_hash_name -> name_id, loaded once per process from ITEM_ID_INDEX_PATH
+_item_id_index: dict[str, int] | None = None
+_item_id_index_lock = asyncio.Lock()
+_item_id_refresh_task: asyncio.Task | None = None
+_item_id_last_refresh = 0.0
+
+
+def _read_json_file(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json_file(path: str, data: dict) -> None:
+    """Writes compact JSON through a temporary file so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
 async def load_local_json():
     """Load the local JSON cache file."""
     try:
-        with open(LOCAL_FILE_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data
+        return await asyncio.to_thread(_read_json_file, LOCAL_FILE_PATH)
     except Exception as e:
         logger.error(f"Failed to read local JSON file: {e}")
         return {}
@@ -446,10 +841,7 @@ async def load_local_json():
 async def save_local_json(data):
     """Save data to the local JSON cache file."""
     try:
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(LOCAL_FILE_PATH), exist_ok=True)
-        with open(LOCAL_FILE_PATH, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(_write_json_file, LOCAL_FILE_PATH, data)
         logger.info("Local JSON file updated successfully.")
     except Exception as e:
         logger.error(f"Failed to save local JSON file: {e}")
@@ -460,7 +852,7 @@ async def fetch_remote_json(session):
     try:
         async with session.get(REMOTE_JSON_URL) as response:
             if response.status == 200:
-                remote_data = await response.json()
+                remote_data = await response.json(content_type=None)
                 logger.info("Fetched remote JSON data successfully.")
                 return remote_data
             else:
@@ -471,6 +863,123 @@ async def fetch_remote_json(session):
         return {}
 
 
+def _build_item_id_index(data: dict) -> dict[str, int]:
+    """Maps en_name -> name_id for every entry of 730.json, keeping the first match like the old scan did."""
+    index: dict[str, int] = {}
+    for value in data.values():
+        if isinstance(value, dict) and "en_name" in value and "name_id" in value:
+            index.setdefault(value["en_name"], value["name_id"])
+    return index
+
+
+def _load_item_id_index_from_disk() -> dict[str, int]:
+    """
+    Reads the name -> name_id index, rebuilding it from 730.json when the index
+    is missing or older than 730.json.
+    """
+    try:
+        index_is_fresh = os.path.getmtime(ITEM_ID_INDEX_PATH) >= os.path.getmtime(
+            LOCAL_FILE_PATH
+        )
+    except OSError:
+        index_is_fresh = os.path.isfile(ITEM_ID_INDEX_PATH)
+
+    if index_is_fresh:
+        try:
+            return _read_json_file(ITEM_ID_INDEX_PATH)
+        except Exception as e:
+            logger.warning(f"Failed to read item_id index, rebuilding it: {e}")
+
+    try:
+        data = _read_json_file(LOCAL_FILE_PATH)
+    except Exception as e:
+        logger.error(f"Failed to read local JSON file: {e}")
+        return {}
+
+    index = _build_item_id_index(data)
+    try:
+        _write_json_file(ITEM_ID_INDEX_PATH, index)
+    except Exception as e:
+        logger.error(f"Failed to save item_id index: {e}")
+    logger.info(f"Built item_id index with {len(index)} items from {LOCAL_FILE_PATH}")
+    return index
+
+
+async def _get_item_id_index() -> dict[str, int]:
+    global _item_id_index
+    if _item_id_index is None:
+        async with _item_id_index_lock:
+            if _item_id_index is None:
+                _item_id_index = await asyncio.to_thread(_load_item_id_index_from_disk)
+    return _item_id_index
+
+
+async def _download_item_id_index() -> None:
+    """Downloads the remote 730.json once and merges it into the local files and the index."""
+    global _item_id_index, _item_id_last_refresh
+    async with aiohttp.ClientSession() as session:
+        remote_data = await fetch_remote_json(session)
+    _item_id_last_refresh = time.time()
+
+    if not remote_data:
+        return
+
+    data = await load_local_json()
+    data.update(remote_data)
+    await save_local_json(data)
+
+    index = _build_item_id_index(data)
+    _item_id_index = {**(_item_id_index or {}), **index}
+    try:
+        await asyncio.to_thread(_write_json_file, ITEM_ID_INDEX_PATH, _item_id_index)
+    except Exception as e:
+        logger.error(f"Failed to save item_id index: {e}")
+
+
+async def _refresh_item_id_index() -> None:
+    """
+    Refreshes the index from the remote 730.json. Concurrent callers share one
+    download, and a refresh within ITEM_ID_REFRESH_COOLDOWN_SECONDS of the last
+    one is skipped.
+    """
+    global _item_id_refresh_task
+    if _item_id_refresh_task is None or _item_id_refresh_task.done():
+        if time.time() - _item_id_last_refresh < ITEM_ID_REFRESH_COOLDOWN_SECONDS:
+            logger.debug("Skipping remote JSON fetch, it was refreshed recently")
+            return
+        _item_id_refresh_task = asyncio.ensure_future(_download_item_id_index())
+    await asyncio.shield(_item_id_refresh_task)
+
+
+async def resolve_item_ids(market_hash_names: list[str]) -> dict[str, int]:
+    """
+    Resolves item_ids (name_ids) for many market_hash_names at once.
+
+    Lookups hit the in-memory index; all misses in the batch are served by a
+    single remote refresh.
+
+    Returns:
+        dict: market_hash_name -> item_id for the names that could be resolved
+    """
+    index = await _get_item_id_index()
+    names = list(dict.fromkeys(market_hash_names))
+    missing = [name for name in names if name not in index]
+
+    if missing:
+        logger.warning(
+            f"Item_id not found for {len(missing)} items in local cache, fetching remote JSON..."
+        )
+        await _refresh_item_id_index()
+        index = await _get_item_id_index()
+        still_missing = [name for name in missing if name not in index]
+        if still_missing:
+            logger.critical(
+                f"Critical: item_id not found for {still_missing} even after updating cache"
+            )
+
+    return {name: index[name] for name in names if name in index}
+
+
 async def fetch_item_id(market_hash_name: str) -> int | None:
     """
     Fetch item_id (name_id) for a given market_hash_name.
@@ -484,65 +993,20 @@ async def fetch_item_id(market_hash_name: str) -> int | None:
     Raises:
         ValueError: If item is not found even after updating cache
     """
-    async with aiohttp.ClientSession() as session:
-        # Load local JSON cache
-        data = await load_local_json()
-
-        # Search for item by en_name
-        key_found = None
-        for key, value in data.items():
-            if value.get("en_name") == market_hash_name:
-                key_found = key
-                break
-
-        # If found locally and has name_id
-        if key_found and "name_id" in data[key_found]:
-            item_id = data[key_found]["name_id"]
-            logger.info(
-                f"Found item_id: {item_id} for {market_hash_name} from local cache"
-            )
-            return item_id  # Return just the item_id, not a dict
-
-        # Not found locally - fetch remote data and update cache
-        logger.warning(
-            f"Item_id not found for {market_hash_name} in local cache, fetching remote JSON..."
-        )
-        remote_data = await fetch_remote_json(session)
-
-        if remote_data:
-            # Update local data with remote data
-            data.update(remote_data)
-            await save_local_json(data)
-
-            # Search again in updated data
-            for key, value in data.items():
-                if value.get("en_name") == market_hash_name and "name_id" in value:
-                    item_id = value["name_id"]
-                    logger.info(
-                        f"Found item_id: {item_id} for {market_hash_name} after updating cache"
-                    )
-                    return item_id  # Return just the item_id, not a dict
+    item_ids = await resolve_item_ids([market_hash_name])
+    if market_hash_name in item_ids:
+        item_id = item_ids[market_hash_name]
+        logger.info(f"Found item_id: {item_id} for {market_hash_name}")
+        return item_id
 
-        # Still not found - critical error
-        logger.critical(
-            f"Critical: item_id not found for {market_hash_name} even after updating cache"
-        )
-        raise ValueError(f"item_id not found for {market_hash_name}")
+    raise ValueError(f"item_id not found for {market_hash_name}")
 
 
 def get_item_id_from_db(market_hash_name: str) -> int:
-    conn = sqlite3.connect(PRICES_DB_PATH)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "SELECT item_id FROM prices WHERE market_hash_name = ?", (market_hash_name,)
-        )
-        result = cursor.fetchone()
-        if result:
-            return result[0]
-        raise Exception(f"Item '{market_hash_name}' not found in database")
-    finally:
-        conn.close()
+    item_ids = price_store.get_item_ids([market_hash_name])
+    if market_hash_name in item_ids:
+        return item_ids[market_hash_name]
+    raise Exception(f"Item '{market_hash_name}' not found in database")
 
 
 async def add_to_db(
@@ -554,14 +1018,85 @@ async def add_to_db(
     await add_multiple_to_db([market_hash_name], client, currencies=[currency])
 
 
-def is_price_outdated(timestamp: int) -> bool:
-    current_time = int(time.time())
-    return (current_time - timestamp) > OUTDATED_TIME_SECONDS
+def is_price_outdated(market_hash_name: str, timestamp: int) -> bool:
+    """True if a price fetched at `timestamp` is older than the item's TTL."""
+    return int(time.time()) - timestamp > price_ttl_seconds(market_hash_name)
 
 
-def is_price_outdated_main(timestamp: int) -> bool:
-    current_time = int(time.time())
-    return (current_time - timestamp) > OUTDATED_TIME_SECONDS_MAIN
+def _read_price_row(
+    market_hash_name: str, currency: str
+) -> tuple[int, float | None, int | None] | None:
+    """Reads (item_id, price in cents, fetched_at) for an item in one currency, or None if the item is missing."""
+    return price_store.read_prices([market_hash_name], currency).get(market_hash_name)
+
+
+async def _get_price_through_cache(
+    market_hash_name: str,
+    currency: str,
+    fetch_price: Callable[[int], Any],
+    add_item: Callable[[], Any],
+) -> float:
+    """
+    Shared lookup behind get_db_price and get_db_price_usd_public.
+
+    Order of lookups: in-process price cache, then prices.db, then the market
+    through fetch_price(item_id). Items missing from the database are added with
+    add_item(). Returns the price in the main currency unit.
+    """
+    cached_price = _price_cache.get(market_hash_name, currency)
+    if cached_price is not None:
+        instrumentation.count("price_lookup.cache.hit")
+        logger.trace(
+            f"Using cached price for {market_hash_name}: {cached_price / 100} {currency}"
+        )
+        return cached_price / 100
+    instrumentation.count("price_lookup.cache.miss")
+
+    row = _read_price_row(market_hash_name, currency)
+
+    if row is None:
+        instrumentation.count("price_lookup.db.miss")
+        # Item doesn't exist in the database at all
+        logger.info(f"Item {market_hash_name} not found in database, adding it now")
+        await add_item()
+
+        # add_multiple_to_db writes the new prices through to the cache
+        added_price = _price_cache.peek(market_hash_name, currency)
+        if added_price is not None:
+            return added_price / 100  # Convert from cents to main currency unit
+
+        error_msg = f"Item still does not exist in the db or {currency} price is not available"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+    item_id, db_price, fetched_at = row
+
+    if db_price is None:
+        # Price is None, so we need to update the price directly
+        # without fetching item_id again since the item already exists
+        logger.info(
+            f"Item {market_hash_name} exists but {currency} price is None, updating price"
+        )
+    else:
+        _price_cache.put(market_hash_name, currency, db_price, fetched_at)
+        if int(time.time()) - fetched_at <= price_ttl_seconds(market_hash_name):
+            instrumentation.count("price_lookup.db.hit")
+            logger.trace(
+                f"Using stored price for {market_hash_name}: {db_price / 100} {currency}"
+            )
+            return db_price / 100  # Return existing price if it's recent
+
+    # Price is missing or outdated, update it
+    instrumentation.count("price_lookup.db.miss")
+    with instrumentation.timed(f"price_lookup.market.{currency}"):
+        new_price = await fetch_price(item_id)
+    update_price_in_db(market_hash_name, new_price, currency)
+    logger.trace(
+        f"{market_hash_name} price updated to {new_price / 100:.2f} {currency}"
+        + (" (was None)" if db_price is None else "")
+    )
+
+    return new_price / 100  # Convert from cents to main currency unit
 
 
 async def get_db_price(
@@ -573,405 +1108,665 @@ async def get_db_price(
     so the returned value is divided by 100 to convert to the main currency unit.
 
     If the item is not already in the db, it is added. If the item is not one of the main items, it's price is also updated. Multiple prices for multiple different currencies are stored, pass the currency to get the price of that specific currency.
+    Fresh prices are served from the in-process price cache without touching the database.
     """
 
-    main_items = [
-        "Dreams & Nightmares Case",
-        "Kilowatt Case",
-        "Revolution Case",
-        "Fracture Case",
-        "Recoil Case",
-        "Gallery Case",
-        "Fever Case",
-    ]
+    async def fetch_price(item_id: int) -> float:
+        return await get_single_item_price(
+            item_id=item_id, client=client, currency=currency
+        )
+
+    async def add_item() -> None:
+        if client:
+            await add_to_db(market_hash_name, client, currency=currency)
+        else:
+            await add_to_db(market_hash_name, currency=currency)
+
+    return await _get_price_through_cache(
+        market_hash_name, currency, fetch_price, add_item
+    )
 
-    column_name = f"buy_order_price_{currency.lower()}"
 
-    # Check if the column exists, create it if it doesn't
-    conn = sqlite3.connect(PRICES_DB_PATH)
-    cursor = conn.cursor()
+async def get_db_price_usd_public(market_hash_name: str) -> float:
+    """Get the price of an item from the database using the market hash name.
+
+    Note: Price is stored in cents in the database for compatibility reasons,
+    so the returned value is divided by 100 to convert to the main currency unit.
+
+    If the item is not already in the db, it is added. If the item is not one of the main items, its price is also updated. Multiple prices for multiple different currencies are stored.
+    This func is only for getting the USD price, refer to get_db_price to get prices in different currencies.
+    """
+    currency = "USD"
 
-    # Check if the column exists
-    cursor.execute("PRAGMA table_info(prices)")
-    columns = [info[1] for info in cursor.fetchall()]
+    async def fetch_price(item_id: int) -> float:
+        return await get_single_item_price_usd_public(item_id=item_id)
 
-    if column_name not in columns:
-        # Create the column if it doesn't exist
-        query = f"ALTER TABLE prices ADD COLUMN {column_name} REAL"
-        cursor.execute(query)
-        conn.commit()
-        logger.info(f"Created new column {column_name} in prices table")
+    async def add_item() -> None:
+        await add_to_db(market_hash_name, currency=currency)
 
-    # Check if the item exists in the database
-    cursor.execute(
-        f"SELECT {column_name} FROM prices WHERE market_hash_name = ?",
-        (market_hash_name,),
+    return await _get_price_through_cache(
+        market_hash_name, currency, fetch_price, add_item
     )
-    result = cursor.fetchone()
-    conn.close()
 
-    if result is not None:
-        # Item exists in the database
 
-        # Check if price is None for the given currency
-        if result[0] is None:
-            # Price is None, so we need to update the price directly
-            # without fetching item_id again since the item already exists
-            logger.info(
-                f"Item {market_hash_name} exists but {currency} price is None, updating price"
-            )
+# In-flight histogram fetches keyed by (item_id, currency), shared by concurrent callers
+_histogram_inflight: dict[tuple[int, str], asyncio.Task] = {}
+_histogram_stats = {"requests": 0, "collapsed": 0}
 
-            # Get the item_id from the database since the item already exists
-            item_id = get_item_id_from_db(market_hash_name)
-            new_price = await get_single_item_price(
-                item_id=item_id, client=client, currency=currency
-            )
-            update_price_in_db(market_hash_name, new_price, currency)
-            logger.trace(
-                f"{market_hash_name} price updated to {new_price / 100:.2f} {currency} (was None)"
+
+def _price_from_histogram(histogram: ItemOrdersHistogram) -> float:
+    """Price in cents to sell at: the best buy order, or just under the lowest sell order if that is higher."""
+    highest_buy_order = (
+        histogram.highest_buy_order or 0.03
+    )  # Default to 0.03 if None as its lowest possible value
+    return float(
+        max(
+            highest_buy_order,
+            PERCENTAGE_OF_LOWEST_BUY_THRESHOLD * (histogram.lowest_sell_order or 0),
+        )
+    )
+
+
+class PriceFetchGovernor:
+    """
+    Caps concurrent price requests for one (client, currency) pair and keeps
+    count of how many requests are waiting for a slot and how many are running.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "limit": self.limit,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+        }
+
+
+# One governor per (client username, currency); public clients share the "public" key
+_price_fetch_governors: dict[tuple[str, str], PriceFetchGovernor] = {}
+
+
+def _get_price_fetch_governor(
+    client: SteamClient | SteamPublicClient, currency: str
+) -> PriceFetchGovernor:
+    client_key = getattr(client, "username", None) or "public"
+    key = (client_key, currency.upper())
+    governor = _price_fetch_governors.get(key)
+    if governor is None:
+        governor = PriceFetchGovernor(PRICE_SEMAPHORE)
+        _price_fetch_governors[key] = governor
+    return governor
+
+
+def get_price_fetch_governor_stats() -> dict[str, dict[str, int]]:
+    """Returns waiting / in-flight / completed price request counts per client and currency."""
+    return {
+        f"{client_key}/{currency}": governor.stats()
+        for (client_key, currency), governor in _price_fetch_governors.items()
+    }
+
+
+async def _fetch_histogram_price(
+    client: SteamClient | SteamPublicClient, item_id: int, currency: str
+) -> float:
+    async with _get_price_fetch_governor(client, currency).slot():
+        logger.trace(f"Fetching histogram for item_id {item_id} with {currency}")
+        histogram_result = await steam_api_call_with_retry(
+            client.get_item_orders_histogram, item_id
+        )
+    orderbook_store.record_histogram(item_id, currency, histogram_result[0])
+    price = _price_from_histogram(histogram_result[0])
+    logger.trace(f"Got price {price} for item_id {item_id} in {currency}")
+    return price
+
+
+def _release_histogram_fetch(key: tuple[int, str], task: asyncio.Task) -> None:
+    _histogram_inflight.pop(key, None)
+    # Mark the exception as retrieved in case every waiter was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+async def get_histogram_price(
+    client: SteamClient | SteamPublicClient, item_id: int, currency: str
+) -> float:
+    """
+    Fetch the current price of an item from its order histogram (single-flight).
+
+    Concurrent calls for the same (item_id, currency) share one request to Steam:
+    the first caller issues it and later callers await the in-flight result.
+
+    Args:
+        client: Client whose wallet currency matches `currency`
+        item_id: The Steam item name id
+        currency: Currency code the client prices in (e.g. "INR", "USD")
+
+    Returns:
+        float: The item price in cents
+    """
+    key = (item_id, currency.upper())
+    task = _histogram_inflight.get(key)
+
+    if task is None:
+        _histogram_stats["requests"] += 1
+        task = asyncio.ensure_future(_fetch_histogram_price(client, item_id, currency))
+        _histogram_inflight[key] = task
+        task.add_done_callback(lambda t, key=key: _release_histogram_fetch(key, t))
+    else:
+        _histogram_stats["collapsed"] += 1
+        logger.trace(f"Joining in-flight histogram fetch for item_id {item_id} in {currency}")
+
+    # Shielded so a cancelled caller does not cancel the fetch for everyone else
+    return await asyncio.shield(task)
+
+
+def get_histogram_singleflight_stats() -> dict[str, int]:
+    """Returns how many histogram requests were issued and how many were collapsed into in-flight ones."""
+    return {**_histogram_stats, "in_flight": len(_histogram_inflight)}
+
+
+async def get_single_item_price(
+    item_id: int, client: SteamClient | None = None, currency: str = "INR"
+) -> float:
+    """
+    Get the price of a single item using an account with matching currency.
+
+    Args:
+        item_id: The Steam item ID
+        client: Optional existing Steam client
+        currency: Currency code (e.g. "INR", "USD")
+
+    Returns:
+        float: The item price in the requested currency
+    """
+    borrowed = None
+    if not client:
+        # Reuse any pooled client that already prices in this currency
+        client = borrowed = _client_pool.find(
+            lambda pooled: pooled.wallet_currency.name == currency
+        )
+
+    if not client:
+        all_accounts = get_all_steam_accounts()
+
+        # Find accounts with matching currency
+        if currency != "USD":
+            matching_accounts = [
+                acc for acc in all_accounts if acc["currency"] == currency
+            ]
+        else:
+            matching_accounts = [
+                acc
+                for acc in all_accounts
+                if acc.get("currency") == "USD" or acc.get("currency") is None
+            ]
+
+        # If no matching accounts found, use any account as fallback
+        if not matching_accounts:
+            logger.warning(
+                f"No accounts found with currency {currency}. Using fallback."
             )
+            matching_accounts = all_accounts
+
+        # Select a random account from matching accounts
+        account = random.choice(matching_accounts)
+        client = borrowed = await get_client(account)
+        logger.trace(f"Borrowed pooled Steam client for currency {currency}")
+
+    # Get the price using the client
+    try:
+        return await get_histogram_price(client, item_id, currency)
+    finally:
+        if borrowed is not None:
+            release_client(borrowed)
+
+
+# Seconds a replaced public session stays open so requests still running on it can finish
+_RETIRED_SESSION_GRACE_SECONDS = 30
+
+
+class PublicClientPool:
+    """
+    A few long-lived SteamPublicClients for USD prices, handed out round robin.
+
+    Each client keeps its proxied keep-alive session (and the proxy pool's shared
+    connector) open across requests, so pricing many items pays TCP, TLS and proxy
+    setup once per client instead of once per item. All pooled clients share the
+    "public" rate limiter bucket and price fetch governor. Clients whose session
+    was closed or that belong to another event loop are re-created on demand.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._clients: list[SteamPublicClient] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._next = 0
+        # id(old client) -> (old client, replacement), so concurrent retries on
+        # the same dead client all move to one replacement
+        self._replacements: dict[int, tuple[SteamPublicClient, SteamPublicClient]] = {}
+        self._retired: list[aiohttp.ClientSession] = []
+        self.created = 0
+        self.reused = 0
+        self.replaced = 0
+
+    def _new_client(self, exclude_proxy: str | None = None) -> SteamPublicClient:
+        client = SteamPublicClient(
+            session=generate_session(exclude_proxy=exclude_proxy), country="US"
+        )
+        self.created += 1
+        logger.trace("Created new pooled Steam Public client")
+        return client
+
+    def get(self) -> SteamPublicClient:
+        """Returns the next pooled client, creating it if the pool is not full yet."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions are bound to the loop they were created on
+            self._clients = []
+            self._replacements.clear()
+            self._loop = loop
+        self._clients = [client for client in self._clients if not client.session.closed]
+
+        if len(self._clients) < self.size:
+            client = self._new_client()
+            self._clients.append(client)
+            return client
+
+        self.reused += 1
+        self._next = (self._next + 1) % len(self._clients)
+        return self._clients[self._next]
+
+    def _retire(self, session: aiohttp.ClientSession) -> None:
+        self._retired.append(session)
+
+        def close() -> None:
+            if session in self._retired:
+                self._retired.remove(session)
+                asyncio.ensure_future(session.close())
+
+        asyncio.get_running_loop().call_later(_RETIRED_SESSION_GRACE_SECONDS, close)
+
+    def replace(self, old_client: SteamPublicClient) -> SteamPublicClient:
+        """
+        Swaps a client whose session is suspected dead for one on a different proxy.
+        The old session is closed after a grace period, not while other requests use it.
+        """
+        replacement = self._replacements.get(id(old_client))
+        if replacement is not None and replacement[0] is old_client:
+            return replacement[1]
+
+        new_client = self._new_client(exclude_proxy=_session_proxy(old_client.session))
+        self.replaced += 1
+        if old_client in self._clients:
+            self._clients[self._clients.index(old_client)] = new_client
+        if len(self._replacements) >= 4 * self.size:
+            self._replacements.clear()
+        self._replacements[id(old_client)] = (old_client, new_client)
+        self._retire(old_client.session)
+        return new_client
+
+    async def close_all(self) -> None:
+        """Closes every pooled and retired session."""
+        sessions = [client.session for client in self._clients] + self._retired
+        self._clients = []
+        self._retired = []
+        self._replacements.clear()
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                logger.error(f"Error while closing aiohttp session: {e}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._clients),
+            "created": self.created,
+            "reused": self.reused,
+            "replaced": self.replaced,
+        }
+
+
+_public_client_pool = PublicClientPool(PUBLIC_CLIENT_POOL_SIZE)
+
 
-            # Get the updated price from the database
-            conn = sqlite3.connect(PRICES_DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute(
-                f"SELECT {column_name} FROM prices WHERE market_hash_name = ?",
-                (market_hash_name,),
-            )
-            result = cursor.fetchone()
-            conn.close()
+def get_public_client_pool_stats() -> dict[str, int]:
+    """Returns how many pooled public clients exist and how often they were created, reused and replaced."""
+    return _public_client_pool.stats()
 
-            return result[0] / 100  # Convert from cents to main currency unit
 
-        # Price exists and is not None, check if it needs updating
-        is_main_item = market_hash_name in main_items
+async def close_public_client_pool() -> None:
+    """Closes all pooled public sessions, for use at the end of a run."""
+    await _public_client_pool.close_all()
 
-        conn = sqlite3.connect(PRICES_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            f"SELECT {column_name}, time FROM prices WHERE market_hash_name = ?",
-            (market_hash_name,),
-        )
-        db_result = cursor.fetchone()
-        conn.close()
-
-        # Check if price needs to be updated
-        price_outdated = (
-            is_price_outdated_main(db_result[1])
-            if is_main_item
-            else is_price_outdated(db_result[1])
-        )
 
-        if db_result and not price_outdated:
-            logger.trace(
-                f"Using cached price for {market_hash_name}: {db_result[0] / 100} {currency}"
-            )
-            return db_result[0] / 100  # Return existing price if it's recent
+async def get_single_item_price_usd_public(item_id: int) -> float:
+    """
+    Get the price of a single item using a pooled SteamPublicClient.
 
-        # Price is outdated, update it
-        item_id = get_item_id_from_db(market_hash_name)
-        new_price = await get_single_item_price(
-            item_id=item_id, client=client, currency=currency
-        )
-        update_price_in_db(market_hash_name, new_price, currency)
-        logger.trace(
-            f"{market_hash_name} price updated to {new_price / 100:.2f} {currency}"
-        )
+    Args:
+        item_id: The Steam item ID
 
-        # Get the updated price from the database
-        conn = sqlite3.connect(PRICES_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            f"SELECT {column_name} FROM prices WHERE market_hash_name = ?",
-            (market_hash_name,),
-        )
-        result = cursor.fetchone()
-        conn.close()
+    Returns:
+        float: The item price in USD cents, None if it could not be fetched
+    """
+    try:
+        return await get_histogram_price(_public_client_pool.get(), item_id, "USD")
+    except Exception as e:
+        logger.error(f"Error getting item price using steam public client: {e}")
 
-        return result[0] / 100  # Convert from cents to main currency unit
-    else:
-        # Item doesn't exist in the database at all
-        logger.info(f"Item {market_hash_name} not found in database, adding it now")
-        if client:
-            await add_to_db(market_hash_name, client, currency=currency)
-        else:
-            await add_to_db(market_hash_name, currency=currency)
 
-        # Get the added price from the database
-        conn = sqlite3.connect(PRICES_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            f"SELECT {column_name} FROM prices WHERE market_hash_name = ?",
-            (market_hash_name,),
-        )
-        result = cursor.fetchone()
-        conn.close()
+async def get_items_prices_usd_public(item_ids: list[int]) -> dict[int, float | None]:
+    """
+    Prices many items in USD in one call, spread over the pooled public clients.
 
-        if result and result[0] is not None:
-            return result[0] / 100  # Convert from cents to main currency unit
-        else:
-            error_msg = f"Item still does not exist in the db or {currency} price is not available"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+    Requests run concurrently but are paced by the shared "public" rate limiter
+    bucket and price fetch governor, like single lookups.
 
+    Args:
+        item_ids: The Steam item IDs
 
-async def get_db_price_usd_public(market_hash_name: str) -> float:
-    """Get the price of an item from the database using the market hash name.
+    Returns:
+        dict: item_id -> price in USD cents, None for items that could not be priced
+    """
+    item_ids = list(dict.fromkeys(item_ids))
+    prices = await asyncio.gather(*map(get_single_item_price_usd_public, item_ids))
+    return dict(zip(item_ids, prices))
 
-    Note: Price is stored in cents in the database for compatibility reasons,
-    so the returned value is divided by 100 to convert to the main currency unit.
 
-    If the item is not already in the db, it is added. If the item is not one of the main items, its price is also updated. Multiple prices for multiple different currencies are stored.
-    This func is only for getting the USD price, refer to get_db_price to get prices in different currencies.
+async def get_db_prices_usd_public(
+    market_hash_names: list[str],
+) -> dict[str, float | None]:
     """
+    Batch version of get_db_price_usd_public.
 
-    main_items = [
-        "Dreams & Nightmares Case",
-        "Kilowatt Case",
-        "Revolution Case",
-        "Fracture Case",
-        "Recoil Case",
-        "Gallery Case",
-        "Fever Case",
-    ]
+    Fresh prices come from the cache or prices.db as usual. All stale prices are
+    fetched together with get_items_prices_usd_public, and items missing from the
+    database are added one by one.
 
+    Returns:
+        dict: market_hash_name -> price in USD, None for items that could not be priced
+    """
     currency = "USD"
-    column_name = f"buy_order_price_{currency.lower()}"
-
-    # Check if the column exists, create it if it doesn't
-    conn = sqlite3.connect(PRICES_DB_PATH)
-    cursor = conn.cursor()
-
-    # Check if the column exists
-    cursor.execute("PRAGMA table_info(prices)")
-    columns = [info[1] for info in cursor.fetchall()]
-
-    if column_name not in columns:
-        # Create the column if it doesn't exist
-        query = f"ALTER TABLE prices ADD COLUMN {column_name} REAL"
-        cursor.execute(query)
-        conn.commit()
-        logger.info(f"Created new column {column_name} in prices table")
-
-    # Check if the item exists in the database
-    cursor.execute(
-        f"SELECT {column_name} FROM prices WHERE market_hash_name = ?",
-        (market_hash_name,),
-    )
-    result = cursor.fetchone()
-    conn.close()
-
-    if result is not None:
-        # Item exists in the database
+    market_hash_names = list(dict.fromkeys(market_hash_names))
+    prices: dict[str, float | None] = {}
+    stale: dict[int, str] = {}
+    missing: list[str] = []
+
+    uncached = []
+    for name in market_hash_names:
+        cached_price = _price_cache.get(name, currency)
+        if cached_price is not None:
+            instrumentation.count("price_lookup.cache.hit")
+            prices[name] = cached_price / 100
+        else:
+            uncached.append(name)
+
+    rows = price_store.read_prices(uncached, currency) if uncached else {}
+    now = int(time.time())
+    for name in uncached:
+        row = rows.get(name)
+        if row is None:
+            # Counted by get_db_price_usd_public below
+            missing.append(name)
+            continue
+        instrumentation.count("price_lookup.cache.miss")
+        item_id, db_price, fetched_at = row
+        if db_price is not None:
+            _price_cache.put(name, currency, db_price, fetched_at)
+            if now - fetched_at <= price_ttl_seconds(name):
+                instrumentation.count("price_lookup.db.hit")
+                prices[name] = db_price / 100
+                continue
+        instrumentation.count("price_lookup.db.miss")
+        stale[item_id] = name
+
+    if stale:
+        logger.trace(f"Fetching {len(stale)} stale USD prices through the public pool")
+    for item_id, price in (await get_items_prices_usd_public(list(stale))).items():
+        name = stale[item_id]
+        if price is None:
+            prices[name] = None
+            continue
+        update_price_in_db(name, price, currency)
+        prices[name] = price / 100
 
-        # Check if price is None for USD
-        if result[0] is None:
-            # Price is None, so we need to update the price directly
-            # without adding the item again since it already exists
-            logger.info(
-                f"Item {market_hash_name} exists but USD price is None, updating price"
-            )
+    results = await asyncio.gather(
+        *map(get_db_price_usd_public, missing), return_exceptions=True
+    )
+    for name, price in zip(missing, results):
+        prices[name] = None if isinstance(price, Exception) else price
 
-            # Get the item_id from the database since the item already exists
-            item_id = get_item_id_from_db(market_hash_name)
-            new_price = await get_single_item_price_usd_public(item_id=item_id)
-            update_price_in_db(market_hash_name, new_price, currency)
-            logger.trace(
-                f"{market_hash_name} price updated to {new_price / 100:.2f} {currency} (was None)"
-            )
+    return {name: prices.get(name) for name in market_hash_names}
 
-            # Get the updated price from the database
-            conn = sqlite3.connect(PRICES_DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute(
-                f"SELECT {column_name} FROM prices WHERE market_hash_name = ?",
-                (market_hash_name,),
-            )
-            result = cursor.fetchone()
-            conn.close()
 
-            return result[0] / 100  # Convert from cents to main currency unit
+# Market search returns at most 100 results per request
+BULK_PRICE_PAGE_SIZE = 100
 
-        # Price exists and is not None, check if it needs updating
-        is_main_item = market_hash_name in main_items
+_bulk_price_stats = {"searches": 0, "pages": 0, "items_seen": 0, "prices_stored": 0}
 
-        conn = sqlite3.connect(PRICES_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            f"SELECT {column_name}, time FROM prices WHERE market_hash_name = ?",
-            (market_hash_name,),
-        )
-        db_result = cursor.fetchone()
-        conn.close()
-
-        # Check if price needs to be updated
-        price_outdated = (
-            is_price_outdated_main(db_result[1])
-            if is_main_item
-            else is_price_outdated(db_result[1])
-        )
 
-        if db_result and not price_outdated:
-            logger.trace(
-                f"Using cached price for {market_hash_name}: {db_result[0] / 100} {currency}"
-            )
-            return db_result[0] / 100  # Return existing price if it's recent
+async def fetch_search_sell_prices(
+    wanted: set[str], max_pages: int = BULK_PRICE_MAX_PAGES
+) -> dict[str, int]:
+    """
+    Pages through CS2 market search results, most listed items first, until every
+    wanted item was seen or max_pages were read.
 
-        # Price is outdated, update it
-        item_id = get_item_id_from_db(market_hash_name)
-        new_price = await get_single_item_price_usd_public(item_id=item_id)
-        update_price_in_db(market_hash_name, new_price, currency)
-        logger.trace(
-            f"{market_hash_name} price updated to {new_price / 100:.2f} {currency}"
-        )
+    Args:
+        wanted: Market hash names to look for
+        max_pages: Most search pages (of BULK_PRICE_PAGE_SIZE items) to request
 
-        # Get the updated price from the database
-        conn = sqlite3.connect(PRICES_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            f"SELECT {column_name} FROM prices WHERE market_hash_name = ?",
-            (market_hash_name,),
+    Returns:
+        dict: market_hash_name -> lowest listing price in USD cents, for every item
+              seen that has listings (not only the wanted ones)
+    """
+    client = _public_client_pool.get()
+    sell_prices: dict[str, int] = {}
+    missing = set(wanted)
+    _bulk_price_stats["searches"] += 1
+
+    start = 0
+    for _ in range(max_pages):
+        items, total = await steam_api_call_with_retry(
+            client.get_market_search_results,
+            app=App.CS2,
+            start=start,
+            count=BULK_PRICE_PAGE_SIZE,
+            sort_column="quantity",
+            sort_dir="desc",
         )
-        result = cursor.fetchone()
-        conn.close()
+        _bulk_price_stats["pages"] += 1
+        _bulk_price_stats["items_seen"] += len(items)
 
-        return result[0] / 100  # Convert from cents to main currency unit
-    else:
-        # Item doesn't exist in the database at all
-        logger.info(f"Item {market_hash_name} not found in database, adding it now")
-        await add_to_db(market_hash_name, currency=currency)
+        for item in items:
+            name = item.description.market_hash_name
+            if item.sell_listings and item.sell_price:
+                sell_prices[name] = item.sell_price
+            missing.discard(name)
 
-        # Get the added price from the database
-        conn = sqlite3.connect(PRICES_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            f"SELECT {column_name} FROM prices WHERE market_hash_name = ?",
-            (market_hash_name,),
-        )
-        result = cursor.fetchone()
-        conn.close()
+        start += len(items)
+        if not items or not missing or start >= total:
+            break
 
-        if result and result[0] is not None:
-            return result[0] / 100  # Convert from cents to main currency unit
-        else:
-            error_msg = f"Item still does not exist in the db or {currency} price is not available"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+    logger.trace(
+        f"Market search found {len(wanted) - len(missing)}/{len(wanted)} wanted items "
+        f"in {len(sell_prices)} results"
+    )
+    return sell_prices
 
 
-async def get_single_item_price(
-    item_id: int, client: SteamClient | None = None, currency: str = "INR"
-) -> float:
+async def bulk_update_prices(
+    items_by_currency: dict[str, set[str] | list[str]],
+) -> dict[str, set[str]]:
     """
-    Get the price of a single item using an account with matching currency.
+    Updates USD prices from paged market search results instead of one histogram per item.
 
-    Args:
-        item_id: The Steam item ID
-        client: Optional existing Steam client
-        currency: Currency code (e.g. "INR", "USD")
+    Search results are priced in USD only. Steam's regional prices are not
+    FX-converted USD prices, so other currencies are left untouched for
+    derive_secondary_prices and the per-currency histograms. The stored price is
+    the histogram formula's floor, PERCENTAGE_OF_LOWEST_BUY_THRESHOLD times the
+    lowest listing, which is what _price_from_histogram returns unless a buy
+    order sits above it. Main items are skipped because they are sold into buy
+    orders, so their buy order has to come from a histogram. Every known item
+    seen in the results is stored, not only the requested ones.
 
     Returns:
-        float: The item price in the requested currency
+        dict: currency -> names that were not priced and still need a histogram
     """
-    created_client = False
+    remaining = {currency: set(names) for currency, names in items_by_currency.items()}
+    wanted = {
+        name for name in items_by_currency.get("USD", []) if name not in MAIN_ITEMS
+    }
+    if not wanted:
+        return remaining
 
     try:
-        if not client:
-            all_accounts = get_all_steam_accounts()
-            user_agents = UserAgentsService()
-            await user_agents.load()
+        sell_prices = await fetch_search_sell_prices(wanted)
+    except Exception as e:
+        logger.error(f"Bulk market search failed, falling back to histograms: {e}")
+        return remaining
 
-            # Find accounts with matching currency
-            if currency != "USD":
-                matching_accounts = [
-                    acc for acc in all_accounts if acc["currency"] == currency
-                ]
-            else:
-                matching_accounts = [
-                    acc
-                    for acc in all_accounts
-                    if acc.get("currency") == "USD" or acc.get("currency") is None
-                ]
+    # Only items already in prices.db are stored; unknown ones would never be read
+    known = price_store.get_item_ids(
+        name for name in sell_prices if name not in MAIN_ITEMS
+    )
+    for name in known:
+        update_price_in_db(
+            name, round(PERCENTAGE_OF_LOWEST_BUY_THRESHOLD * sell_prices[name]), "USD"
+        )
+    _bulk_price_stats["prices_stored"] += len(known)
 
-            # If no matching accounts found, use any account as fallback
-            if not matching_accounts:
-                logger.warning(
-                    f"No accounts found with currency {currency}. Using fallback."
-                )
-                matching_accounts = all_accounts
+    remaining["USD"] -= set(known)
+    return remaining
 
-            # Select a random account from matching accounts
-            account = random.choice(matching_accounts)
-            client = await get_client(account)
-            created_client = True
-            logger.trace(f"Created new Steam client for currency {currency}")
 
-        # Get the price using the client
+def get_bulk_price_stats() -> dict[str, int]:
+    """Returns how many search pages were read and how many prices they produced."""
+    return dict(_bulk_price_stats)
 
-        logger.trace(f"Fetching histogram for item_id {item_id}")
-        histogram_result = await steam_api_call_with_retry(
-            client.get_item_orders_histogram, item_id
-        )
-        histogram: ItemOrdersHistogram = histogram_result
-        highest_buy_order = (
-            histogram[0].highest_buy_order or 0.03
-        )  # Default to 0.03 if None as its lowest possible value
-        new_price = max(
-            highest_buy_order,
-            PERCENTAGE_OF_LOWEST_BUY_THRESHOLD * histogram[0].lowest_sell_order,  # type: ignore
-        )
 
-        logger.trace(f"Got price {new_price} for item_id {item_id} in {currency}")
+_derived_price_stats = {"derived": 0, "calibration_fetches": 0}
 
-        return float(new_price)
-    finally:
-        # Clean up if we created the client
-        if created_client:
-            try:
-                await save_cookies_and_close_session(client)
-                logger.trace("Successfully logged out from Steam client")
-            except Exception as e:
-                logger.error(f"Logout error: {e}")
 
+async def _calibrate_currency(
+    client: SteamClient, currency: str, market_hash_names: list[str]
+) -> bool:
+    """
+    Fetches a few items for real in `currency` and in the reference currency and
+    recalibrates the currency's Steam pricing ratio from them. The real prices are stored.
 
-async def get_single_item_price_usd_public(item_id: int) -> float:
+    Returns:
+        bool: True if derived prices in this currency can be used
     """
-    Get the price of a single item using a SteamPublicClient.
+    rows = price_store.read_prices(market_hash_names, currency)
+    sample = [name for name in market_hash_names if name in rows][
+        :FX_RATIO_CALIBRATION_SAMPLES
+    ]
+    if not sample:
+        return False
+
+    async def fetch_pair(name: str) -> tuple[float, float]:
+        real = await get_histogram_price(client, rows[name][0], currency)
+        update_price_in_db(name, real, currency)
+        reference = await get_db_price_usd_public(name) * 100
+        return real, reference
+
+    results = await asyncio.gather(*map(fetch_pair, sample), return_exceptions=True)
+    pairs = [result for result in results if not isinstance(result, Exception)]
+    _derived_price_stats["calibration_fetches"] += 2 * len(sample)
+    if not pairs:
+        return False
+
+    converted = await convert_many(
+        [reference for _, reference in pairs], FX_REFERENCE_CURRENCY, currency
+    )
+    return await _steam_ratios.calibrate(
+        currency, [(real, fx) for (real, _), fx in zip(pairs, converted)]
+    )
 
-    Args:
-        item_id: The Steam item ID
 
-    Returns:
-        float: The item price in USD
+async def derive_secondary_prices(
+    items_by_currency: dict[str, set[str] | list[str]],
+    clients_by_currency: dict[str, list[SteamClient]],
+) -> None:
     """
-    try:
-        session = generate_session()
-        client = SteamPublicClient(session=session, country="US")
-        logger.trace("Created new Steam Public client")
+    Prices outdated non-main items in secondary currencies from their reference
+    currency (USD) price instead of a histogram per currency.
 
-        # Get the price using the client
+    Currencies whose learned ratio is not trusted are recalibrated first with a
+    few real fetches through one of their clients; if that shows drift beyond
+    FX_RATIO_ERROR_BOUND the currency is left to the normal per-currency fetch.
+    Main items are always fetched for real since they are sold into buy orders.
+    """
+    now = int(time.time())
+    for currency, names in items_by_currency.items():
+        if currency == FX_REFERENCE_CURRENCY:
+            continue
 
-        logger.trace(f"Fetching histogram for item_id {item_id}")
-        histogram_result = await steam_api_call_with_retry(
-            client.get_item_orders_histogram, item_id
+        outdated = [
+            name
+            for name, (_, _, fetched_at) in price_store.read_prices(names, currency).items()
+            if name not in MAIN_ITEMS
+            and (fetched_at is None or now - fetched_at > price_ttl_seconds(name))
+        ]
+        if not outdated:
+            continue
+
+        if not _steam_ratios.trusted(currency):
+            clients = clients_by_currency.get(currency)
+            if not clients or not await _calibrate_currency(
+                clients[0], currency, outdated
+            ):
+                logger.info(f"Fetching {currency} prices directly, no trusted Steam ratio")
+                continue
+            # The calibration sample was just fetched for real
+            outdated = [
+                name
+                for name in outdated
+                if (get_cached_price_fetched_at(name, currency) or 0) < now
+            ]
+
+        results = await get_db_prices_usd_public(outdated)
+        reference = {
+            name: price * 100 for name, price in results.items() if price is not None
+        }
+        derived = await convert_steam_prices(
+            list(reference.values()), FX_REFERENCE_CURRENCY, currency
         )
-        histogram: ItemOrdersHistogram = histogram_result
-        new_price = max(
-            histogram[0].highest_buy_order,
-            PERCENTAGE_OF_LOWEST_BUY_THRESHOLD * histogram[0].lowest_sell_order,  # type: ignore
+        for name, price in zip(reference, derived):
+            update_price_in_db(name, round(price), currency)
+        _derived_price_stats["derived"] += len(reference)
+        logger.info(
+            f"Derived {len(reference)} {currency} prices from {FX_REFERENCE_CURRENCY}"
         )
-        logger.trace(f"Got price {new_price} for item_id {item_id} in USD")
-
-        return float(new_price)
 
-    except Exception as e:
-        logger.error(f"Error getting item price using steam public client: {e}")
 
-    finally:
-        try:
-            await session.close()
-        except Exception as e:
-            logger.error(f"Error while closing aiohttp session: {e}")
+def get_fx_derived_price_stats() -> dict[str, Any]:
+    """Returns derived price counts and the learned Steam ratio per currency."""
+    return {**_derived_price_stats, **_steam_ratios.stats()}
 
 
 async def get_multiple_items_prices(
@@ -990,17 +1785,42 @@ async def get_multiple_items_prices(
     Returns:
         dict: Nested dictionary mapping currency -> item_id -> price
     """
+    # Currencies with a trusted Steam ratio are derived from the reference currency
+    # instead of fetched; the provided client's currency is always fetched
+    derived_currencies = []
+    if FX_DERIVED_PRICING:
+        client_currency = client.wallet_currency.name if client else None
+        derived_currencies = [
+            currency
+            for currency in currencies
+            if currency not in (FX_REFERENCE_CURRENCY, client_currency)
+            and _steam_ratios.trusted(currency)
+        ]
+    fetch_currencies = [c for c in currencies if c not in derived_currencies]
+    if derived_currencies and FX_REFERENCE_CURRENCY not in fetch_currencies:
+        fetch_currencies.append(FX_REFERENCE_CURRENCY)
+
     # Make a copy of currencies to avoid modifying the original parameter
-    remaining_currencies = currencies.copy()
+    remaining_currencies = fetch_currencies.copy()
 
     # Initialize results dictionary
     prices_by_currency: dict[str, dict[int, float | None]] = {
-        currency: {} for currency in currencies
+        currency: {} for currency in fetch_currencies
     }
     logger.trace(
         f"Fetching prices for {len(item_ids)} items in {currencies} currencies"
     )
 
+    # Fetch price for a single item; pacing comes from the client's governor and rate limiter bucket
+    async def fetch_price_for_item(client, item_id, currency) -> float | None:
+        try:
+            return await get_histogram_price(client, item_id, currency)
+        except Exception as e:
+            logger.error(
+                f"Error fetching price for item ID {item_id} in {currency}: {e}"
+            )
+            return None
+
     # If client is provided, use it only for its configured currency
     if client:
         client_currency = client.wallet_currency.name  # Missing .name
@@ -1008,30 +1828,13 @@ async def get_multiple_items_prices(
             try:
                 logger.trace(f"Using provided client for currency {client_currency}")
                 # Fetch prices for all items with the provided client
-                for item_id in item_ids:
-                    try:
-                        logger.trace(
-                            f"Fetching histogram for item_id {item_id} with {client_currency}"
-                        )
-                        histogram_result = await steam_api_call_with_retry(
-                            client.get_item_orders_histogram, item_id
-                        )
-                        histogram: ItemOrdersHistogram = histogram_result
-                        price = max(
-                            histogram[0].highest_buy_order,
-                            PERCENTAGE_OF_LOWEST_BUY_THRESHOLD
-                            * histogram[0].lowest_sell_order,  # type: ignore
-                        )
-                        prices_by_currency[client_currency][item_id] = float(price)
-                        logger.trace(
-                            f"Got price {price} for item_id {item_id} in {client_currency}"
-                        )
-                        await asyncio.sleep(0.5)  # Add delay to avoid rate limiting
-                    except Exception as e:
-                        logger.error(
-                            f"Error fetching price for item ID {item_id} in {client_currency}: {e}"
-                        )
-                        prices_by_currency[client_currency][item_id] = None
+                prices = await asyncio.gather(
+                    *(
+                        fetch_price_for_item(client, item_id, client_currency)
+                        for item_id in item_ids
+                    )
+                )
+                prices_by_currency[client_currency].update(zip(item_ids, prices))
 
             except Exception as e:
                 logger.error(f"Error using provided client for {client_currency}: {e}")
@@ -1045,16 +1848,15 @@ async def get_multiple_items_prices(
                 )
 
     all_accounts = get_all_steam_accounts()
-    user_agents = UserAgentsService()
-    await user_agents.load()
 
     # Async function to handle price fetching for one account
     async def fetch_prices_for_account(account, items, currency) -> None:
+        currency_client = None
         try:
             currency_client = await get_client(account)
             logger.trace(f"Created new Steam client for currency {currency}")
 
-            # Process items for this account concurrently with semaphore control
+            # Process items for this account concurrently, bounded by the shared governor
             tasks = []
             for item_id in items:
                 tasks.append(fetch_price_for_item(currency_client, item_id, currency))
@@ -1079,31 +1881,9 @@ async def get_multiple_items_prices(
             # Set all items for this account to None on account failure
             for item_id in items:
                 prices_by_currency[currency][item_id] = None
-
-    # Async function to fetch price for single item with semaphore
-    async def fetch_price_for_item(client, item_id, currency) -> float | None:
-        semaphore = asyncio.Semaphore(PRICE_SEMAPHORE)
-        async with semaphore:  # Limit concurrent requests
-            try:
-                logger.trace(
-                    f"Fetching histogram for item_id {item_id} with {currency}"
-                )
-                histogram_result = await steam_api_call_with_retry(
-                    client.get_item_orders_histogram, item_id
-                )
-                histogram: ItemOrdersHistogram = histogram_result
-                price = max(
-                    histogram[0].highest_buy_order,
-                    PERCENTAGE_OF_LOWEST_BUY_THRESHOLD * histogram[0].lowest_sell_order,  # type: ignore
-                )
-                logger.trace(f"Got price {price} for item_id {item_id} in {currency}")
-                await asyncio.sleep(0.5)  # Missing delay to avoid rate limiting
-                return float(price)
-            except Exception as e:
-                logger.error(
-                    f"Error fetching price for item ID {item_id} in {currency}: {e}"
-                )
-                return None
+        finally:
+            if currency_client is not None:
+                release_client(currency_client)
 
     # Create tasks for all accounts across all currencies
     tasks = []
@@ -1138,6 +1918,24 @@ async def get_multiple_items_prices(
     # Execute all account tasks concurrently
     await asyncio.gather(*tasks, return_exceptions=True)  # Handle exceptions properly
 
+    if derived_currencies:
+        reference = {
+            item_id: price
+            for item_id, price in prices_by_currency[FX_REFERENCE_CURRENCY].items()
+            if price is not None
+        }
+        for currency in derived_currencies:
+            derived = await convert_steam_prices(
+                list(reference.values()), FX_REFERENCE_CURRENCY, currency
+            )
+            prices_by_currency[currency] = {item_id: None for item_id in item_ids}
+            prices_by_currency[currency].update(
+                (item_id, round(price)) for item_id, price in zip(reference, derived)
+            )
+            _derived_price_stats["derived"] += len(reference)
+        if FX_REFERENCE_CURRENCY not in currencies:
+            del prices_by_currency[FX_REFERENCE_CURRENCY]
+
     logger.trace(
         "Completed fetching prices for all items and currencies"
     )  # Missing completion log
@@ -1161,11 +1959,10 @@ async def add_multiple_to_db(
         f"Adding {len(market_hash_names)} items to database with currencies: {currencies}"
     )
 
+    borrowed = None
     try:
         if not client:
             all_accounts = get_all_steam_accounts()
-            user_agents = UserAgentsService()
-            await user_agents.load()
 
             # Use the first currency in the list to find a matching account
             primary_currency = currencies[0]
@@ -1180,7 +1977,7 @@ async def add_multiple_to_db(
                 matching_accounts = all_accounts
 
             account = random.choice(matching_accounts)
-            client = await get_client(account)
+            client = borrowed = await get_client(account)
             logger.trace(
                 f"Created new Steam client for primary currency {primary_currency}"
             )
@@ -1188,15 +1985,7 @@ async def add_multiple_to_db(
         logger.trace(
             f"Fetching item IDs for {len(market_hash_names)} market hash names"
         )
-        item_id_tasks = [fetch_item_id(name) for name in market_hash_names]
-        item_ids = await asyncio.gather(*item_id_tasks)
-
-        # Map market hash names to item IDs, c
-        name_to_id = {
-            name: item_id
-            for name, item_id in zip(market_hash_names, item_ids)
-            if item_id is not None
-        }
+        name_to_id = await resolve_item_ids(market_hash_names)
         logger.trace(f"Successfully fetched {len(name_to_id)} item IDs")
 
         # Get prices for all item IDs for all currencies
@@ -1210,77 +1999,36 @@ async def add_multiple_to_db(
         # Current timestamp
         latest_time = int(time.time())
 
-        # Connect to database
-        conn = sqlite3.connect(PRICES_DB_PATH)
-        cursor = conn.cursor()
-        logger.trace("Connected to database")
-
-        # Ensure all currency columns exist
-        for currency in currencies:
-            column_name = f"buy_order_price_{currency.lower()}"
-            cursor.execute("PRAGMA table_info(prices)")
-            columns = [info[1] for info in cursor.fetchall()]
-
-            if column_name not in columns:
-                cursor.execute(
-                    f"ALTER TABLE prices ADD COLUMN {column_name} REAL DEFAULT 0"
-                )
-                conn.commit()
-                logger.info(f"Created new column {column_name} in prices table")
+        price_rows = [
+            (name, currency, price, latest_time)
+            for name, item_id in name_to_id.items()
+            for currency in currencies
+            if (price := prices_by_currency.get(currency, {}).get(item_id)) is not None
+        ]
 
         try:
-            # For each item, create or update its record
             logger.trace(f"Starting database updates for {len(name_to_id)} items")
-            for name, item_id in name_to_id.items():
-                # First, ensure the item exists with basic info
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO prices (market_hash_name, item_id, time)
-                    VALUES (?, ?, ?)
-                    """,
-                    (name, item_id, latest_time),
-                )
-                logger.trace(
-                    f"Inserted/updated basic info for {name} with item_id {item_id}"
-                )
-
-                # Then update each currency price in separate statements
-                for currency in currencies:
-                    column_name = f"buy_order_price_{currency.lower()}"
-                    currency_prices = prices_by_currency.get(currency, {})
-                    price = currency_prices.get(item_id)
-
-                    if price is not None:
-                        cursor.execute(
-                            f"""
-                            UPDATE prices
-                            set {column_name} = ?, time = ?
-                            WHERE market_hash_name = ?
-                            """,
-                            (price, latest_time, name),
-                        )
-                        logger.trace(
-                            f"{name} price updated to {price / 100:.2f} {currency}"
-                        )
-
-            conn.commit()
+            price_store.upsert_items(name_to_id.items())
+            price_store.upsert_prices(price_rows)
             logger.info(
                 f"Successfully added/updated {len(name_to_id)} items with {len(currencies)} currencies in the database"
             )
-
         except sqlite3.Error as e:
             logger.error(f"Database error: {e}")
-            conn.rollback()
+            return
 
-        finally:
-            conn.close()
-            logger.trace("Database connection closed")
+        # Write the committed prices through to the price cache
+        for name, currency, price, fetched_at in price_rows:
+            _price_cache.put(name, currency, price, fetched_at)
 
     except Exception as e:
         logger.error(f"Error in add_multiple_to_db: {e}")
         import traceback
 
         logger.error(traceback.format_exc())
+    finally:
+        if borrowed is not None:
+            release_client(borrowed)
 
 
 async def update_prices_from_market(
@@ -1288,9 +2036,15 @@ async def update_prices_from_market(
     override_armoury_only: bool = False,
     update_prices_in_usd: bool = False,
     multiple_clients: list[Any] | None = None,
+    bulk: bool = BULK_PRICING,
+    derive: bool = FX_DERIVED_PRICING,
 ) -> None:
     """
     Update item prices of the specified items in the database using market data.
+    With bulk pricing, outdated USD prices are first taken from paged market search
+    results, then secondary currencies are derived from USD where their Steam
+    ratio is trusted. Only the rest (main items, items not found and currencies
+    that drifted) use per-currency histograms.
 
     Args:
         items_by_currency: dict mapping currency codes to lists or sets of market hash names to update
@@ -1298,23 +2052,17 @@ async def update_prices_from_market(
         update_prices_in_usd: Will use all USD accounts to update the usd prices
         multiple_clients: U may choose to pass the clients that will be used to obtain all of the prices. Note that there
         should be enough accounts for all currencies.
+        bulk: Price non-main items from market search pages, see bulk_update_prices
+        derive: Derive secondary currency prices from USD, see derive_secondary_prices
     """
-    main_items = [
-        "Dreams & Nightmares Case",
-        "Kilowatt Case",
-        "Revolution Case",
-        "Fracture Case",
-        "Recoil Case",
-        "Gallery Case",
-        "Fever Case",
-    ]
+    # Pooled clients borrowed here, given back once every currency is processed
+    borrowed_clients = []
 
     # Extract all unique item names from all currencies
     all_item_names = set()
     for item_collection in items_by_currency.values():
         all_item_names.update(item_collection)  # Works with both sets and lists
 
-    items = get_specific_items(all_item_names)
     currencies = set(items_by_currency.keys())
 
     # Handle the case where pre-logged-in clients are provided
@@ -1391,6 +2139,7 @@ async def update_prices_from_market(
             for acc in matching_accounts:
                 client = await get_client(acc)
                 currency_clients.append(client)
+                borrowed_clients.append(client)
 
             available_clients_by_currency[currency] = currency_clients
 
@@ -1398,15 +2147,43 @@ async def update_prices_from_market(
         f"Updating prices for {len(all_item_names)} total items across {len(currencies)} currencies"
     )
 
-    async def process_items_for_client(
-        client, item_names_for_client, currency, semaphore=None
-    ):
+    if bulk:
+        now = int(time.time())
+        outdated_by_currency = {}
+        for currency in currencies:
+            rows = price_store.read_prices(items_by_currency.get(currency, []), currency)
+            outdated_by_currency[currency] = {
+                name
+                for name, (_, _, fetched_at) in rows.items()
+                if fetched_at is None or now - fetched_at > price_ttl_seconds(name)
+            }
+        remaining = await bulk_update_prices(outdated_by_currency)
+        logger.info(
+            f"Bulk priced {sum(map(len, outdated_by_currency.values())) - sum(map(len, remaining.values()))} "
+            f"outdated prices from market search, {sum(map(len, remaining.values()))} left for histograms"
+        )
+
+    if derive and len(currencies) > 1:
+        await derive_secondary_prices(
+            {currency: items_by_currency.get(currency, []) for currency in currencies},
+            available_clients_by_currency,
+        )
+
+    async def process_items_for_client(client, item_names_for_client, currency):
         try:
             logger.trace(f"Using logged-in client for currency {currency}")
 
             items_to_add = []
             update_tasks = []
 
+            # One bulk read of item ids and this currency's fetch times
+            items = {
+                name: {"item_id": item_id, "time": fetched_at}
+                for name, (item_id, _, fetched_at) in price_store.read_prices(
+                    item_names_for_client, currency
+                ).items()
+            }
+
             for name in item_names_for_client:
                 data = items.get(name)
                 if data is None:
@@ -1415,11 +2192,9 @@ async def update_prices_from_market(
                     )
                     items_to_add.append(name)
                 else:
-                    is_main_item = name in main_items
-                    price_outdated = (
-                        is_price_outdated_main(data["time"])
-                        if is_main_item
-                        else is_price_outdated(data["time"])
+                    is_main_item = name in MAIN_ITEMS
+                    price_outdated = data["time"] is None or is_price_outdated(
+                        name, data["time"]
                     )
                     if price_outdated:
 
@@ -1428,13 +2203,8 @@ async def update_prices_from_market(
                                 logger.trace(
                                     f"Fetching histogram for {name} (ID: {data['item_id']})"
                                 )
-                                histogram = await steam_api_call_with_retry(
-                                    client.get_item_orders_histogram, data["item_id"]
-                                )
-                                new_price = max(
-                                    histogram[0].highest_buy_order,
-                                    PERCENTAGE_OF_LOWEST_BUY_THRESHOLD
-                                    * (histogram[0].lowest_sell_order or 0),
+                                new_price = await get_histogram_price(
+                                    client, data["item_id"], currency
                                 )
                                 update_price_in_db(
                                     market_hash_name=name,
@@ -1445,7 +2215,6 @@ async def update_prices_from_market(
                                     f"{name} price updated to {new_price / 100:.2f} {currency}"
                                     + (" (main item)" if is_main_item else "")
                                 )
-                                await asyncio.sleep(0.5)
                             except Exception as e:
                                 logger.error(
                                     f"Error updating price for {name} in {currency}: {e}"
@@ -1458,19 +2227,9 @@ async def update_prices_from_market(
                             + (" (main item)" if is_main_item else "")
                         )
 
-            # Run updates concurrently with semaphore control (per client)
+            # Run updates concurrently, bounded by the client's price fetch governor
             if update_tasks:
-                sem = (
-                    semaphore
-                    if semaphore is not None
-                    else asyncio.Semaphore(PRICE_SEMAPHORE)
-                )
-
-                async def sem_task(task):
-                    async with sem:
-                        await task
-
-                await asyncio.gather(*(sem_task(t) for t in update_tasks))
+                await asyncio.gather(*update_tasks)
 
             if items_to_add:
                 logger.info(
@@ -1501,22 +2260,19 @@ async def update_prices_from_market(
                 f"Using public API for USD currency with {len(currency_item_names)} items"
             )
 
-            async def process_usd_items_with_semaphore(item_names, semaphore_limit=4):
-                semaphore = asyncio.Semaphore(semaphore_limit)
-
-                async def process_single_usd_item(name):
-                    async with semaphore:
-                        try:
-                            # Use get_db_price_usd_public for USD items
-                            await get_db_price_usd_public(name)
-                            logger.trace(f"Updated USD price for {name}")
-                        except Exception as e:
-                            logger.error(f"Error updating USD price for {name}: {e}")
-
-                tasks = [process_single_usd_item(name) for name in item_names]
-                await asyncio.gather(*tasks, return_exceptions=True)
-
-            await process_usd_items_with_semaphore(currency_item_names)
+            # Public requests share the "public" USD price fetch governor
+            async def process_single_usd_item(name):
+                try:
+                    # Use get_db_price_usd_public for USD items
+                    await get_db_price_usd_public(name)
+                    logger.trace(f"Updated USD price for {name}")
+                except Exception as e:
+                    logger.error(f"Error updating USD price for {name}: {e}")
+
+            await asyncio.gather(
+                *(process_single_usd_item(name) for name in currency_item_names),
+                return_exceptions=True,
+            )
             continue
 
         matching_clients = available_clients_by_currency.get(currency, [])
@@ -1538,27 +2294,37 @@ async def update_prices_from_market(
             split_items[idx % len(matching_clients)].append(name)
 
         tasks = []
-        # All clients run concurrently, each client processes its items concurrently (semaphore=4)
+        # All clients run concurrently, each client's requests are capped by its governor
         for client, names in zip(matching_clients, split_items):
             if names:  # Only process if there are items for this client
-                semaphore = asyncio.Semaphore(4)
-                tasks.append(
-                    process_items_for_client(
-                        client,
-                        names,
-                        currency,
-                        semaphore=semaphore,
-                    )
-                )
+                tasks.append(process_items_for_client(client, names, currency))
 
         if tasks:
             await asyncio.gather(*tasks)
 
+    for client in borrowed_clients:
+        release_client(client)
+
+    # Make the refreshed prices visible to other processes before returning
+    price_store.flush_pending_prices()
+
+
+_user_agents: UserAgentsService | None = None
+
+
+async def _get_user_agents() -> UserAgentsService:
+    """Loads the user agent list once per process."""
+    global _user_agents
+    if _user_agents is None:
+        user_agents = UserAgentsService()
+        await user_agents.load()
+        _user_agents = user_agents
+    return _user_agents
+
 
 async def _initialize_steam_client(account: dict[str, Any]) -> SteamClient:
     """Helper function to create a SteamClient instance without logging in."""
-    user_agents = UserAgentsService()
-    await user_agents.load()
+    user_agents = await _get_user_agents()
     try:
         wallet_currency = getattr(Currency, account["currency"])
         wallet_country = account["region"]
@@ -1568,7 +2334,7 @@ async def _initialize_steam_client(account: dict[str, Any]) -> SteamClient:
             f"Currency '{account['currency']}' not found, defaulting to INR."
         )
         wallet_country = "IN"
-    session = generate_session()
+    session = generate_session(account=account["steam_username"])
     return SteamClient(
         steam_id=int(account["steam_id"]),
         username=account["steam_username"],
@@ -1582,12 +2348,211 @@ async def _initialize_steam_client(account: dict[str, Any]) -> SteamClient:
     )
 
 
+async def _login_client(client: SteamClient) -> None:
+    """Logs a fresh client in, restoring its session from cached cookies when there are any."""
+    username = client.username
+    cookies = await cookie_store.load_cookies(username)
+
+    if cookies:
+        logger.trace(f"Attempting to restore session from cookies for '{username}'.")
+        await restore_from_cookies(cookies, client)
+    else:
+        logger.info(f"No cookies found. Performing a full login for '{username}'.")
+        await steam_api_call_with_retry(client.login)
+
+
+class SteamClientPool:
+    """
+    Process-wide pool of logged-in SteamClients keyed by steam_username.
+
+    A client is created and logged in (from cookies when possible) the first time
+    its account is borrowed, and later borrows reuse it and its keep-alive
+    session. Every borrow counts until the client is given back with release().
+    Clients that have not made a Steam call for idle_seconds are closed, the
+    least recently used clients nobody is borrowing are closed when the pool
+    grows past max_size, and a reused client whose session was not checked for
+    health_check_seconds is checked and logged in again if it has expired.
+    """
+
+    def __init__(self, max_size: int, idle_seconds: int, health_check_seconds: int):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self.health_check_seconds = health_check_seconds
+        self._clients: OrderedDict[str, SteamClient] = OrderedDict()
+        self._loops: dict[str, asyncio.AbstractEventLoop] = {}
+        self._last_used: dict[str, float] = {}
+        self._last_checked: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # username -> borrows not released yet
+        self._borrows: dict[str, int] = {}
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+        self.relogins = 0
+
+    def _usable(self, username: str) -> SteamClient | None:
+        """Returns the pooled client if its session is open and belongs to the running event loop."""
+        client = self._clients.get(username)
+        if client is None:
+            return None
+        if client.session.closed or self._loops.get(username) is not asyncio.get_running_loop():
+            self._forget(username)
+            return None
+        return client
+
+    def _forget(self, username: str) -> SteamClient | None:
+        self._loops.pop(username, None)
+        self._last_used.pop(username, None)
+        self._last_checked.pop(username, None)
+        self._borrows.pop(username, None)
+        return self._clients.pop(username, None)
+
+    async def _close(self, username: str) -> None:
+        client = self._forget(username)
+        if client is None or client.session.closed:
+            return
+        self.evicted += 1
+        try:
+            await save_cookies_and_close_session(client)
+            await client.session.close()
+        except Exception as e:
+            logger.error(f"Error while closing pooled client for {username}: {e}")
+
+    async def _evict(self) -> None:
+        now = time.time()
+        for username in [
+            name
+            for name, last_used in self._last_used.items()
+            if now - last_used > self.idle_seconds
+        ]:
+            logger.trace(f"Closing idle Steam client for {username}")
+            await self._close(username)
+
+        # Borrowed clients are skipped, so the pool may stay above max_size until they are released
+        unborrowed = [name for name in self._clients if not self._borrows.get(name)]
+        for username in unborrowed[: max(0, len(self._clients) - self.max_size)]:
+            logger.trace(f"Closing least recently used Steam client for {username}")
+            await self._close(username)
+
+    async def _check_health(self, username: str, client: SteamClient) -> None:
+        if time.time() - self._last_checked.get(username, 0) < self.health_check_seconds:
+            return
+        try:
+            alive = await client.is_session_alive()
+        except Exception as e:
+            logger.warning(f"Session check failed for '{username}': {e}")
+            alive = False
+        if not alive:
+            logger.info(f"Pooled session for '{username}' expired, logging in again.")
+            self.relogins += 1
+            await steam_api_call_with_retry(client.login, init_session=False)
+            await save_cookies_and_close_session(client)
+        self._last_checked[username] = time.time()
+
+    async def get(self, account: dict[str, Any]) -> SteamClient:
+        """Borrows the logged-in client for this account, creating it on first use."""
+        username = account["steam_username"]
+        lock = self._locks.setdefault(username, asyncio.Lock())
+
+        async with lock:
+            client = self._usable(username)
+            if client is None:
+                client = await _initialize_steam_client(account)
+                await _login_client(client)
+                await save_cookies_and_close_session(client)
+                self._clients[username] = client
+                self._loops[username] = asyncio.get_running_loop()
+                self._last_checked[username] = time.time()
+                self.created += 1
+            else:
+                await self._check_health(username, client)
+                self.reused += 1
+
+            self.touch(client)
+            self._borrows[username] = self._borrows.get(username, 0) + 1
+
+        await self._evict()
+        return client
+
+    def find(self, predicate: Callable[[SteamClient], bool]) -> SteamClient | None:
+        """Borrows the most recently used pooled client that matches predicate, if any."""
+        for username in list(reversed(self._clients)):
+            client = self._usable(username)
+            if client is not None and predicate(client):
+                self.reused += 1
+                self.touch(client)
+                self._borrows[username] = self._borrows.get(username, 0) + 1
+                return client
+        return None
+
+    def release(self, client: SteamClient) -> None:
+        """Gives back a borrowed client so the size cap may close it again."""
+        username = client.username
+        if self._clients.get(username) is not client:
+            return
+        borrows = self._borrows.get(username, 0) - 1
+        if borrows > 0:
+            self._borrows[username] = borrows
+        else:
+            self._borrows.pop(username, None)
+
+    def touch(self, client: SteamClient) -> None:
+        """Marks a pooled client as in use so it is not evicted as idle."""
+        username = client.username
+        if self._clients.get(username) is client:
+            self._clients.move_to_end(username)
+            self._last_used[username] = time.time()
+
+    def replace(self, old_client: SteamClient, new_client: SteamClient) -> None:
+        """Swaps a client that was re-created after an error for its replacement."""
+        username = old_client.username
+        if self._clients.get(username) is old_client:
+            self._clients[username] = new_client
+            self._loops[username] = asyncio.get_running_loop()
+            self._last_checked[username] = time.time()
+            self.touch(new_client)
+
+    async def close_all(self) -> None:
+        """Saves cookies and closes every pooled session."""
+        for username in list(self._clients):
+            await self._close(username)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._clients),
+            "borrowed": len(self._borrows),
+            "created": self.created,
+            "reused": self.reused,
+            "evicted": self.evicted,
+            "relogins": self.relogins,
+        }
+
+
+_client_pool = SteamClientPool(
+    CLIENT_POOL_MAX_SIZE, CLIENT_POOL_IDLE_SECONDS, CLIENT_POOL_HEALTH_CHECK_SECONDS
+)
+
+
+def get_client_pool_stats() -> dict[str, int]:
+    """Returns how many pooled clients exist and how often they were created, reused and evicted."""
+    return _client_pool.stats()
+
+
+async def close_client_pool() -> None:
+    """Saves cookies and closes all pooled Steam sessions, for use at the end of a run."""
+    await _client_pool.close_all()
+
+
 async def get_client(account: dict[str, Any]) -> SteamClient:
     """
-    Initializes and logs in a SteamClient, using cached cookies if available.
+    Returns a logged-in SteamClient for the account from the process-wide client pool.
 
-    The caller is responsible for closing the session and saving cookies
-    using the `save_cookies_and_close_session` function.
+    The first call for an account creates the client and restores its session from
+    cached cookies (or logs in); later calls reuse the same client and session.
+    Callers may still save cookies with `save_cookies_and_close_session`, but must
+    not close the session since the client is shared. Give it back with
+    `release_client` when done; clients kept for a whole run are closed by
+    `close_client_pool`.
 
     Args:
         account: The account dictionary with credentials.
@@ -1595,23 +2560,16 @@ async def get_client(account: dict[str, Any]) -> SteamClient:
     Returns:
         A logged-in SteamClient instance.
     """
-    username = account["steam_username"]
-    cookie_cache_path = Path(COOKIE_CACHE_DIR) / f"{username}_cookies.json"
-
-    # Create the client instance (not logged in yet)
-    client = await _initialize_steam_client(account)
+    return await _client_pool.get(account)
 
-    # Attempt to log in from cookies or perform a fresh login
-    if cookie_cache_path.is_file():
-        logger.trace(f"Attempting to restore session from cookies for '{username}'.")
-        with cookie_cache_path.open("r") as f:
-            cookies = json.load(f)
-        await restore_from_cookies(cookies, client)
-    else:
-        logger.info(f"No cookies found. Performing a full login for '{username}'.")
-        await steam_api_call_with_retry(client.login)
 
-    return client
+def release_client(client: SteamClient) -> None:
+    """
+    Gives back a client borrowed with `get_client`. Until every borrow of a client
+    is released, the pool's size cap does not close it; idle clients are still
+    closed after CLIENT_POOL_IDLE_SECONDS and all of them by `close_client_pool`.
+    """
+    _client_pool.release(client)
 
 
 async def get_full_inventory(
@@ -1664,18 +2622,7 @@ async def get_account_details(account: dict[str, Any]) -> dict[str, Any]:
     logger.info(f"Processing account: {username}")
     active_armoury_passes = account["active_armoury_passes"]
 
-    # --- Define cache paths (cookies only) ---
-    cookie_cache_path = Path(COOKIE_CACHE_DIR) / f"{username}_cookies.json"
-
-    # Ensure cache directory exists
-    cookie_cache_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Ensure cookie cache file exists
-    if not cookie_cache_path.exists():
-        cookie_cache_path.write_text("{}", encoding="utf-8")
-
-    # --- Initialize client ---
-    client = await _initialize_steam_client(account)
+    client = None
 
     # Initialize variables from account
     pass_value = account.get("pass_value", 0)
@@ -1685,17 +2632,8 @@ async def get_account_details(account: dict[str, Any]) -> dict[str, Any]:
     is_armoury = account["is_armoury"]
 
     try:
-        # 1. LOG IN THE CLIENT (with cookie restoration if available)
-        if cookie_cache_path.is_file():
-            logger.trace(
-                f"Attempting to restore session from cookies for '{username}'."
-            )
-            with cookie_cache_path.open("r", encoding="utf-8") as f:
-                cookies = json.load(f)
-            await restore_from_cookies(cookies, client)
-        else:
-            logger.info(f"No cookies found. Performing a full login for '{username}'.")
-            await steam_api_call_with_retry(client.login)
+        # 1. BORROW THE LOGGED-IN CLIENT (restored from cookies on first use)
+        client = await get_client(account)
 
         # 2. ALWAYS FETCH INVENTORY
         logger.info(f"Fetching inventory for '{username}'.")
@@ -1729,8 +2667,6 @@ async def get_account_details(account: dict[str, Any]) -> dict[str, Any]:
         }
 
     finally:
-        # 4. ALWAYS SAVE COOKIES
-        if client.session and not client.session.closed:
-            logger.trace(f"Saving cookies for '{username}'.")
-            with cookie_cache_path.open("w", encoding="utf-8") as f:
-                json.dump(get_jsonable_cookies(client.session), f, indent=4)
+        # 4. SAVE COOKIES (only written when they changed)
+        if client:
+            await save_cookies_and_close_session(client)
@@ -19,6 +19,7 @@ sys.path.insert(0, ROOT_DIR)
 
 from accounts_manager.utils.wallet_balance_updater import update_steam_wallet_balances
 from utils.logger import get_custom_logger
+from utils.rate_limiter import rate_limiter
 
 logger = get_custom_logger()
 
@@ -218,15 +219,13 @@ class TickTickFarmingManager:
                 pass_value,
                 affordable_passes,
             ) in eligible_accounts:
+                await rate_limiter.acquire("ticktick")
                 success = await self.create_farming_task(
                     username, account_id, balance, pass_value, affordable_passes
                 )
                 if success:
                     created_count += 1
 
-                # Add small delay to avoid rate limiting
-                await asyncio.sleep(0.3)
-
             logger.info("📊 Farming list creation summary:")
             logger.info(f"   • Created: {created_count} new tasks")
             logger.info(f"   • Total eligible accounts: {len(eligible_accounts)}")
@@ -14,38 +14,63 @@ _config = load_config()
 ROOT_DIR = _config["ROOT_DIR"]
 sys.path.insert(0, ROOT_DIR)
 
+from utils.instrumentation import dump_instrumentation
+from utils.listing_queue import ListingWorkQueue
 from utils.logger import get_custom_logger
+from utils.proxy import close_proxy_pool, get_proxy_pool_stats
+from utils.rate_limiter import get_rate_limiter_stats, rate_limiter
+from utils.retry_policy import get_circuit_breaker_stats
 
 logger = get_custom_logger()
 
 import asyncio
 import logging
 import random
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Mapping
 
 import aiohttp
-from aiosteampy import AppContext, SteamClient
+from aiosteampy import AppContext, ConfirmationType, SteamClient
 from aiosteampy.ext.user_agents import UserAgentsService
+from aiosteampy.utils import create_ident_code
 
 logging.getLogger("asyncio").setLevel(logging.CRITICAL)
 import math
 import os
 from contextlib import redirect_stderr, redirect_stdout
 
+import numpy as np
 from tqdm.asyncio import tqdm_asyncio
 
 from database import (
+    close_client_pool,
+    close_public_client_pool,
     convert,
+    convert_many,
     get_account_details,
     get_all_steam_accounts,
     get_client,
+    get_client_pool_stats,
+    get_fx_derived_price_stats,
     get_db_price,
+    get_exchange_rate,
     get_full_inventory,
+    get_histogram_singleflight_stats,
+    get_price_cache_stats,
+    get_price_fetch_governor_stats,
+    get_price_refresher_stats,
+    get_public_client_pool_stats,
     get_steam_balance,
+    start_price_refresher,
     steam_api_call_with_retry,
+    stop_price_refresher,
     update_prices_from_market,
     update_steam_balance,
 )
+from database.utils import orderbook_store
+from database.utils.item_catalog import MAIN_ITEMS, get_price_ttl_stats
 
 with open(os.devnull, "w") as devnull:
     with redirect_stdout(devnull), redirect_stderr(devnull):
@@ -76,6 +101,16 @@ MAX_ITEMS_LIMIT = _config.get("MAX_ITEMS_LIMIT")
 MIN_SELLING_TIME = _config.get("MIN_SELLING_TIME", 30)  # Default to 30 seconds
 MAX_SELLING_TIME_WAIT = _config.get("MAX_SELLING_TIME_WAIT")
 NUM_PASSES_REQUIRED = _config.get("NUM_PASSES_REQUIRED")
+LISTING_CONCURRENCY_PER_ACCOUNT = _config.get("LISTING_CONCURRENCY_PER_ACCOUNT", 4)
+BATCH_CONFIRMATIONS = _config.get("BATCH_CONFIRMATIONS", True)
+CONFIRMATION_BATCH_SIZE = _config.get("CONFIRMATION_BATCH_SIZE", 20)
+CONFIRMATION_BATCH_MAX_DELAY_MS = _config.get("CONFIRMATION_BATCH_MAX_DELAY_MS", 3000)
+LISTING_PRICE_MAX_AGE_SECONDS = _config.get("LISTING_PRICE_MAX_AGE_SECONDS", 300)
+SELECTION_DP_MAX_STATES = _config.get("SELECTION_DP_MAX_STATES", 20_000_000)
+SELLING_ACCOUNT_CONCURRENCY = _config.get("SELLING_ACCOUNT_CONCURRENCY", 25)
+
+# Prices are selected in cents
+SELECTION_PRICE_SCALE = 100
 
 # Global variable for tqdm progress bar
 processing_listings_progress = None
@@ -85,6 +120,14 @@ processing_listings_lock = asyncio.Lock()
 
 processing_listings_total_items = 0
 
+# steam_username -> listed items, listing attempts and seconds spent in sell_items_batch
+_listing_throughput: dict[str, dict[str, float]] = {}
+# Totals of the ListingConfirmationBatcher stats of every batch
+_confirmation_batch_stats = {"flushes": 0, "confirmed": 0, "failed": 0, "fallbacks": 0}
+# Totals of the ListingWorkQueue retry reasons and outcomes of every batch
+_listing_retry_stats: Counter = Counter()
+_listing_outcome_stats: Counter = Counter()
+
 
 async def get_market_listings(client: SteamClient) -> list:
     """
@@ -116,25 +159,117 @@ async def get_market_listings(client: SteamClient) -> list:
         raise
 
 
-def select_items_to_sell(
+def _max_items() -> int | None:
+    """MAX_ITEMS_LIMIT as a limit, or None when no limit applies."""
+    if MAX_ITEMS_LIMIT is not None and MAX_ITEMS_LIMIT > 0:
+        return MAX_ITEMS_LIMIT
+    return None
+
+
+def _price_groups(items_by_price: dict) -> list[tuple[int, int, list]]:
+    """(price in cents, count, items) per price group."""
+    return [
+        (int(round(price * SELECTION_PRICE_SCALE)), len(items), items)
+        for price, items in items_by_price.items()
+    ]
+
+
+def _dp_chunks(groups: list[tuple[int, int, list]]) -> list[tuple[int, int, int]]:
+    """
+    Splits every group into 0/1 chunks of 1, 2, 4, ... items plus a remainder,
+    so any count from 0 to the group size is a sum of chunks.
+    Returns (group index, items in the chunk, chunk value in cents).
+    """
+    chunks = []
+    for index, (int_price, count, _) in enumerate(groups):
+        if int_price <= 0:
+            # Worthless items never help reach the target
+            continue
+        size = 1
+        while count > 0:
+            take = min(size, count)
+            chunks.append((index, take, take * int_price))
+            count -= take
+            size *= 2
+    return chunks
+
+
+def _dp_state_space(groups: list[tuple[int, int, list]], int_target: int) -> int:
+    """Cells the DP fills: (reachable sums considered) x (chunks)."""
+    prices = [int_price for int_price, _, _ in groups if int_price > 0]
+    if not prices or int_target <= 0:
+        return 0
+    return (int_target + max(prices)) * len(_dp_chunks(groups))
+
+
+def select_items_to_sell_dp(
     items_by_price: dict, target_amount: float
 ) -> tuple[list, float, str]:
     """
-    Select optimal items to sell to meet target amount with minimal overshoot.
-    Prices are scaled by 100 before running the CP-SAT solver.
-    If MAX_ITEMS_LIMIT is None or 0, no limit is applied to the number of items.
+    Exact bounded-knapsack DP over cent values for select_items_to_sell.
+
+    dp[s] is the fewest items whose prices add up to exactly s cents. Every
+    price group is split into binary chunks and added as 0/1 items, keeping
+    which chunks improved which sums so the selection can be rebuilt. No optimal
+    total exceeds target + max price - 1 cents (dropping any item from a larger
+    total still meets the target), so only sums up to that bound are kept. The
+    answer is the smallest sum at or above the target whose item count fits
+    MAX_ITEMS_LIMIT.
+
+    Returns the same (selected_items, total_value, status) as select_items_to_sell,
+    with status "OPTIMAL" or "INFEASIBLE".
+    """
+    int_target = int(math.ceil(target_amount * SELECTION_PRICE_SCALE))
+    if int_target <= 0:
+        return [], 0, "OPTIMAL"
 
-    Args:
-        items_by_price: A dictionary mapping original prices (float) to lists of corresponding items.
-        target_amount: Required selling amount in original currency (float).
+    groups = _price_groups(items_by_price)
+    chunks = _dp_chunks(groups)
+    if not chunks:
+        return [], 0, "INFEASIBLE"
 
-    Returns:
-        A tuple (selected_items, total_value, status) where:
-          selected_items: List of items chosen.
-          total_value: Total selling value in original currency (after conversion).
-          status: "OPTIMAL", "FEASIBLE", "INFEASIBLE", or "UNKNOWN".
+    upper = int_target + max(value // take for _, take, value in chunks) - 1
+    unreachable = np.iinfo(np.int32).max // 2
+    dp = np.full(upper + 1, unreachable, dtype=np.int32)
+    dp[0] = 0
+    # taken[c][s - value] is True if chunk c improved sum s
+    taken: list[np.ndarray | None] = []
+    for _, take, value in chunks:
+        if value > upper:
+            taken.append(None)
+            continue
+        candidate = dp[: upper + 1 - value] + take
+        improved = candidate < dp[value:]
+        dp[value:][improved] = candidate[improved]
+        taken.append(improved)
+
+    limit = _max_items()
+    feasible = dp[int_target:] < (unreachable if limit is None else limit + 1)
+    if not feasible.any():
+        return [], 0, "INFEASIBLE"
+    total = int_target + int(np.argmax(feasible))
+
+    selected_counts = [0] * len(groups)
+    remaining = total
+    for (index, take, value), improved in zip(reversed(chunks), reversed(taken)):
+        if improved is not None and remaining >= value and improved[remaining - value]:
+            selected_counts[index] += take
+            remaining -= value
+
+    selected_items: list = []
+    for (_, _, items), selected_count in zip(groups, selected_counts):
+        selected_items.extend(items[:selected_count])
+    return selected_items, total / SELECTION_PRICE_SCALE, "OPTIMAL"
+
+
+def select_items_to_sell_cp_sat(
+    items_by_price: dict, target_amount: float
+) -> tuple[list, float, str]:
     """
-    price_scale: int = 100  # Multiply all prices by 100 to convert to integer (cents)
+    CP-SAT model for select_items_to_sell, for inventories too large for the DP.
+    Returns the same (selected_items, total_value, status) as select_items_to_sell.
+    """
+    price_scale: int = SELECTION_PRICE_SCALE
     # Convert the target amount: use ceil so that even a fraction results in a higher target
     int_target: int = int(math.ceil(target_amount * price_scale))
 
@@ -158,7 +293,7 @@ def select_items_to_sell(
     model.Add(total_value_int >= int_target)
 
     # Only apply the item limit constraint if MAX_ITEMS_LIMIT is not None and > 0
-    if MAX_ITEMS_LIMIT is not None and MAX_ITEMS_LIMIT > 0:
+    if _max_items() is not None:
         total_items = sum(item_vars[i] for i in range(len(unique_items)))
         model.Add(total_items <= MAX_ITEMS_LIMIT)
 
@@ -191,6 +326,64 @@ def select_items_to_sell(
         return [], 0, "UNKNOWN"
 
 
+def select_items_to_sell(
+    items_by_price: dict, target_amount: float
+) -> tuple[list, float, str]:
+    """
+    Select optimal items to sell to meet target amount with minimal overshoot.
+    Prices are scaled by 100 and solved exactly with a bounded-knapsack DP over
+    cent values. Inventories whose DP would fill more than SELECTION_DP_MAX_STATES
+    cells are solved with CP-SAT instead.
+    If MAX_ITEMS_LIMIT is None or 0, no limit is applied to the number of items.
+
+    Args:
+        items_by_price: A dictionary mapping original prices (float) to lists of corresponding items.
+        target_amount: Required selling amount in original currency (float).
+
+    Returns:
+        A tuple (selected_items, total_value, status) where:
+          selected_items: List of items chosen.
+          total_value: Total selling value in original currency (after conversion).
+          status: "OPTIMAL", "FEASIBLE", "INFEASIBLE", or "UNKNOWN".
+    """
+    int_target = int(math.ceil(target_amount * SELECTION_PRICE_SCALE))
+    states = _dp_state_space(_price_groups(items_by_price), int_target)
+    if states > SELECTION_DP_MAX_STATES:
+        logger.debug(
+            f"Item selection needs {states} DP states, solving with CP-SAT instead"
+        )
+        return select_items_to_sell_cp_sat(items_by_price, target_amount)
+    return select_items_to_sell_dp(items_by_price, target_amount)
+
+
+async def run_per_account(
+    items: list,
+    func: Callable[[Any], Awaitable[Any]],
+    concurrency: int,
+    desc: str | None = None,
+) -> list[tuple[Any, Exception | None]]:
+    """
+    Runs func for every account's entry in items, at most `concurrency` at once.
+    Returns (result, None) or (None, error) per entry, in the order of items, so
+    an account that fails does not stop the others. Steam requests still go
+    through the shared rate limiter, so running accounts together only overlaps
+    their waiting.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item) -> tuple[Any, Exception | None]:
+        async with semaphore:
+            try:
+                return await func(item), None
+            except Exception as e:
+                return None, e
+
+    tasks = [run(item) for item in items]
+    if desc is None:
+        return await asyncio.gather(*tasks)
+    return await tqdm_asyncio.gather(*tasks, desc=desc)
+
+
 async def execute_selling(
     account_data_list: list, sell_all_items: bool = False
 ) -> list:
@@ -199,33 +392,86 @@ async def execute_selling(
     If sell_all_items is True, all available listable items are sold regardless of wallet balance.
     If sell_all_items is False, items are sold only to meet the required armoury value.
     If MAX_ITEMS_LIMIT is None or 0, no limit is applied to the number of items.
+
+    Up to SELLING_ACCOUNT_CONCURRENCY accounts fetch their wallet balance and
+    active listings, and later sell, at the same time. Planning and the summary
+    go through the accounts in username order, and an account whose fetch or
+    sale fails is reported without stopping the others.
     """
     # Store the items to be sold from each account
     selling_plan: list = []
+    # steam_username -> how the account ended, for the summary
+    account_outcomes: dict[str, str] = {}
+    # Results of accounts that failed before they could be planned
+    failed_accounts: list = []
+
+    async def fetch_selling_state(account_data: dict) -> dict:
+        """Wallet balance, armoury value and, if the account may sell, its active listings."""
+        account = account_data["account"]
+        client = account_data["logged_in_client"]
+        pass_value = account_data["pass_value"] or 0
+
+        # Get current wallet balance
+        wallet_balance_cents = await steam_api_call_with_retry(
+            client.get_wallet_balance
+        )
+        # Calculate armoury value (amount needed for passes)
+        armoury_value = 5 * pass_value if account["is_armoury"] else 0
+
+        # Accounts that will be skipped don't need their listings
+        active_listings: list | Exception | None = None
+        if wallet_balance_cents / 100 < armoury_value or sell_all_items:
+            try:
+                active_listings = await get_market_listings(client=client)
+            except Exception as e:
+                active_listings = e
+        return {
+            "wallet_balance_cents": wallet_balance_cents,
+            "armoury_value": armoury_value,
+            "active_listings": active_listings,
+        }
+
+    account_data_list = sorted(
+        account_data_list, key=lambda data: data["account"]["steam_username"]
+    )
+    selling_states = await run_per_account(
+        account_data_list, fetch_selling_state, SELLING_ACCOUNT_CONCURRENCY
+    )
+
     print("\n")
     logger.info("--- Wallet Balance Analysis ---")
 
-    # Process each account sequentially
-    for account_data in account_data_list:
+    # Plan each account in username order
+    for account_data, (selling_state, error) in zip(
+        account_data_list, selling_states
+    ):
         account = account_data["account"]
         account_username: str = account["steam_username"]
         listable_value = account_data["listable_value"]
         num_active_passes: int = account_data["active_armoury_passes"]
-        armoury_bool: int = account["is_armoury"]
         client = account_data["logged_in_client"]
-        pass_value: float = account_data["pass_value"]
         currency: str = account_data["currency"]
 
-        # Get current wallet balance
-        wallet_balance_cents_initial = await steam_api_call_with_retry(
-            client.get_wallet_balance
-        )
-        wallet_balance_initial: float = wallet_balance_cents_initial / 100
+        if error is not None:
+            print("\n")
+            logger.error(f"Account: {account_username}")
+            logger.error(f"  Status: FAILED - Could not fetch wallet balance: {error}")
+            account_outcomes[account_username] = f"failed: {error}"
+            failed_accounts.append(
+                {
+                    "account": account_username,
+                    "items_count": 0,
+                    "actual_value": 0,
+                    "success": False,
+                    "currency": currency,
+                    "error": str(error),
+                }
+            )
+            continue
 
-        # Calculate armoury value (amount needed for passes)
-        if pass_value is None:
-            pass_value = 0
-        armoury_value: float = 5 * pass_value if armoury_bool else 0
+        wallet_balance_cents_initial = selling_state["wallet_balance_cents"]
+        wallet_balance_initial: float = wallet_balance_cents_initial / 100
+        armoury_value: float = selling_state["armoury_value"]
 
         # Convert to INR for display purposes
         wallet_balance_inr = await convert(
@@ -247,6 +493,7 @@ async def execute_selling(
         # Skip processing if wallet balance meets the threshold and we're not selling all items
         if wallet_balance_initial >= armoury_value and not sell_all_items:
             logger.info("  Status: SKIPPED - Wallet balance already sufficient")
+            account_outcomes[account_username] = "skipped: wallet sufficient"
             continue
 
         # Calculate required selling amount including a 15% tax buffer (only relevant when not selling all)
@@ -281,15 +528,16 @@ async def execute_selling(
         # If there are no items available to sell, skip this account
         # Check if account has active listings before deciding to skip
         has_active_listings = False
-        try:
-            active_listings = await get_market_listings(client=client)
+        active_listings = selling_state["active_listings"]
+        if isinstance(active_listings, Exception):
+            logger.warning(f"  Could not check active listings: {active_listings}")
+        else:
             has_active_listings = len(active_listings) > 0
-        except Exception as e:
-            logger.warning(f"  Could not check active listings: {e}")
 
         # If there are no items available to sell AND no active listings, skip this account
         if not items_by_price and not has_active_listings:
             logger.info("  Status: No items available to sell and no active listings")
+            account_outcomes[account_username] = "nothing to sell"
             continue
         elif not items_by_price and has_active_listings:
             logger.info(
@@ -526,14 +774,11 @@ async def execute_selling(
     # Calculate total selling value for all accounts
     total_selling_converted: float = (
         sum(
-            [
-                await convert(
-                    from_currency=plan["currency"],
-                    to_currency="INR",
-                    amount=plan["selling_value"],
-                )
-                for plan in selling_plan
-            ]
+            await convert_many(
+                [plan["selling_value"] for plan in selling_plan],
+                [plan["currency"] for plan in selling_plan],
+                "INR",
+            )
         )
         if selling_plan
         else 0
@@ -543,7 +788,8 @@ async def execute_selling(
     logger.info("--- Selling Plan ---")
     if not selling_plan:
         logger.info("No items to sell from any account.")
-        return selling_plan
+        log_selling_summary(account_outcomes)
+        return failed_accounts
 
     logger.info(
         f"Total items to be sold: {sum(len(plan['items_to_sell']) for plan in selling_plan)}"
@@ -573,19 +819,23 @@ async def execute_selling(
             logger.info("  Items:")
             item_counts: dict = defaultdict(int)
             item_values: dict = {}
-            item_values_inr: dict = {}
 
             for item in plan["items_to_sell"]:
                 name = item.description.market_hash_name
                 item_counts[name] += 1
                 if name not in item_values:
-                    price = await get_db_price(
+                    item_values[name] = await get_db_price(
                         name, client=plan["client"], currency=plan["currency"]
                     )
-                    item_values[name] = price
-                    item_values_inr[name] = await convert(
-                        from_currency=plan["currency"], to_currency="INR", amount=price
-                    )
+
+            item_values_inr = dict(
+                zip(
+                    item_values,
+                    await convert_many(
+                        list(item_values.values()), plan["currency"], "INR"
+                    ),
+                )
+            )
 
             for name, count in item_counts.items():
                 logger.info(
@@ -664,17 +914,38 @@ async def execute_selling(
 
         return result
 
-    sell_results: list = []
-    tasks: list = []
+    sell_results: list = list(failed_accounts)
 
-    # Create tasks for each plan
-    for plan in selling_plan:
-        tasks.append(process_account_plan(plan))
-
-    # Execute all tasks concurrently with a progress bar
-    for result in await tqdm_asyncio.gather(*tasks, desc="Processing accounts"):
-        if result:  # Skip None results
-            sell_results.append(result)
+    # Sell on up to SELLING_ACCOUNT_CONCURRENCY accounts at once with a progress bar
+    plan_results = await run_per_account(
+        selling_plan,
+        process_account_plan,
+        SELLING_ACCOUNT_CONCURRENCY,
+        desc="Processing accounts",
+    )
+    for plan, (result, error) in zip(selling_plan, plan_results):
+        if error is not None:
+            logger.error(f"Selling on {plan['username']} failed: {error}")
+            result = {
+                "account": plan["username"],
+                "items_count": len(plan["items_to_sell"]),
+                "actual_value": 0,
+                "success": False,
+                "currency": plan["currency"],
+                "error": str(error),
+            }
+        if not result:  # Skip None results
+            account_outcomes[plan["username"]] = "no items to list"
+            continue
+        sell_results.append(result)
+        if result.get("error"):
+            account_outcomes[plan["username"]] = f"failed: {result['error']}"
+        elif result["success"]:
+            account_outcomes[plan["username"]] = "sold"
+        elif result.get("partial_success"):
+            account_outcomes[plan["username"]] = "partially sold"
+        else:
+            account_outcomes[plan["username"]] = "unsold"
 
     # Add at the end of execute_selling function, right before return sell_results
     print("\n")
@@ -755,9 +1026,26 @@ async def execute_selling(
                 f"  Missing: {account['currency']} {account['armoury_value'] - account['wallet_balance']} (₹{(account['armoury_value_inr'] - account['wallet_balance_inr']):.2f})"
             )
 
+    log_selling_summary(account_outcomes)
+
     return sell_results
 
 
+def log_selling_summary(account_outcomes: dict[str, str]) -> None:
+    """Logs how every account ended, in username order, followed by counts per outcome."""
+    print("\n")
+    logger.info("--- Selling Summary ---")
+    for username in sorted(account_outcomes):
+        logger.info(f"  {username}: {account_outcomes[username]}")
+    counts = Counter(
+        outcome.split(":", 1)[0] for outcome in account_outcomes.values()
+    )
+    logger.info(
+        f"  {len(account_outcomes)} accounts: "
+        + ", ".join(f"{outcome} {count}" for outcome, count in sorted(counts.items()))
+    )
+
+
 async def sell_immediately_manager_thread(
     client: SteamClient,
     session: aiohttp.ClientSession,
@@ -807,16 +1095,7 @@ async def sell_immediately_manager_thread(
         # Ensure we don't exceed the maximum
         return min(wait_time, MAX_SELLING_TIME_WAIT)
 
-    # List of main items
-    main_items: list[str] = [
-        "Dreams & Nightmares Case",
-        "Kilowatt Case",
-        "Revolution Case",
-        "Fracture Case",
-        "Recoil Case",
-        "Gallery Case",
-        "Fever Case",
-    ]
+    main_items: list[str] = list(MAIN_ITEMS)
 
     non_main_items_found_final_check: bool = False
 
@@ -914,17 +1193,311 @@ async def get_listable_inventory(client: SteamClient) -> list:
     return listable_items
 
 
+class ListingConfirmationBatcher:
+    """
+    Confirms the listings placed on one account in bulk.
+
+    Listings placed with confirm=False are added here, and each flush confirms
+    them all with one get_confirmations call and one allow_multiple_confirmations
+    call. A flush happens once max_size listings are pending or max_delay_ms after
+    the first pending one. If Steam rejects the bulk call, the batch is confirmed
+    one by one. Listings whose confirmation cannot be found or allowed are passed
+    to on_failed, so only they are listed again.
+    """
+
+    def __init__(
+        self,
+        client: SteamClient,
+        max_size: int,
+        max_delay_ms: int,
+        on_confirmed: Callable[[Any, str, float], Awaitable[None]],
+        on_failed: Callable[[Any], None],
+    ):
+        self.client = client
+        self.max_size = max(1, max_size)
+        self.max_delay = max_delay_ms / 1000
+        self.on_confirmed = on_confirmed
+        self.on_failed = on_failed
+        # listing ident code -> (item_data, name, price in INR)
+        self._pending: dict[str, tuple[Any, str, float]] = {}
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        self.flushes = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.fallbacks = 0
+
+    def add(self, item_data, asset_id, name: str, price_converted: float) -> None:
+        ident_code = create_ident_code(
+            asset_id, AppContext.CS2.context, AppContext.CS2.app.value
+        )
+        self._pending[ident_code] = (item_data, name, price_converted)
+        if len(self._pending) >= self.max_size:
+            # Confirm in the background so listing continues meanwhile
+            self._flush_later()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush_later
+            )
+
+    def _flush_later(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        task = asyncio.ensure_future(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _allow(self, confirmations: list) -> set[str]:
+        """Allows the confirmations and returns the ident codes of the listings that were confirmed."""
+        try:
+            await steam_api_call_with_retry(
+                self.client.allow_multiple_confirmations, confirmations
+            )
+            return {conf.listing_item_ident_code for conf in confirmations}
+        except Exception as e:
+            logger.warning(
+                f"Bulk confirmation of {len(confirmations)} listings on {self.client.username} "
+                f"failed ({e}), confirming them one by one"
+            )
+            self.fallbacks += 1
+
+        confirmed = set()
+        for conf in confirmations:
+            try:
+                await steam_api_call_with_retry(self.client.allow_confirmation, conf)
+                confirmed.add(conf.listing_item_ident_code)
+            except Exception as e:
+                logger.error(f"Failed to confirm listing {conf.creator_id}: {e}")
+        return confirmed
+
+    async def flush(self) -> None:
+        """Confirms every pending listing now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            self.flushes += 1
+
+            confirmed: set[str] = set()
+            try:
+                confirmations = await steam_api_call_with_retry(
+                    self.client.get_confirmations
+                )
+                to_allow = [
+                    conf
+                    for conf in confirmations
+                    if conf.type is ConfirmationType.LISTING
+                    and conf.listing_item_ident_code in batch
+                ]
+                if to_allow:
+                    confirmed = await self._allow(to_allow)
+            except Exception as e:
+                logger.error(
+                    f"Failed to fetch confirmations for {self.client.username}: {e}"
+                )
+
+            for ident_code, (item_data, name, price_converted) in batch.items():
+                if ident_code in confirmed:
+                    self.confirmed += 1
+                    await self.on_confirmed(item_data, name, price_converted)
+                else:
+                    self.failed += 1
+                    logger.warning(
+                        f"Listing of {name} was not confirmed, queueing it again"
+                    )
+                    self.on_failed(item_data)
+
+            logger.trace(
+                f"Confirmed {len(confirmed)}/{len(batch)} listings on {self.client.username}"
+            )
+
+    async def close(self) -> None:
+        """Waits for timed flushes and confirms whatever is still pending."""
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "flushes": self.flushes,
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "fallbacks": self.fallbacks,
+        }
+
+
+class BatchPriceSnapshot:
+    """
+    Prices of every distinct item in a listing batch and the account currency's
+    rate to INR, resolved once when the batch starts.
+
+    Listing workers only read the frozen map, so pricing an item never waits on
+    prices.db, Steam or the FX source. A background task re-resolves entries that
+    are older than max_age_seconds and swaps in a new map. Items whose price could
+    not be resolved up front are looked up once on first use.
+    """
+
+    def __init__(self, client: SteamClient, currency: str, max_age_seconds: float):
+        self.client = client
+        self.currency = currency
+        self.max_age = max_age_seconds
+        # market_hash_name -> (price in the account currency, resolved at)
+        self._prices: Mapping[str, tuple[float, float]] = MappingProxyType({})
+        self._rate = 1.0
+        self._rate_resolved_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+        self.refreshed = 0
+        self.misses = 0
+
+    async def _resolve(self, names: list[str]) -> dict[str, tuple[float, float]]:
+        results = await asyncio.gather(
+            *(
+                get_db_price(name, client=self.client, currency=self.currency)
+                for name in names
+            ),
+            return_exceptions=True,
+        )
+        resolved_at = time.monotonic()
+        prices = {}
+        for name, price in zip(names, results):
+            if isinstance(price, Exception):
+                logger.error(f"Could not price {name} in {self.currency}: {price}")
+            else:
+                prices[name] = (price, resolved_at)
+        return prices
+
+    async def _resolve_rate(self) -> None:
+        self._rate = await get_exchange_rate(self.currency, "INR")
+        self._rate_resolved_at = time.monotonic()
+
+    async def load(self, names) -> None:
+        """Resolves the prices of all distinct names and the FX rate."""
+        prices, _ = await asyncio.gather(
+            self._resolve(list(set(names))), self._resolve_rate()
+        )
+        self._prices = MappingProxyType(prices)
+
+    def price(self, market_hash_name: str) -> float | None:
+        entry = self._prices.get(market_hash_name)
+        return entry[0] if entry is not None else None
+
+    async def resolve_missing(self, market_hash_name: str) -> float:
+        """Looks up an item that is not in the snapshot and adds it."""
+        self.misses += 1
+        price = await get_db_price(
+            market_hash_name, client=self.client, currency=self.currency
+        )
+        self._prices = MappingProxyType(
+            {**self._prices, market_hash_name: (price, time.monotonic())}
+        )
+        return price
+
+    def to_inr(self, amount: float) -> float:
+        return amount * self._rate
+
+    async def _refresh_aged(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.max_age / 4))
+            now = time.monotonic()
+            aged = [
+                name
+                for name, (_, resolved_at) in self._prices.items()
+                if now - resolved_at > self.max_age
+            ]
+            try:
+                if now - self._rate_resolved_at > self.max_age:
+                    await self._resolve_rate()
+                if aged:
+                    prices = await self._resolve(aged)
+                    self._prices = MappingProxyType({**self._prices, **prices})
+                    self.refreshed += len(prices)
+            except Exception as e:
+                logger.warning(f"Could not refresh listing prices: {e}")
+
+    def start(self) -> None:
+        """Starts refreshing aged entries in the background."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh_aged())
+
+    async def stop(self) -> None:
+        if self._refresh_task is None:
+            return
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+
 async def sell_items_batch(
     client: SteamClient,
     items_to_process: list,
     account: dict,
     price_multiplier: float = 1,
 ) -> None:
-    """Process and sell items up to MAX_ITEMS_LIMIT in the provided list"""
-    not_in_inventory_error_count: dict = {}
+    """
+    Process and sell items up to MAX_ITEMS_LIMIT in the provided list.
+
+    The items are put into a ListingWorkQueue keyed by asset_id, and up to
+    LISTING_CONCURRENCY_PER_ACCOUNT workers take items from it and list them
+    concurrently. Listings still go through the account's "sell" rate limiter
+    bucket, so the workers only overlap the waiting for Steam, not the request
+    rate. Items that need another attempt are retried through the queue, some of
+    them only after a delay, and workers wait for in-flight and delayed items
+    before finishing.
+
+    With BATCH_CONFIRMATIONS, listings are placed without confirming them and a
+    ListingConfirmationBatcher confirms them in bulk. Items whose listing could not
+    be confirmed are retried.
+
+    Prices come from a BatchPriceSnapshot built before the workers start, with
+    entries re-resolved once they are older than LISTING_PRICE_MAX_AGE_SECONDS.
+    """
+    queue = ListingWorkQueue(items_to_process)
+    username = client.username
+    in_flight = 0
+    attempts = 0
+    listed = 0
+    queue_changed = asyncio.Event()
+    started = time.monotonic()
+
+    async def on_listed(item_data, name: str, price_converted: float) -> None:
+        nonlocal listed
+        logger.info(
+            f"Inventory item {name} placed on sale for ₹{round(price_converted, 2)}"
+        )
+        listed += 1
+        queue.finish(ListingWorkQueue.asset_id_of(item_data), "listed")
+        # Acquire lock and update the global tqdm progress bar
+        async with processing_listings_lock:
+            if processing_listings_progress is not None:
+                processing_listings_progress.update(1)
+
+    def on_confirmation_failed(item_data) -> None:
+        queue.retry(ListingWorkQueue.asset_id_of(item_data), "confirmation_failed")
+        queue_changed.set()
+
+    batcher = (
+        ListingConfirmationBatcher(
+            client,
+            CONFIRMATION_BATCH_SIZE,
+            CONFIRMATION_BATCH_MAX_DELAY_MS,
+            on_listed,
+            on_confirmation_failed,
+        )
+        if BATCH_CONFIRMATIONS
+        else None
+    )
 
     async def sell_single_item(item_data, client: SteamClient) -> None:
-        """Process and sell a single item"""
+        """Process and sell a single item taken from the queue"""
         if isinstance(item_data, dict):
             item = item_data["item"]
             name = item_data["name"]
@@ -934,17 +1507,14 @@ async def sell_items_batch(
             name = item.description.market_hash_name
             asset_id = item.asset_id
 
-        # Calculate price
-        latest_price = price_multiplier * (
-            await get_db_price(name, client=client, currency=account["currency"])
-        )
+        # Calculate price from the batch snapshot
+        price = prices.price(name)
+        if price is None:
+            price = await prices.resolve_missing(name)
+        latest_price = price_multiplier * price
         latest_price = latest_price * MULTIPLIER
         latest_price_cents = math.ceil(latest_price * 100)
-        latest_price_converted = await convert(
-            from_currency=account["currency"],
-            to_currency="INR",
-            amount=latest_price_cents / 100,
-        )
+        latest_price_converted = prices.to_inr(latest_price_cents / 100)
 
         try:
             sell_offer_id = await steam_api_call_with_retry(
@@ -952,39 +1522,21 @@ async def sell_items_batch(
                 obj=item,
                 price=latest_price_cents,
                 app_context=AppContext.CS2,
-                confirm=True,
+                confirm=batcher is None,
             )
-            await asyncio.sleep(0.1)
-            if sell_offer_id:
-                logger.info(
-                    f"Inventory item {name} placed on sale for ₹{round(latest_price_converted, 2)}"
-                )
-
-                if item_data in items_to_process:  # Check if still in list
-                    items_to_process.remove(item_data)
-                    if asset_id in not_in_inventory_error_count:
-                        del not_in_inventory_error_count[asset_id]
-
-                # Acquire lock and update the global tqdm progress bar
-                async with processing_listings_lock:
-                    if processing_listings_progress is not None:
-                        processing_listings_progress.update(1)
+            if batcher is not None:
+                # Placed without confirming, so there is no listing id to check.
+                # The item stays taken until the batcher confirms or retries it.
+                batcher.add(item_data, asset_id, name, latest_price_converted)
+            elif sell_offer_id:
+                await on_listed(item_data, name, latest_price_converted)
             else:
                 logger.warning(f"Item {name} could not be listed.")
-                if item_data in items_to_process:  # Check if still in list
-                    items_to_process.remove(item_data)
-                    items_to_process.append(item_data)
-                await asyncio.sleep(1)
+                queue.retry(asset_id, "not_listed", delay=1)
 
         except Exception as e:
             if "no longer in your inventory" in str(e).lower():
-                await handle_inventory_error(
-                    client,
-                    items_to_process,
-                    asset_id,
-                    name,
-                    not_in_inventory_error_count,
-                )
+                await handle_inventory_error(client, queue, asset_id, name)
             elif (
                 "you already have a listing for this item pending confirmation"
                 in str(e).lower()
@@ -993,25 +1545,125 @@ async def sell_items_batch(
                     client,
                     asset_id,
                 )
+                # Try the item again first, like before the confirmation
+                queue.retry(asset_id, "pending_confirmation", front=True)
             else:
                 logger.error(f"Error while selling {name}: {e}")
-                if item_data in items_to_process:  # Check if still in list
-                    items_to_process.remove(item_data)
-                    items_to_process.append(item_data)
-                await asyncio.sleep(15)
-
-    # Process items one by one in a sequential loop
-    count = 0
-    while items_to_process:
-        if (
-            MAX_ITEMS_LIMIT is not None
-            and MAX_ITEMS_LIMIT > 0
-            and count >= MAX_ITEMS_LIMIT
-        ):
-            break
-        current_item = items_to_process[0]  # Get the first item
-        await sell_single_item(current_item, client)
-        count += 1
+                queue.retry(asset_id, "error")
+                # Slow this account's listings down instead of a fixed sleep
+                rate_limiter.penalize("sell", client.username)
+
+    async def listing_worker() -> None:
+        nonlocal in_flight, attempts
+        while True:
+            if (
+                MAX_ITEMS_LIMIT is not None
+                and MAX_ITEMS_LIMIT > 0
+                and attempts >= MAX_ITEMS_LIMIT
+            ):
+                return
+            current_item = queue.pop()
+            if current_item is None:
+                ready_in = queue.next_ready_in()
+                if ready_in == 0:
+                    continue
+                if ready_in is None and not in_flight:
+                    return
+                # Another worker may still retry its item, or a delayed one becomes ready
+                queue_changed.clear()
+                try:
+                    await asyncio.wait_for(queue_changed.wait(), ready_in)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            in_flight += 1
+            attempts += 1
+            try:
+                await sell_single_item(current_item, client)
+            except Exception as e:
+                logger.error(f"Error while preparing listing on {username}: {e}")
+                queue.finish(ListingWorkQueue.asset_id_of(current_item), "failed")
+            finally:
+                in_flight -= 1
+                queue_changed.set()
+
+    prices = BatchPriceSnapshot(
+        client, account["currency"], LISTING_PRICE_MAX_AGE_SECONDS
+    )
+    await prices.load(
+        item_data["name"]
+        if isinstance(item_data, dict)
+        else item_data.description.market_hash_name
+        for item_data in items_to_process
+    )
+    prices.start()
+
+    workers = max(1, min(LISTING_CONCURRENCY_PER_ACCOUNT, len(queue)))
+    try:
+        while True:
+            await asyncio.gather(*(listing_worker() for _ in range(workers)))
+            if batcher is None:
+                break
+            # Listings that failed to confirm are retried by the final flush
+            await batcher.close()
+            if not queue.has_waiting() or (
+                MAX_ITEMS_LIMIT is not None
+                and MAX_ITEMS_LIMIT > 0
+                and attempts >= MAX_ITEMS_LIMIT
+            ):
+                break
+    finally:
+        await prices.stop()
+
+    if batcher is not None:
+        for key, value in batcher.stats().items():
+            _confirmation_batch_stats[key] += value
+
+    queue_stats = queue.stats()
+    _listing_retry_stats.update(queue_stats["retries"])
+    _listing_outcome_stats.update(queue_stats["outcomes"])
+
+    elapsed = time.monotonic() - started
+    stats = _listing_throughput.setdefault(
+        username, {"listed": 0, "attempts": 0, "seconds": 0.0}
+    )
+    stats["listed"] += listed
+    stats["attempts"] += attempts
+    stats["seconds"] += elapsed
+    if attempts:
+        logger.info(
+            f"Listed {listed} items on {username} in {elapsed:.1f}s "
+            f"({listed / elapsed if elapsed else 0:.2f} items/s, {workers} workers)"
+        )
+        logger.debug(f"Listing queue on {username}: {queue_stats}")
+
+
+def get_confirmation_batch_stats() -> dict[str, int]:
+    """Returns how many confirmation flushes ran and how many listings they confirmed or re-queued."""
+    return dict(_confirmation_batch_stats)
+
+
+def get_listing_retry_stats() -> dict[str, dict[str, int]]:
+    """Returns listing retries per reason and final outcomes per kind over all batches."""
+    return {
+        "retries": dict(_listing_retry_stats),
+        "outcomes": dict(_listing_outcome_stats),
+    }
+
+
+def get_listing_throughput_stats() -> dict[str, dict[str, float]]:
+    """Returns listed items, listing attempts and items/second per account over all batches."""
+    return {
+        username: {
+            **stats,
+            "seconds": round(stats["seconds"], 1),
+            "items_per_second": round(stats["listed"] / stats["seconds"], 2)
+            if stats["seconds"]
+            else 0.0,
+        }
+        for username, stats in _listing_throughput.items()
+    }
 
 
 async def handle_listing_confirmation_error(
@@ -1033,26 +1685,18 @@ async def handle_listing_confirmation_error(
 
 async def handle_inventory_error(
     client: SteamClient,
-    items_to_process: list,
+    queue: ListingWorkQueue,
     asset_id: str,
     name: str,
-    not_in_inventory_error_count: dict,
 ) -> None:
-    """Handle the specific case of "no longer in inventory" errors"""
-    # Initialize or increment error counter for this asset
-    if asset_id not in not_in_inventory_error_count:
-        not_in_inventory_error_count[asset_id] = 1
-    else:
-        not_in_inventory_error_count[asset_id] += 1
-
-    error_count = not_in_inventory_error_count[asset_id]
+    """Handle the specific case of "no longer in inventory" errors for an item taken from the queue"""
+    error_count = queue.retries(asset_id, "not_in_inventory") + 1
     logger.warning(f"'No longer in inventory' error for {name} (attempt {error_count})")
 
     # First time: Just move to end of queue
     if error_count == 1:
         logger.info(f"First error occurrence for {name}, moving to end of queue")
-        current_item = items_to_process.pop(0)
-        items_to_process.append(current_item)
+        queue.retry(asset_id, "not_in_inventory")
 
     # Second or third time: Wait and check inventory
     elif error_count in [2, 3]:
@@ -1064,9 +1708,7 @@ async def handle_inventory_error(
         await asyncio.sleep(wait_time)
 
         # Check if item is truly in inventory
-        await check_item_in_inventory(
-            client, items_to_process, asset_id, name, not_in_inventory_error_count
-        )
+        await check_item_in_inventory(client, queue, asset_id, name)
 
     # Fourth time: Give up
     else:
@@ -1076,18 +1718,16 @@ async def handle_inventory_error(
         logger.error(
             "This item may be stuck in the system. Removing from processing queue."
         )
-        items_to_process.pop(0)
-        del not_in_inventory_error_count[asset_id]
+        queue.finish(asset_id, "gave_up")
 
 
 async def check_item_in_inventory(
     client: SteamClient,
-    items_to_process: list,
+    queue: ListingWorkQueue,
     asset_id: str,
     name: str,
-    not_in_inventory_error_count: dict,
 ) -> None:
-    """Check if an item actually exists in inventory"""
+    """Check if an item actually exists in inventory, retrying it through the queue if it does"""
     try:
         inventory = await get_full_inventory(client)
         item_exists = any(inv_item.asset_id == asset_id for inv_item in inventory[0])
@@ -1096,17 +1736,17 @@ async def check_item_in_inventory(
             logger.info(
                 f"Item {name} (asset ID: {asset_id}) verified as no longer in inventory, assuming sold"
             )
-            items_to_process.pop(0)
-            del not_in_inventory_error_count[asset_id]
+            queue.finish(asset_id, "sold")
         else:
             logger.info(f"Item {name} still in inventory, trying again after delay")
-            await asyncio.sleep(random.uniform(3, 5))
-            # Keep at front of queue to try again
+            # Try again first once the delay has passed
+            queue.retry(
+                asset_id, "not_in_inventory", delay=random.uniform(3, 5), front=True
+            )
     except Exception as inv_error:
         logger.error(f"Error checking inventory: {inv_error}")
         # Move to end of queue if we couldn't check inventory
-        current_item = items_to_process.pop(0)
-        items_to_process.append(current_item)
+        queue.retry(asset_id, "not_in_inventory")
 
 
 async def cancel_sell_listings(
@@ -1133,23 +1773,24 @@ async def cancel_sell_listings(
                         processing_listings_progress.update(-1)
 
                 non_main_items_found = True
-                # Convert price to INR
-                converted_listing_price = await convert(
-                    from_currency=account["currency"],
-                    to_currency="INR",
-                    amount=listing.price / 100,
-                )
-                listed_items_price_converted += converted_listing_price
-
                 listed_items.append(
                     {
                         "listing": listing,
                         "listing_id": listing.id,
-                        "price": converted_listing_price,
                         "name": listing.item.description.market_hash_name,
                     }
                 )
 
+    # Convert all cancelled listing prices to INR at once
+    converted_listing_prices = await convert_many(
+        [item["listing"].price / 100 for item in listed_items],
+        account["currency"],
+        "INR",
+    )
+    for item, converted_listing_price in zip(listed_items, converted_listing_prices):
+        item["price"] = converted_listing_price
+        listed_items_price_converted += converted_listing_price
+
     return non_main_items_found, listed_items_price_converted
 
 
@@ -1184,243 +1825,273 @@ async def items_lister(
         progress_callback (Callable, optional): Function to call with progress updates (current, total, status).
     """
 
-    # Progress monitoring coroutine
-    async def monitor_progress():
-        last_progress = 0
-        while True:
-            try:
-                async with processing_listings_lock:
-                    if processing_listings_progress is None:
-                        break
-                    current_progress = processing_listings_progress.n
-                    total_progress = processing_listings_progress.total
+    try:
+        # Progress monitoring coroutine
+        async def monitor_progress():
+            last_progress = 0
+            while True:
+                try:
+                    async with processing_listings_lock:
+                        if processing_listings_progress is None:
+                            break
+                        current_progress = processing_listings_progress.n
+                        total_progress = processing_listings_progress.total
+
+                    if current_progress > last_progress:
+                        if progress_callback:
+                            progress_callback(
+                                current_progress, total_progress, "Listing items"
+                            )
+                        last_progress = current_progress
 
-                if current_progress > last_progress:
-                    if progress_callback:
-                        progress_callback(
-                            current_progress, total_progress, "Listing items"
-                        )
-                    last_progress = current_progress
+                    # Check if completed
+                    if current_progress >= total_progress:
+                        break
 
-                # Check if completed
-                if current_progress >= total_progress:
+                    await asyncio.sleep(0.5)  # Check every 500ms
+                except Exception as e:
+                    logger.error(f"Progress monitoring error: {e}")
                     break
 
-                await asyncio.sleep(0.5)  # Check every 500ms
-            except Exception as e:
-                logger.error(f"Progress monitoring error: {e}")
-                break
-
-    # Report initial progress
-    if progress_callback:
-        progress_callback(0, 0, "Initializing...")
-
-    user_agents = UserAgentsService()
-    await user_agents.load()
-    all_accounts = get_all_steam_accounts()
-
-    # Set active_armoury_passes to 5 for all accounts
-    for acc in all_accounts:
-        acc["active_armoury_passes"] = NUM_PASSES_REQUIRED
+        # Report initial progress
+        if progress_callback:
+            progress_callback(0, 0, "Initializing...")
 
-    # Filter accounts based on steam_usernames or get all armoury accounts
-    if steam_usernames:
-        selected_accounts = [
-            acc
-            for acc in all_accounts
-            if acc["steam_username"] in steam_usernames and acc["is_armoury"]
-        ]
-        print("\n")
-        logger.info(
-            f"Fetching inventory data for {len(selected_accounts)} specified armoury accounts..."
-        )
-    else:
-        selected_accounts = [acc for acc in all_accounts if acc["is_armoury"]]
-        print("\n")
-        logger.info(f"Processing all {len(selected_accounts)} armoury pass accounts...")
+        # Keeps held item prices fresh while inventories load, so the lookups below hit the cache
+        start_price_refresher()
 
-    if progress_callback:
-        progress_callback(0, 0, "Fetching inventory data...")
+        user_agents = UserAgentsService()
+        await user_agents.load()
+        all_accounts = get_all_steam_accounts()
 
-    account_data_list: list = []
+        # Set active_armoury_passes to 5 for all accounts
+        for acc in all_accounts:
+            acc["active_armoury_passes"] = NUM_PASSES_REQUIRED
 
-    async def process_accounts_inventory(selected_accounts) -> list:
-        semaphore = asyncio.Semaphore(ACCOUNT_INVENTORY_SEMAPHORE)
-        account_data_list = []
+        # Filter accounts based on steam_usernames or get all armoury accounts
+        if steam_usernames:
+            selected_accounts = [
+                acc
+                for acc in all_accounts
+                if acc["steam_username"] in steam_usernames and acc["is_armoury"]
+            ]
+            print("\n")
+            logger.info(
+                f"Fetching inventory data for {len(selected_accounts)} specified armoury accounts..."
+            )
+        else:
+            selected_accounts = [acc for acc in all_accounts if acc["is_armoury"]]
+            print("\n")
+            logger.info(
+                f"Processing all {len(selected_accounts)} armoury pass accounts..."
+            )
 
-        async def process_account(account) -> dict:
-            async with semaphore:
-                logger.info(f"Getting inventory for {account['steam_username']}...")
-                account_data = await get_account_details(account)
-                return account_data
+        if progress_callback:
+            progress_callback(0, 0, "Fetching inventory data...")
 
-        tasks = [process_account(account) for account in selected_accounts]
-        for future in tqdm_asyncio.as_completed(tasks):
-            account_data = await future
-            account_data_list.append(account_data)
+        account_data_list: list = []
 
-        return account_data_list
+        async def process_accounts_inventory(selected_accounts) -> list:
+            semaphore = asyncio.Semaphore(ACCOUNT_INVENTORY_SEMAPHORE)
+            account_data_list = []
 
-    account_data_list = await process_accounts_inventory(selected_accounts)
+            async def process_account(account) -> dict:
+                async with semaphore:
+                    logger.info(f"Getting inventory for {account['steam_username']}...")
+                    account_data = await get_account_details(account)
+                    return account_data
 
-    if progress_callback:
-        progress_callback(0, 0, "Processing inventory data...")
+            tasks = [process_account(account) for account in selected_accounts]
+            for future in tqdm_asyncio.as_completed(tasks):
+                account_data = await future
+                account_data_list.append(account_data)
 
-    # Initialize dictionary to hold sets of items for each currency
-    items_by_currency = {}
+            return account_data_list
 
-    for account_data in account_data_list:
-        currency = account_data["currency"]
+        account_data_list = await process_accounts_inventory(selected_accounts)
 
-        # If this currency doesn't exist in dict, add it with empty set
-        if currency not in items_by_currency:
-            items_by_currency[currency] = set()
+        if progress_callback:
+            progress_callback(0, 0, "Processing inventory data...")
 
-        # Add all listable items from this account to the currency's set
-        for item in account_data["listable_items"]:
-            items_by_currency[currency].add(item["name"])
+        # Initialize dictionary to hold sets of items for each currency
+        items_by_currency = {}
 
-    # Convert all sets to lists for compatibility
-    items_by_currency = {
-        currency: list(items) for currency, items in items_by_currency.items()
-    }
+        for account_data in account_data_list:
+            currency = account_data["currency"]
 
-    clients = [
-        account_data["logged_in_client"]
-        for account_data in account_data_list
-        if account_data.get("logged_in_client")
-    ]
+            # If this currency doesn't exist in dict, add it with empty set
+            if currency not in items_by_currency:
+                items_by_currency[currency] = set()
 
-    await update_prices_from_market(
-        items_by_currency=items_by_currency,
-        override_armoury_only=True,
-        multiple_clients=clients,
-    )
+            # Add all listable items from this account to the currency's set
+            for item in account_data["listable_items"]:
+                items_by_currency[currency].add(item["name"])
 
-    if progress_callback:
-        progress_callback(0, 0, "Calculating item values...")
+        # Convert all sets to lists for compatibility
+        items_by_currency = {
+            currency: list(items) for currency, items in items_by_currency.items()
+        }
 
-    # Update prices and calculate values for all accounts
-    for account_data in account_data_list:
-        listable_value: float = 0
+        clients = [
+            account_data["logged_in_client"]
+            for account_data in account_data_list
+            if account_data.get("logged_in_client")
+        ]
 
-        for item in account_data["listable_items"]:
-            price = await get_db_price(
-                item["name"],
-                client=account_data["logged_in_client"],
-                currency=account_data["currency"],
-            )
-            item["price"] = price
-            listable_value += price
-
-        account_data["listable_value"] = listable_value
-        account_data["listable_value_converted"] = await convert(
-            from_currency=account_data["currency"],
-            to_currency="INR",
-            amount=listable_value,
+        await update_prices_from_market(
+            items_by_currency=items_by_currency,
+            override_armoury_only=True,
+            multiple_clients=clients,
         )
 
-    # Calculate totals
-    total_listable_value_converted: float = sum(
-        data["listable_value_converted"] for data in account_data_list
-    )
+        if progress_callback:
+            progress_callback(0, 0, "Calculating item values...")
 
-    total_active_armoury_passes: int = sum(
-        data["active_armoury_passes"] for data in account_data_list
-    )
-    print("\n")
-    logger.info("--- Inventory Summary ---")
-    logger.info(
-        f"Total listable inventory value: ₹{total_listable_value_converted:.2f}"
-    )
-    logger.info(f"Total armory passes: {total_active_armoury_passes}")
-
-    # =================================================================
-    # FIXED TQDM CODE - MOVED HERE AFTER INVENTORY SUMMARY
-    # =================================================================
-
-    # Calculate total items to process BEFORE initializing progress bar
-    if progress_callback:
-        progress_callback(0, 0, "Calculating items to process...")
-
-    # Calculate total items that will be processed
-    processing_listings_total_items = 0
-    for account_data in account_data_list:
-        # Count items that have a price > 0 (items that will actually be listed)
-        items_to_sell = [
-            item
-            for item in account_data["listable_items"]
-            if item["price"] and item["price"] > 0
-        ]
-        processing_listings_total_items += len(items_to_sell)
+        # Update prices and calculate values for all accounts
+        for account_data in account_data_list:
+            listable_value: float = 0
+
+            for item in account_data["listable_items"]:
+                price = await get_db_price(
+                    item["name"],
+                    client=account_data["logged_in_client"],
+                    currency=account_data["currency"],
+                )
+                item["price"] = price
+                listable_value += price
 
-    # Initialize the progress bar with the correct total
-    async with processing_listings_lock:
-        if processing_listings_progress is not None:
-            processing_listings_progress.close()
+            account_data["listable_value"] = listable_value
+            account_data["listable_value_converted"] = await convert(
+                from_currency=account_data["currency"],
+                to_currency="INR",
+                amount=listable_value,
+            )
 
-        processing_listings_progress = tqdm_asyncio(
-            total=processing_listings_total_items,
-            desc="Processing Listings",
-            unit="items",
+        # Calculate totals
+        total_listable_value_converted: float = sum(
+            data["listable_value_converted"] for data in account_data_list
         )
 
-    if progress_callback:
-        progress_callback(
-            0, processing_listings_total_items, "Starting item listings..."
+        total_active_armoury_passes: int = sum(
+            data["active_armoury_passes"] for data in account_data_list
         )
+        print("\n")
+        logger.info("--- Inventory Summary ---")
+        logger.info(
+            f"Total listable inventory value: ₹{total_listable_value_converted:.2f}"
+        )
+        logger.info(f"Total armory passes: {total_active_armoury_passes}")
 
-    # Start progress monitoring before executing selling
-    monitor_task = None
-    if progress_callback and processing_listings_total_items > 0:
-        monitor_task = asyncio.create_task(monitor_progress())
-
-    try:
-        # Execute selling (this function updates the global tqdm progress bar)
-        results = await execute_selling(account_data_list, sell_all_items)
-    finally:
-        # Stop progress monitoring
-        if monitor_task:
-            monitor_task.cancel()
-            try:
-                await monitor_task
-            except asyncio.CancelledError:
-                pass
+        # =================================================================
+        # FIXED TQDM CODE - MOVED HERE AFTER INVENTORY SUMMARY
+        # =================================================================
 
-    print("\n")
+        # Calculate total items to process BEFORE initializing progress bar
+        if progress_callback:
+            progress_callback(0, 0, "Calculating items to process...")
+
+        # Calculate total items that will be processed
+        processing_listings_total_items = 0
+        for account_data in account_data_list:
+            # Count items that have a price > 0 (items that will actually be listed)
+            items_to_sell = [
+                item
+                for item in account_data["listable_items"]
+                if item["price"] and item["price"] > 0
+            ]
+            processing_listings_total_items += len(items_to_sell)
 
-    # Check for errors in results
-    errors = [r for r in results if r.get("error")]
+        # Initialize the progress bar with the correct total
+        async with processing_listings_lock:
+            if processing_listings_progress is not None:
+                processing_listings_progress.close()
 
-    if errors:
-        logger.error(f"Errors count: {len(errors)}")
-        for err in errors:
-            logger.error(f"Account: {err['account']}, Error: {err['error']}")
-        if progress_callback:
-            progress_callback(
-                processing_listings_total_items,
-                processing_listings_total_items,
-                f"Completed with {len(errors)} errors",
+            processing_listings_progress = tqdm_asyncio(
+                total=processing_listings_total_items,
+                desc="Processing Listings",
+                unit="items",
             )
-    else:
-        logger.success(" All Done.")
+
         if progress_callback:
             progress_callback(
-                processing_listings_total_items,
-                processing_listings_total_items,
-                "All items listed successfully!",
+                0, processing_listings_total_items, "Starting item listings..."
             )
 
-    # Close progress bar
-    async with processing_listings_lock:
-        if processing_listings_progress is not None:
-            processing_listings_progress.close()
-            processing_listings_progress = None
+        # Start progress monitoring before executing selling
+        monitor_task = None
+        if progress_callback and processing_listings_total_items > 0:
+            monitor_task = asyncio.create_task(monitor_progress())
 
-    if errors:
-        return False
-    else:
-        return True
+        try:
+            # Execute selling (this function updates the global tqdm progress bar)
+            results = await execute_selling(account_data_list, sell_all_items)
+        finally:
+            # Stop progress monitoring
+            if monitor_task:
+                monitor_task.cancel()
+                try:
+                    await monitor_task
+                except asyncio.CancelledError:
+                    pass
+
+        print("\n")
+
+        # Check for errors in results
+        errors = [r for r in results if r.get("error")]
+
+        if errors:
+            logger.error(f"Errors count: {len(errors)}")
+            for err in errors:
+                logger.error(f"Account: {err['account']}, Error: {err['error']}")
+            if progress_callback:
+                progress_callback(
+                    processing_listings_total_items,
+                    processing_listings_total_items,
+                    f"Completed with {len(errors)} errors",
+                )
+        else:
+            logger.success(" All Done.")
+            if progress_callback:
+                progress_callback(
+                    processing_listings_total_items,
+                    processing_listings_total_items,
+                    "All items listed successfully!",
+                )
+
+        # Close progress bar
+        async with processing_listings_lock:
+            if processing_listings_progress is not None:
+                processing_listings_progress.close()
+                processing_listings_progress = None
+
+        await stop_price_refresher()
+        logger.info(f"Price refresher stats: {get_price_refresher_stats()}")
+        logger.info(f"Price cache stats: {get_price_cache_stats()}")
+        logger.info(f"Price TTLs: {get_price_ttl_stats()}")
+        logger.info(f"Histogram fetch stats: {get_histogram_singleflight_stats()}")
+        logger.info(
+            f"Order book history stats: {orderbook_store.get_orderbook_store_stats()}"
+        )
+        logger.info(f"Price fetch concurrency: {get_price_fetch_governor_stats()}")
+        logger.info(f"FX derived prices: {get_fx_derived_price_stats()}")
+        logger.info(f"Rate limiter stats: {get_rate_limiter_stats()}")
+        logger.info(f"Steam client pool stats: {get_client_pool_stats()}")
+        logger.info(f"Public client pool stats: {get_public_client_pool_stats()}")
+        logger.info(f"Circuit breakers: {get_circuit_breaker_stats()}")
+        logger.info(f"Listing throughput: {get_listing_throughput_stats()}")
+        logger.info(f"Listing confirmations: {get_confirmation_batch_stats()}")
+        logger.info(f"Listing retries: {get_listing_retry_stats()}")
+        logger.info(f"Proxy pool stats: {get_proxy_pool_stats()}")
+        dump_instrumentation("items_lister")
+
+        if errors:
+            return False
+        else:
+            return True
+    finally:
+        await close_client_pool()
+        await close_public_client_pool()
+        await close_proxy_pool()
 
 
 if __name__ == "__main__":
@@ -14,7 +14,7 @@ _config = load_config()
 ROOT_DIR = _config["ROOT_DIR"]
 sys.path.insert(0, ROOT_DIR)
 from accounts_manager.utils import update_steam_wallet_balances
-from database import convert, get_all_steam_accounts
+from database import convert, convert_many, get_all_steam_accounts
 from utils.inventory_value_calculator import value_calculator
 from utils.logger import get_custom_logger
 
@@ -41,21 +41,22 @@ async def calculate_cashout(update: bool = True) -> int | float:
     accounts = get_all_steam_accounts()
 
     # Convert each account's steam balance to INR and sum them
-    total_steam_bal_inr = 0
-    for account in accounts:
-        balance = account["steam_balance"] or 0
-        currency = account["currency"]
-        if balance > 0 and currency:
-            # Convert balance from account's currency to INR
-            balance_inr = await convert(
-                from_currency=currency, to_currency="INR", amount=balance
-            )
-            total_steam_bal_inr += balance_inr
+    balances = [
+        (account["steam_balance"], account["currency"])
+        for account in accounts
+        if (account["steam_balance"] or 0) > 0 and account["currency"]
+    ]
+    total_steam_bal_inr = sum(
+        await convert_many(
+            [balance for balance, _ in balances],
+            [currency for _, currency in balances],
+            "INR",
+        )
+    )
 
     total_items_value_inr = 0
     for account in accounts:
         inventory_value = account["inventory_value"] or 0
-        currency = account["currency"]  # Fixed: get currency for each account
         if inventory_value > 0:
             total_items_value_inr += (
                 inventory_value  # The inventory values are already in INR
@@ -0,0 +1,262 @@
+import sys
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+import asyncio
+import random
+import time
+from collections import Counter
+from datetime import datetime
+
+import aiohttp
+from aiohttp import web
+from aiosteampy import ConfirmationType
+from aiosteampy.models import Confirmation
+from aiosteampy.utils import create_ident_code
+
+import utils.Steam_Items_Lister as lister
+from utils.rate_limiter import rate_limiter
+
+# Compares the per-listing confirmation flow of sell_items_batch with the bulk
+# ListingConfirmationBatcher flow. Both run against a local mock of Steam's
+# sellitem and mobileconf endpoints that adds MOCK_LATENCY_MS to every request,
+# and the request counts per endpoint and wall times are logged for both.
+
+BENCHMARK_ITEMS = 200
+MOCK_LATENCY_MS = 50
+# Fraction of multiajaxop requests the mock rejects, to exercise the one by one fallback
+MOCK_MULTI_FAILURE_RATE = 0.0
+
+
+class MockSteamServer:
+    """Minimal stand-in for the market sellitem and mobileconf endpoints."""
+
+    def __init__(self, latency_ms: int, multi_failure_rate: float):
+        self.latency = latency_ms / 1000
+        self.multi_failure_rate = multi_failure_rate
+        self.requests: Counter = Counter()
+        # confirmation id -> asset id
+        self._confirmations: dict[int, str] = {}
+        self._next_id = 1
+        self._random = random.Random(0)
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def _respond(self, route: str, data: dict) -> web.Response:
+        self.requests[route] += 1
+        await asyncio.sleep(self.latency)
+        return web.json_response(data)
+
+    async def sell_item(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        conf_id = self._next_id
+        self._next_id += 1
+        self._confirmations[conf_id] = form["assetid"]
+        return await self._respond(
+            "sellitem", {"success": 1, "needs_mobile_confirmation": True}
+        )
+
+    async def get_list(self, request: web.Request) -> web.Response:
+        conf = [
+            {"id": conf_id, "nonce": str(conf_id), "creator_id": conf_id}
+            for conf_id in self._confirmations
+        ]
+        return await self._respond("getlist", {"success": True, "conf": conf})
+
+    async def details(self, request: web.Request) -> web.Response:
+        asset_id = self._confirmations.get(int(request.match_info["conf_id"]))
+        return await self._respond(
+            "details",
+            {"success": asset_id is not None, "id": asset_id, "contextid": "2", "appid": 730},
+        )
+
+    async def ajaxop(self, request: web.Request) -> web.Response:
+        found = self._confirmations.pop(int(request.query["cid"]), None)
+        return await self._respond("ajaxop", {"success": found is not None})
+
+    async def multiajaxop(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        if self._random.random() < self.multi_failure_rate:
+            return await self._respond("multiajaxop", {"success": False})
+        for conf_id in form.getall("cid[]"):
+            self._confirmations.pop(int(conf_id), None)
+        return await self._respond("multiajaxop", {"success": True})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/market/sellitem/", self.sell_item)
+        app.router.add_get("/mobileconf/getlist", self.get_list)
+        app.router.add_get("/mobileconf/details/{conf_id}", self.details)
+        app.router.add_get("/mobileconf/ajaxop", self.ajaxop)
+        app.router.add_post("/mobileconf/multiajaxop", self.multiajaxop)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class MockSteamClient:
+    """
+    Implements the SteamClient methods sell_items_batch uses, with the same
+    request pattern as aiosteampy, against MockSteamServer.
+    """
+
+    username = "benchmark"
+
+    def __init__(self, session: aiohttp.ClientSession, url: str):
+        self.session = session
+        self.url = url
+
+    async def place_sell_listing(self, obj, price, app_context, confirm=True):
+        async with self.session.post(
+            f"{self.url}/market/sellitem/", data={"assetid": obj, "price": price}
+        ) as r:
+            rj = await r.json()
+        if rj.get("needs_mobile_confirmation") and confirm:
+            conf = await self.confirm_sell_listing(obj, app_context)
+            return conf.creator_id
+        return None
+
+    async def confirm_sell_listing(self, obj, app_context) -> Confirmation:
+        key = create_ident_code(obj, app_context.context, app_context.app.value)
+        confirmations = await self.get_confirmations()
+        conf = next(
+            (conf for conf in confirmations if conf.listing_item_ident_code == key), None
+        )
+        if conf is None:
+            raise KeyError(f"Unable to find confirmation for {key}")
+        await self.allow_confirmation(conf)
+        return conf
+
+    async def get_confirmations(self) -> list[Confirmation]:
+        async with self.session.get(f"{self.url}/mobileconf/getlist") as r:
+            rj = await r.json()
+        confirmations = []
+        for data in rj["conf"]:
+            conf = Confirmation(
+                id=data["id"],
+                nonce=data["nonce"],
+                creator_id=data["creator_id"],
+                creation_time=datetime.now(),
+                type=ConfirmationType.LISTING,
+                icon="",
+                multi=False,
+                headline="",
+                summary="",
+                warn=None,
+            )
+            # aiosteampy fetches details of every listing confirmation to map it to its item
+            async with self.session.get(
+                f"{self.url}/mobileconf/details/{conf.id}"
+            ) as r:
+                details = await r.json()
+            if details["success"]:
+                conf.details = details
+                confirmations.append(conf)
+        return confirmations
+
+    async def allow_confirmation(self, conf: Confirmation) -> None:
+        async with self.session.get(
+            f"{self.url}/mobileconf/ajaxop", params={"cid": conf.id, "ck": conf.nonce}
+        ) as r:
+            rj = await r.json()
+        if not rj["success"]:
+            raise RuntimeError("Failed to perform confirmation action")
+
+    async def allow_multiple_confirmations(self, confs: list[Confirmation]) -> None:
+        data = [("cid[]", str(conf.id)) for conf in confs]
+        data += [("ck[]", conf.nonce) for conf in confs]
+        async with self.session.post(
+            f"{self.url}/mobileconf/multiajaxop", data=data
+        ) as r:
+            rj = await r.json()
+        if not rj["success"]:
+            raise RuntimeError("Failed to perform action for multiple confirmations")
+
+
+async def _fixed_price(*args, **kwargs) -> float:
+    return 0.03
+
+
+async def _unit_rate(from_currency: str, to_currency: str) -> float:
+    return 1.0
+
+
+async def run_flow(batch_confirmations: bool, items: int) -> dict:
+    server = MockSteamServer(MOCK_LATENCY_MS, MOCK_MULTI_FAILURE_RATE)
+    await server.start()
+    try:
+        async with aiohttp.ClientSession(raise_for_status=True) as session:
+            client = MockSteamClient(session, server.url)
+            items_to_process = [
+                {"item": str(asset_id), "name": f"Item {asset_id}", "asset_id": str(asset_id)}
+                for asset_id in range(1, items + 1)
+            ]
+            lister.BATCH_CONFIRMATIONS = batch_confirmations
+            lister._listing_throughput.clear()
+
+            started = time.perf_counter()
+            await lister.sell_items_batch(
+                client, items_to_process, {"currency": "USD"}
+            )
+            elapsed = time.perf_counter() - started
+    finally:
+        await server.stop()
+
+    listed = lister._listing_throughput.get(client.username, {}).get("listed", 0)
+    return {
+        "flow": "batched" if batch_confirmations else "per listing",
+        "listed": listed,
+        "seconds": round(elapsed, 2),
+        "items_per_second": round(listed / elapsed, 2) if elapsed else 0.0,
+        "requests": sum(server.requests.values()),
+        "requests_by_endpoint": dict(server.requests),
+    }
+
+
+async def main() -> None:
+    # Only the confirmation flow is measured: prices are fixed, FX is skipped and
+    # the mock is not rate limited
+    lister.get_db_price = _fixed_price
+    lister.get_exchange_rate = _unit_rate
+    rate_limiter.limits = {}
+
+    results = [
+        await run_flow(batch_confirmations=False, items=BENCHMARK_ITEMS),
+        await run_flow(batch_confirmations=True, items=BENCHMARK_ITEMS),
+    ]
+    for result in results:
+        logger.info(f"Confirmation benchmark ({MOCK_LATENCY_MS} ms latency): {result}")
+
+    per_listing, batched = results
+    if batched["seconds"]:
+        logger.info(
+            f"Batched confirmations: {per_listing['seconds'] / batched['seconds']:.1f}x faster, "
+            f"{per_listing['requests'] - batched['requests']} fewer requests "
+            f"for {BENCHMARK_ITEMS} listings"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
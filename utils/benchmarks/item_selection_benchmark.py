@@ -0,0 +1,157 @@
+import sys
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+import math
+import random
+import time
+
+import utils.Steam_Items_Lister as lister
+
+# Solves synthetic inventories with both select_items_to_sell solvers, the exact
+# DP and CP-SAT, checks they reach the same total (the objective is the overshoot
+# over the target, so equal totals mean equal objectives) and logs both wall times.
+# Inventories above SELECTION_DP_MAX_STATES are only solved with CP-SAT, as
+# select_items_to_sell would.
+
+# (name, distinct prices, items per price, price range, target as a share of
+# the inventory value, MAX_ITEMS_LIMIT)
+SCENARIOS = (
+    ("cases, USD", 8, (20, 200), (0.03, 1.50), 0.3, 0),
+    ("cases, USD, item limit", 8, (20, 200), (0.03, 1.50), 0.3, 150),
+    ("mixed inventory, USD", 40, (1, 15), (0.03, 10.00), 0.5, 0),
+    ("mixed inventory, USD, item limit", 40, (1, 15), (0.03, 10.00), 0.5, 120),
+    ("cases, INR", 8, (20, 200), (2.50, 120.00), 0.1, 0),
+    ("large inventory, INR", 150, (1, 40), (2.50, 900.00), 0.6, 0),
+)
+RUNS_PER_SCENARIO = 3
+
+
+def make_inventory(
+    rng: random.Random,
+    prices: int,
+    items_per_price: tuple[int, int],
+    price_range: tuple[float, float],
+) -> dict:
+    """items_by_price as execute_selling builds it, with item ids as the items."""
+    items_by_price: dict = {}
+    next_id = 0
+    while len(items_by_price) < prices:
+        price = round(rng.uniform(*price_range), 2)
+        if price in items_by_price:
+            continue
+        count = rng.randint(*items_per_price)
+        items_by_price[price] = list(range(next_id, next_id + count))
+        next_id += count
+    return items_by_price
+
+
+def timed(solver, items_by_price: dict, target: float) -> tuple[list, float, str, float]:
+    started = time.perf_counter()
+    selected, total, status = solver(items_by_price, target)
+    return selected, total, status, time.perf_counter() - started
+
+
+def check_selection(items_by_price: dict, selected: list, total: float) -> bool:
+    """The selected items exist once each and add up to the reported total."""
+    price_by_item = {
+        item: price for price, items in items_by_price.items() for item in items
+    }
+    if len(set(selected)) != len(selected):
+        return False
+    cents = sum(round(price_by_item[item] * 100) for item in selected)
+    return cents == round(total * 100)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    mismatches = 0
+    unproven = 0
+
+    for name, prices, items_per_price, price_range, share, limit in SCENARIOS:
+        lister.MAX_ITEMS_LIMIT = limit
+        dp_seconds = 0.0
+        cp_sat_seconds = 0.0
+        dp_runs = 0
+        max_states = 0
+        for _ in range(RUNS_PER_SCENARIO):
+            items_by_price = make_inventory(rng, prices, items_per_price, price_range)
+            value = sum(price * len(items) for price, items in items_by_price.items())
+            target = round(value * share, 2)
+            states = lister._dp_state_space(
+                lister._price_groups(items_by_price),
+                int(math.ceil(target * lister.SELECTION_PRICE_SCALE)),
+            )
+            max_states = max(max_states, states)
+
+            cp_items, cp_total, cp_status, cp_time = timed(
+                lister.select_items_to_sell_cp_sat, items_by_price, target
+            )
+            cp_sat_seconds += cp_time
+            if states > lister.SELECTION_DP_MAX_STATES:
+                continue
+
+            dp_items, dp_total, dp_status, dp_time = timed(
+                lister.select_items_to_sell_dp, items_by_price, target
+            )
+            dp_seconds += dp_time
+            dp_runs += 1
+
+            if cp_status not in ("OPTIMAL", "INFEASIBLE"):
+                # CP-SAT hit its time limit, so there is no proven optimum to compare
+                unproven += 1
+                logger.warning(
+                    f"{name}: CP-SAT stopped with {cp_status} {cp_total} after "
+                    f"{cp_time:.1f}s, DP found {dp_status} {dp_total} in {dp_time * 1000:.1f} ms"
+                )
+            elif (
+                dp_status != cp_status
+                or round(dp_total * 100) != round(cp_total * 100)
+                or not check_selection(items_by_price, dp_items, dp_total)
+                or (limit and len(dp_items) > limit)
+            ):
+                mismatches += 1
+                logger.error(
+                    f"{name}: DP {dp_status} {dp_total} ({len(dp_items)} items), "
+                    f"CP-SAT {cp_status} {cp_total} ({len(cp_items)} items), target {target}"
+                )
+
+        cp_sat_ms = cp_sat_seconds / RUNS_PER_SCENARIO * 1000
+        if not dp_runs:
+            logger.info(
+                f"{name}: CP-SAT {cp_sat_ms:.1f} ms per inventory "
+                f"(DP skipped, up to {max_states} states)"
+            )
+            continue
+        dp_ms = dp_seconds / dp_runs * 1000
+        logger.info(
+            f"{name}: DP {dp_ms:.1f} ms, CP-SAT {cp_sat_ms:.1f} ms per inventory "
+            f"({cp_sat_ms / dp_ms if dp_ms else 0:.1f}x, up to {max_states} DP states)"
+        )
+
+    if mismatches:
+        logger.error(f"{mismatches} inventories solved differently by DP and CP-SAT")
+    else:
+        logger.success(
+            "DP and CP-SAT reached the same total on every inventory CP-SAT solved "
+            f"to optimality ({unproven} stopped at the CP-SAT time limit)"
+        )
+
+
+if __name__ == "__main__":
+    main()
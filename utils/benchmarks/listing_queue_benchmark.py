@@ -0,0 +1,147 @@
+import sys
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+import random
+import time
+from collections import Counter
+
+from utils.listing_queue import ListingWorkQueue
+
+# Compares the list based retry handling sell_items_batch used to have with
+# ListingWorkQueue. Both replay the same scripted run over BENCHMARK_ITEMS items,
+# where every attempt either lists the item or retries it to the back, to the
+# front or after a short delay, and the wall time of the queue operations is logged.
+
+BENCHMARK_ITEMS = 10_000
+# Chance that an attempt is retried instead of listed, and how the retries split
+RETRY_RATE = 0.3
+RETRY_KINDS = (("error", 0.5), ("pending_confirmation", 0.2), ("not_in_inventory", 0.3))
+# Retries wait this long before the item is ready again, e.g. "not listed" retries
+RETRY_DELAY_SECONDS = 0.0005
+MAX_RETRIES = 3
+
+
+def make_items(count: int) -> list[dict]:
+    return [
+        {"item": str(asset_id), "name": f"Item {asset_id}", "asset_id": str(asset_id)}
+        for asset_id in range(1, count + 1)
+    ]
+
+
+def make_script(count: int, seed: int = 0) -> dict[str, list[str | None]]:
+    """asset_id -> the retry reason of each attempt, None for the attempt that lists it."""
+    rng = random.Random(seed)
+    reasons = [reason for reason, _ in RETRY_KINDS]
+    weights = [weight for _, weight in RETRY_KINDS]
+    script = {}
+    for asset_id in range(1, count + 1):
+        attempts = []
+        while len(attempts) < MAX_RETRIES and rng.random() < RETRY_RATE:
+            attempts.append(rng.choices(reasons, weights)[0])
+        attempts.append(None)
+        script[str(asset_id)] = attempts
+    return script
+
+
+def run_list(items: list[dict], script: dict[str, list[str | None]]) -> dict:
+    """The old way: a plain list, a side list of delayed items and a counter dict."""
+    items_to_process = list(items)
+    delayed: list[tuple[float, dict]] = []
+    retry_count: dict = {}
+    reasons: Counter = Counter()
+    listed = 0
+
+    while items_to_process or delayed:
+        now = time.monotonic()
+        for entry in [entry for entry in delayed if entry[0] <= now]:
+            delayed.remove(entry)
+            items_to_process.append(entry[1])
+        if not items_to_process:
+            continue
+
+        item_data = items_to_process.pop(0)
+        asset_id = item_data["asset_id"]
+        attempt = retry_count.get(asset_id, 0)
+        reason = script[asset_id][attempt]
+        if reason is None:
+            retry_count.pop(asset_id, None)
+            listed += 1
+            continue
+
+        retry_count[asset_id] = attempt + 1
+        reasons[reason] += 1
+        # The item must not be queued twice
+        if item_data in items_to_process:
+            items_to_process.remove(item_data)
+        if reason == "pending_confirmation":
+            items_to_process.insert(0, item_data)
+        elif reason == "not_in_inventory":
+            delayed.append((now + RETRY_DELAY_SECONDS, item_data))
+        else:
+            items_to_process.append(item_data)
+
+    return {"listed": listed, "retries": dict(reasons)}
+
+
+def run_queue(items: list[dict], script: dict[str, list[str | None]]) -> dict:
+    queue = ListingWorkQueue(items)
+
+    while len(queue):
+        item_data = queue.pop()
+        if item_data is None:
+            continue
+
+        asset_id = item_data["asset_id"]
+        reason = script[asset_id][queue.retries(asset_id)]
+        if reason is None:
+            queue.finish(asset_id, "listed")
+        elif reason == "pending_confirmation":
+            queue.retry(asset_id, reason, front=True)
+        elif reason == "not_in_inventory":
+            queue.retry(asset_id, reason, delay=RETRY_DELAY_SECONDS)
+        else:
+            queue.retry(asset_id, reason)
+
+    return {"listed": queue.outcomes["listed"], "retries": dict(queue.retry_reasons)}
+
+
+def main() -> None:
+    items = make_items(BENCHMARK_ITEMS)
+    script = make_script(BENCHMARK_ITEMS)
+    attempts = sum(len(attempts) for attempts in script.values())
+
+    results = {}
+    for name, run in (("list", run_list), ("ListingWorkQueue", run_queue)):
+        started = time.perf_counter()
+        result = run(items, script)
+        elapsed = time.perf_counter() - started
+        results[name] = elapsed
+        logger.info(
+            f"{name}: {elapsed * 1000:.1f} ms for {attempts} attempts on "
+            f"{BENCHMARK_ITEMS} items ({elapsed / attempts * 1e6:.2f} us/attempt), {result}"
+        )
+
+    if results["ListingWorkQueue"]:
+        logger.info(
+            f"ListingWorkQueue: {results['list'] / results['ListingWorkQueue']:.1f}x faster"
+        )
+
+
+if __name__ == "__main__":
+    main()
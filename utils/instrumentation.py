@@ -0,0 +1,284 @@
+import bisect
+import contextvars
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable
+
+import aiohttp
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+
+INSTRUMENTATION_ENABLED = _config.get("INSTRUMENTATION_ENABLED", False)
+INSTRUMENTATION_DIR = _config.get(
+    "INSTRUMENTATION_DIR",
+    r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\utils\cache\logs\instrumentation",
+)
+
+# Upper bounds of the latency histogram buckets in milliseconds, the last bucket is open
+_BUCKET_BOUNDS_MS = (
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    30000,
+    60000,
+)
+
+# Name of the Steam call the current task is making, so transferred bytes can be
+# attributed to it from the aiohttp trace callbacks
+_current_call: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "instrumented_call", default=None
+)
+
+
+# Set while an instrument_functions() wrapper is timing a call, so helpers it
+# calls are not timed again and their time is not counted twice
+_in_instrumented_function: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "in_instrumented_function", default=False
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, total and max, cheap enough for every call."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(_BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.buckets[bisect.bisect_left(_BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, fraction: float) -> float | None:
+        """Upper bound (ms) of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return (
+                    _BUCKET_BOUNDS_MS[index]
+                    if index < len(_BUCKET_BOUNDS_MS)
+                    else round(self.max, 1)
+                )
+        return round(self.max, 1)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 1),
+            "mean_ms": round(self.total / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max, 1),
+            "buckets_ms": {
+                (
+                    f"<={_BUCKET_BOUNDS_MS[index]}"
+                    if index < len(_BUCKET_BOUNDS_MS)
+                    else f">{_BUCKET_BOUNDS_MS[-1]}"
+                ): count
+                for index, count in enumerate(self.buckets)
+                if count
+            },
+        }
+
+
+class Instrumentation:
+    """
+    Process-wide timers and counters for the hot paths of a run.
+
+    Timers are latency histograms keyed by name (e.g. "steam.get_item_orders_histogram",
+    "db.price_store.read_prices"), counters are plain integers (retries, errors,
+    bytes, cache tiers). Counter names ending in ".hit" and ".miss" are turned into
+    hit ratios in the snapshot. When disabled, timed() returns a shared no-op
+    context manager, count() and observe() return at once, and instrument_functions()
+    leaves functions unwrapped, so the hot paths pay one attribute check at most.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.started = time.time()
+        self._timers: dict[str, LatencyHistogram] = {}
+        self._counters: dict[str, int] = {}
+
+    def observe(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = LatencyHistogram()
+        timer.observe(seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if not self.enabled:
+            return
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    @contextmanager
+    def _timed(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def timed(self, name: str):
+        """Context manager recording the time spent in its block under `name`."""
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name)
+
+    def call(self, name: str) -> contextvars.Token | None:
+        """Marks the current task as making Steam call `name` until reset_call() is called."""
+        if not self.enabled:
+            return None
+        return _current_call.set(name)
+
+    def reset_call(self, token: contextvars.Token | None) -> None:
+        if token is not None:
+            _current_call.reset(token)
+
+    def instrument_functions(self, namespace: dict[str, Any], prefix: str) -> None:
+        """
+        Wraps the public functions defined in a module (pass its globals()) so
+        each call is timed as "<prefix>.<function name>". Only the outermost
+        wrapped call is timed: helpers called from another wrapped function (e.g.
+        connect() inside read_prices()) count towards the caller, so totals such
+        as db_total_ms are not inflated. Does nothing when disabled.
+        """
+        if not self.enabled:
+            return
+        module = namespace.get("__name__")
+        for attr, value in list(namespace.items()):
+            if (
+                attr.startswith("_")
+                or not callable(value)
+                or not hasattr(value, "__code__")
+                or value.__module__ != module
+            ):
+                continue
+            namespace[attr] = self._wrap(f"{prefix}.{attr}", value)
+
+    def _wrap(self, name: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _in_instrumented_function.get():
+                return func(*args, **kwargs)
+            token = _in_instrumented_function.set(True)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter() - started)
+                _in_instrumented_function.reset(token)
+
+        return wrapper
+
+    def trace_configs(self) -> list:
+        """aiohttp TraceConfigs counting bytes sent and received per Steam call, empty when disabled."""
+        if not self.enabled:
+            return []
+
+        async def on_request_chunk_sent(session, context, params):
+            call = _current_call.get() or "other"
+            self.count(f"bytes_sent.{call}", len(params.chunk))
+
+        async def on_response_chunk_received(session, context, params):
+            call = _current_call.get() or "other"
+            self.count(f"bytes_received.{call}", len(params.chunk))
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_chunk_sent.append(on_request_chunk_sent)
+        trace_config.on_response_chunk_received.append(on_response_chunk_received)
+        return [trace_config]
+
+    def snapshot(self) -> dict[str, Any]:
+        counters = dict(sorted(self._counters.items()))
+        hit_ratios = {}
+        for name, hits in counters.items():
+            if not name.endswith(".hit"):
+                continue
+            prefix = name[: -len(".hit")]
+            lookups = hits + counters.get(f"{prefix}.miss", 0)
+            if lookups:
+                hit_ratios[prefix] = round(hits / lookups, 4)
+
+        timers = {
+            name: timer.summary() for name, timer in sorted(self._timers.items())
+        }
+        db_ms = sum(
+            timer["total_ms"] for name, timer in timers.items() if name.startswith("db.")
+        )
+        return {
+            "enabled": self.enabled,
+            "started": int(self.started),
+            "elapsed_seconds": round(time.time() - self.started, 1),
+            "db_total_ms": round(db_ms, 1),
+            "hit_ratios": hit_ratios,
+            "counters": counters,
+            "timers": timers,
+        }
+
+    def dump(self, label: str) -> str | None:
+        """Writes the snapshot to INSTRUMENTATION_DIR/<label>-<unix time>.json and returns the path."""
+        if not self.enabled:
+            return None
+        path = os.path.join(INSTRUMENTATION_DIR, f"{label}-{int(time.time())}.json")
+        try:
+            os.makedirs(INSTRUMENTATION_DIR, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to write instrumentation dump: {e}")
+            return None
+        logger.info(f"Instrumentation written to {path}")
+        return path
+
+
+instrumentation = Instrumentation(INSTRUMENTATION_ENABLED)
+
+
+def dump_instrumentation(label: str) -> str | None:
+    """Writes the timers and counters collected so far as JSON, if instrumentation is enabled."""
+    return instrumentation.dump(label)
+
+
+def get_instrumentation_snapshot() -> dict[str, Any]:
+    return instrumentation.snapshot()
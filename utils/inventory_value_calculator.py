@@ -15,6 +15,8 @@ _config = load_config()
 ROOT_DIR = _config["ROOT_DIR"]
 sys.path.insert(0, ROOT_DIR)
 from database import (
+    close_client_pool,
+    close_public_client_pool,
     convert,
     get_account_inventory_database,
     get_all_steam_accounts,
@@ -22,84 +24,92 @@ from database import (
     update_account_inventory_value,
     update_prices_from_market,
 )
+from utils.instrumentation import dump_instrumentation
 from utils.items_data_updater import update_items
 from utils.logger import get_custom_logger
+from utils.proxy import close_proxy_pool
 
 logger = get_custom_logger()
 
 
 async def value_calculator(steam_username=None) -> bool:
-    all_accounts = get_all_steam_accounts()
-
-    if steam_username:
-        # This block handles calculation for a single specified user
-        total_value = 0
-        await update_items(steam_usernames=[steam_username])
-        inv = get_account_inventory_database(steam_username)
-        items = list(inv.keys())
-
-        if items:
-            await update_prices_from_market(
-                items_by_currency={"USD": items},
-                override_armoury_only=True,
-                update_prices_in_usd=True,
-            )
-            for item_name, quantity in inv.items():
-                item_price = await get_db_price(item_name, currency="USD")
-                total_value += item_price * quantity
-
-        # Convert USD to INR and display with ₹ symbol
-        converted_value = await convert("USD", "INR", total_value)
-
-        print("\n\n\n")
-        logger.info(
-            f"Account {steam_username} inventory value with steam tax: ₹{converted_value:.2f}"
-        )
-        update_account_inventory_value(steam_username, converted_value)
-
-    else:
-        selected_accounts = [acc for acc in all_accounts if acc["prime"]]
-        print("\n")
-        logger.info(
-            f"Fetching inventory values for {len(selected_accounts)} specified prime accounts..."
-        )
+    try:
+        all_accounts = get_all_steam_accounts()
 
-        # await update_items()
-
-        for acc in selected_accounts:
+        if steam_username:
+            # This block handles calculation for a single specified user
             total_value = 0
-            current_username = acc["steam_username"]
-
-            inv = get_account_inventory_database(current_username)
+            await update_items(steam_usernames=[steam_username])
+            inv = get_account_inventory_database(steam_username)
             items = list(inv.keys())
 
-            if not items:
-                logger.info(
-                    f"Account {current_username} has an empty inventory. Skipping."
+            if items:
+                await update_prices_from_market(
+                    items_by_currency={"USD": items},
+                    override_armoury_only=True,
+                    update_prices_in_usd=True,
                 )
-                update_account_inventory_value(current_username, 0)
-                continue
-
-            await update_prices_from_market(
-                items_by_currency={"USD": items},
-                override_armoury_only=True,
-                update_prices_in_usd=True,
-            )
-
-            for item_name, quantity in inv.items():
-                item_price = await get_db_price(item_name, currency="USD")
-                total_value += item_price * quantity
+                for item_name, quantity in inv.items():
+                    item_price = await get_db_price(item_name, currency="USD")
+                    total_value += item_price * quantity
 
             # Convert USD to INR and display with ₹ symbol
-
             converted_value = await convert("USD", "INR", total_value)
+
             print("\n\n\n")
             logger.info(
-                f"Account {current_username} inventory value: ₹{converted_value:.2f}"
+                f"Account {steam_username} inventory value with steam tax: ₹{converted_value:.2f}"
             )
-            update_account_inventory_value(current_username, converted_value)
+            update_account_inventory_value(steam_username, converted_value)
 
-    return True
+        else:
+            selected_accounts = [acc for acc in all_accounts if acc["prime"]]
+            print("\n")
+            logger.info(
+                f"Fetching inventory values for {len(selected_accounts)} specified prime accounts..."
+            )
+
+            # await update_items()
+
+            for acc in selected_accounts:
+                total_value = 0
+                current_username = acc["steam_username"]
+
+                inv = get_account_inventory_database(current_username)
+                items = list(inv.keys())
+
+                if not items:
+                    logger.info(
+                        f"Account {current_username} has an empty inventory. Skipping."
+                    )
+                    update_account_inventory_value(current_username, 0)
+                    continue
+
+                await update_prices_from_market(
+                    items_by_currency={"USD": items},
+                    override_armoury_only=True,
+                    update_prices_in_usd=True,
+                )
+
+                for item_name, quantity in inv.items():
+                    item_price = await get_db_price(item_name, currency="USD")
+                    total_value += item_price * quantity
+
+                # Convert USD to INR and display with ₹ symbol
+
+                converted_value = await convert("USD", "INR", total_value)
+                print("\n\n\n")
+                logger.info(
+                    f"Account {current_username} inventory value: ₹{converted_value:.2f}"
+                )
+                update_account_inventory_value(current_username, converted_value)
+
+        dump_instrumentation("value_calculator")
+        return True
+    finally:
+        await close_client_pool()
+        await close_public_client_pool()
+        await close_proxy_pool()
 
 
 if __name__ == "__main__":
@@ -18,12 +18,17 @@ _config = load_config()
 ROOT_DIR = _config["ROOT_DIR"]
 sys.path.insert(0, ROOT_DIR)
 from database import (
+    close_client_pool,
+    close_public_client_pool,
     get_all_steam_accounts,
     get_client,
     get_full_inventory,
     refresh_items_database,
+    release_client,
 )
+from utils.instrumentation import dump_instrumentation
 from utils.logger import get_custom_logger
+from utils.proxy import close_proxy_pool
 
 logger = get_custom_logger()
 
@@ -174,6 +179,8 @@ async def process_account(account) -> tuple[str, bool]:
         logger.error(f"Failed to get inventory for {username}: {e}")
 
         return username, False
+    finally:
+        release_client(client)
 
     success = process_inventory(inv, username)
     return username, success
@@ -192,56 +199,64 @@ async def update_items(
         account_processing_concurrency (int, optional): Number of accounts to process concurrently.
                                                         Defaults to ACCOUNT_PROCESSING_SEMAPHORE.
     """
-    user_agents = UserAgentsService()
-    await user_agents.load()
-    all_accounts = get_all_steam_accounts()
-
-    # Filter accounts based on steam_usernames or get all prime accounts
-    if steam_usernames:
-        selected_accounts = [
-            acc
-            for acc in all_accounts
-            if acc["steam_username"] in steam_usernames and acc["prime"]
+    try:
+        user_agents = UserAgentsService()
+        await user_agents.load()
+        all_accounts = get_all_steam_accounts()
+
+        # Filter accounts based on steam_usernames or get all prime accounts
+        if steam_usernames:
+            selected_accounts = [
+                acc
+                for acc in all_accounts
+                if acc["steam_username"] in steam_usernames and acc["prime"]
+            ]
+            print("\n")
+            logger.info(
+                f"Fetching inventory data for {len(selected_accounts)} specified prime accounts..."
+            )
+        else:
+            selected_accounts = [acc for acc in all_accounts if acc["prime"]]
+            print("\n")
+            logger.info(f"Processing all {len(selected_accounts)} prime accounts...")
+
+        # Create semaphore to limit concurrent processing
+        semaphore = asyncio.Semaphore(account_processing_concurrency)
+
+        async def process_account_with_semaphore(account) -> tuple[str, bool]:
+            async with semaphore:
+                logger.info(f"Processing {account['steam_username']}...")
+                return await process_account(account)
+
+        # Create tasks for all accounts
+        tasks = [
+            process_account_with_semaphore(account) for account in selected_accounts
         ]
-        print("\n")
-        logger.info(
-            f"Fetching inventory data for {len(selected_accounts)} specified prime accounts..."
-        )
-    else:
-        selected_accounts = [acc for acc in all_accounts if acc["prime"]]
-        print("\n")
-        logger.info(f"Processing all {len(selected_accounts)} prime accounts...")
-
-    # Create semaphore to limit concurrent processing
-    semaphore = asyncio.Semaphore(account_processing_concurrency)
-
-    async def process_account_with_semaphore(account) -> tuple[str, bool]:
-        async with semaphore:
-            logger.info(f"Processing {account['steam_username']}...")
-            return await process_account(account)
-
-    # Create tasks for all accounts
-    tasks = [process_account_with_semaphore(account) for account in selected_accounts]
-
-    # Process tasks with progress bar
-    results = []
-    failed_accounts = []
-    for future in tqdm_asyncio.as_completed(tasks, total=len(tasks)):
-        username, success = await future
-        results.append(success)
-        if not success:
-            failed_accounts.append(username)
-
-    # Log success or error based on results
-    if all(results):
-        logger.success("All accounts processed successfully.")
-    else:
-        failed_count = len(failed_accounts)
-        logger.error(f"{failed_count} account(s) failed to process.")
-        for username in failed_accounts:
-            logger.warning(f"Failed account: {username}")
-
-    return all(results)
+
+        # Process tasks with progress bar
+        results = []
+        failed_accounts = []
+        for future in tqdm_asyncio.as_completed(tasks, total=len(tasks)):
+            username, success = await future
+            results.append(success)
+            if not success:
+                failed_accounts.append(username)
+
+        # Log success or error based on results
+        if all(results):
+            logger.success("All accounts processed successfully.")
+        else:
+            failed_count = len(failed_accounts)
+            logger.error(f"{failed_count} account(s) failed to process.")
+            for username in failed_accounts:
+                logger.warning(f"Failed account: {username}")
+
+        dump_instrumentation("update_items")
+        return all(results)
+    finally:
+        await close_client_pool()
+        await close_public_client_pool()
+        await close_proxy_pool()
 
 
 if __name__ == "__main__":
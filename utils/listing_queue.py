@@ -0,0 +1,198 @@
+import heapq
+import itertools
+import sys
+import time
+from collections import Counter, deque
+from typing import Any
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+
+class _Entry:
+    __slots__ = ("item_data", "retries", "reasons", "not_before", "state", "ticket")
+
+    def __init__(self, item_data: Any):
+        self.item_data = item_data
+        self.retries = 0
+        # reason -> how often this item was retried for it
+        self.reasons: Counter = Counter()
+        self.not_before = 0.0
+        # "ready", "delayed" or "active" (taken by a worker)
+        self.state = "ready"
+        # Bumped on every re-enqueue, so stale deque and heap positions are skipped
+        self.ticket = 0
+
+
+class ListingWorkQueue:
+    """
+    Work queue of items to list, indexed by asset_id.
+
+    Ready items sit in a deque of (asset_id, ticket) and items retried with a
+    delay sit in a heap ordered by their not-before time. The entries
+    themselves (item, retry counts per reason, state) live in a dict keyed by
+    asset_id. Every operation is O(1) except delayed re-enqueues, which are
+    O(log n). An item is moved by giving it a new ticket and pushing it again,
+    so positions it left behind are skipped when they come up instead of being
+    searched for and removed. Retries and final outcomes are counted per reason.
+    """
+
+    def __init__(self, items: list | None = None):
+        self._entries: dict[Any, _Entry] = {}
+        self._ready: deque[tuple[Any, int]] = deque()
+        self._delayed: list[tuple[float, int, Any, int]] = []
+        self._sequence = itertools.count()
+        self.active = 0
+        self.delayed = 0
+        self.retry_reasons: Counter = Counter()
+        self.outcomes: Counter = Counter()
+        for item_data in items or []:
+            self.push(item_data)
+
+    @staticmethod
+    def asset_id_of(item_data: Any) -> Any:
+        if isinstance(item_data, dict):
+            return item_data["asset_id"]
+        return item_data.asset_id
+
+    def __len__(self) -> int:
+        """Items queued or being worked on."""
+        return len(self._entries)
+
+    def __contains__(self, asset_id: Any) -> bool:
+        return asset_id in self._entries
+
+    def get(self, asset_id: Any) -> Any | None:
+        entry = self._entries.get(asset_id)
+        return entry.item_data if entry is not None else None
+
+    def push(self, item_data: Any) -> None:
+        """Adds a new item at the back. Items already queued are left where they are."""
+        asset_id = self.asset_id_of(item_data)
+        if asset_id in self._entries:
+            return
+        entry = _Entry(item_data)
+        self._entries[asset_id] = entry
+        self._ready.append((asset_id, entry.ticket))
+
+    def _promote_due(self, now: float) -> None:
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, asset_id, ticket = heapq.heappop(self._delayed)
+            entry = self._entries.get(asset_id)
+            if entry is not None and entry.ticket == ticket:
+                self._leave(entry)
+                entry.state = "ready"
+                self._ready.append((asset_id, ticket))
+
+    def pop(self) -> Any | None:
+        """Takes the next ready item for a worker, or returns None if none is ready."""
+        self._promote_due(time.monotonic())
+        while self._ready:
+            asset_id, ticket = self._ready.popleft()
+            entry = self._entries.get(asset_id)
+            if entry is None or entry.ticket != ticket or entry.state != "ready":
+                continue
+            entry.state = "active"
+            self.active += 1
+            return entry.item_data
+        return None
+
+    def _leave(self, entry: _Entry) -> None:
+        """Updates the counters for an entry leaving its current state."""
+        if entry.state == "active":
+            self.active -= 1
+        elif entry.state == "delayed":
+            self.delayed -= 1
+
+    def retry(
+        self,
+        asset_id: Any,
+        reason: str,
+        delay: float = 0.0,
+        front: bool = False,
+    ) -> None:
+        """
+        Puts an item back for another attempt: at the back (or the front), or
+        once `delay` seconds have passed.
+        """
+        entry = self._entries.get(asset_id)
+        if entry is None:
+            return
+        self._leave(entry)
+        entry.retries += 1
+        entry.reasons[reason] += 1
+        self.retry_reasons[reason] += 1
+        entry.ticket += 1
+
+        if delay > 0:
+            entry.state = "delayed"
+            self.delayed += 1
+            entry.not_before = time.monotonic() + delay
+            heapq.heappush(
+                self._delayed,
+                (entry.not_before, next(self._sequence), asset_id, entry.ticket),
+            )
+            return
+
+        entry.state = "ready"
+        if front:
+            self._ready.appendleft((asset_id, entry.ticket))
+        else:
+            self._ready.append((asset_id, entry.ticket))
+
+    def finish(self, asset_id: Any, outcome: str) -> None:
+        """Removes an item for good, counting why (e.g. "listed", "sold", "gave_up")."""
+        entry = self._entries.pop(asset_id, None)
+        if entry is None:
+            return
+        self._leave(entry)
+        self.outcomes[outcome] += 1
+
+    def retries(self, asset_id: Any, reason: str | None = None) -> int:
+        """How often an item was retried, in total or for one reason."""
+        entry = self._entries.get(asset_id)
+        if entry is None:
+            return 0
+        return entry.retries if reason is None else entry.reasons[reason]
+
+    def has_waiting(self) -> bool:
+        """True if items are ready or delayed, i.e. not everything is taken or finished."""
+        return len(self._entries) > self.active
+
+    def next_ready_in(self) -> float | None:
+        """Seconds until the next item is ready: 0 if one is, None if nothing is waiting."""
+        now = time.monotonic()
+        self._promote_due(now)
+        if len(self._entries) > self.active + self.delayed:
+            return 0.0
+        # Drop heap positions of items that were moved or finished since
+        while self._delayed:
+            _, _, asset_id, ticket = self._delayed[0]
+            entry = self._entries.get(asset_id)
+            if entry is not None and entry.ticket == ticket:
+                return max(0.0, self._delayed[0][0] - now)
+            heapq.heappop(self._delayed)
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ready": len(self._entries) - self.active - self.delayed,
+            "delayed": self.delayed,
+            "active": self.active,
+            "retries": dict(self.retry_reasons),
+            "outcomes": dict(self.outcomes),
+        }
@@ -4,3 +4,15 @@ from .proxy_generator import (
 from .proxy_generator import (
     generate_proxy as generate_proxy,
 )
+from .proxy_pool import (
+    close_proxy_pool as close_proxy_pool,
+)
+from .proxy_pool import (
+    get_proxy_pool_stats as get_proxy_pool_stats,
+)
+from .proxy_pool import (
+    proxy_pool as proxy_pool,
+)
+from .proxy_pool import (
+    redact_proxy as redact_proxy,
+)
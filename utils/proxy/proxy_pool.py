@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import sys
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import aiohttp
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from utils.logger import get_custom_logger
+from utils.proxy.proxy_generator import generate_proxies
+
+logger = get_custom_logger()
+
+
+PROXY_POOL_SIZE = _config.get("PROXY_POOL_SIZE", 50)
+PROXY_SESSION_MINUTES = _config.get("PROXY_SESSION_MINUTES", 20)
+PROXY_MAX_CONNECTIONS = _config.get("PROXY_MAX_CONNECTIONS", 8)
+PROXY_RETIRE_MIN_REQUESTS = _config.get("PROXY_RETIRE_MIN_REQUESTS", 10)
+PROXY_RETIRE_ERROR_RATE = _config.get("PROXY_RETIRE_ERROR_RATE", 0.5)
+PROXY_RETIRE_THROTTLE_RATE = _config.get("PROXY_RETIRE_THROTTLE_RATE", 0.2)
+
+# Stop handing out a proxy this long before its sticky session runs out
+_EXPIRY_MARGIN_SECONDS = 60
+# Weight of the newest sample in the latency moving average
+_LATENCY_ALPHA = 0.2
+
+
+class ProxyEntry:
+    """One sticky proxy session and what has been observed through it."""
+
+    def __init__(self, url: str, lifetime_seconds: float):
+        self.url = url
+        self.expires_at = time.time() + lifetime_seconds
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.latency: float | None = None
+        self.retired = False
+        self.accounts: set[str] = set()
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    @property
+    def throttle_rate(self) -> float:
+        return self.throttled / self.requests if self.requests else 0.0
+
+    def usable(self, now: float) -> bool:
+        return not self.retired and now < self.expires_at - _EXPIRY_MARGIN_SECONDS
+
+    def score(self) -> float:
+        """Lower is better: failure rates first, then latency, then how many accounts share it."""
+        return (
+            self.error_rate
+            + 2 * self.throttle_rate
+            + (self.latency or 0) / 10
+            + 0.01 * len(self.accounts)
+        )
+
+
+class ProxyPool:
+    """
+    Pre-generated sticky proxy sessions with per-proxy health tracking.
+
+    Accounts are pinned to one proxy until its session expires or it is retired
+    for a high error or 429 rate, so an account keeps the same exit IP. Sessions
+    created for a proxy share one connector, which caps open connections per
+    proxy at max_connections and keeps them alive between requests. Once a proxy
+    expires or is retired its connector stops being handed out and is closed as
+    soon as every session created on it is closed.
+    """
+
+    def __init__(self, size: int, session_minutes: int, max_connections: int):
+        self.size = size
+        self.session_minutes = session_minutes
+        self.max_connections = max_connections
+        self._entries: dict[str, ProxyEntry] = {}
+        self._pins: dict[str, str] = {}
+        # proxy url -> (shared connector, event loop it was created on)
+        self._connectors: dict[
+            str, tuple[aiohttp.TCPConnector, asyncio.AbstractEventLoop]
+        ] = {}
+        # Sessions created on each connector, to know when it can be closed
+        self._sessions: dict[aiohttp.TCPConnector, weakref.WeakSet] = {}
+        # Connectors of expired or retired proxies waiting for their sessions to close
+        self._draining: list[aiohttp.TCPConnector] = []
+        self.retired_count = 0
+        self.connectors_closed = 0
+
+    def _replenish(self) -> None:
+        now = time.time()
+        for url in [url for url, entry in self._entries.items() if not entry.usable(now)]:
+            entry = self._entries.pop(url)
+            # Sessions already using it keep their connector; new ones get another proxy
+            self._retire_connector(url)
+            for account in entry.accounts:
+                self._pins.pop(account, None)
+        self._close_drained()
+
+        missing = self.size - len(self._entries)
+        if missing > 0:
+            lifetime = self.session_minutes * 60
+            for url in generate_proxies(
+                num_proxies=missing, session_time=self.session_minutes
+            ):
+                self._entries[url] = ProxyEntry(url, lifetime)
+
+    def acquire(self, account: str | None = None, exclude: str | None = None) -> str:
+        """
+        Returns a proxy URL. An account gets its pinned proxy while it is healthy,
+        otherwise the best scoring proxy, which it is then pinned to.
+        """
+        self._replenish()
+
+        if account is not None:
+            pinned = self._entries.get(self._pins.get(account))
+            if pinned is not None and pinned.url != exclude:
+                return pinned.url
+
+        candidates = [
+            entry for url, entry in self._entries.items() if url != exclude
+        ] or list(self._entries.values())
+        entry = min(candidates, key=ProxyEntry.score)
+
+        if account is not None:
+            previous = self._entries.get(self._pins.get(account))
+            if previous is not None:
+                previous.accounts.discard(account)
+            entry.accounts.add(account)
+            self._pins[account] = entry.url
+        return entry.url
+
+    def connector(self, proxy: str) -> aiohttp.TCPConnector:
+        """Shared keep-alive connector for every session that goes through this proxy."""
+        loop = asyncio.get_running_loop()
+        current = self._connectors.get(proxy)
+        if current is not None:
+            connector, connector_loop = current
+            if not connector.closed and connector_loop is loop:
+                return connector
+            if connector_loop is not loop:
+                # Its loop is gone along with the connections, nothing left to close
+                self._connectors.pop(proxy)
+                self._sessions.pop(connector, None)
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        self._connectors[proxy] = (connector, loop)
+        self._sessions[connector] = weakref.WeakSet()
+        return connector
+
+    def session(self, proxy: str, **kwargs) -> aiohttp.ClientSession:
+        """A session on the proxy's shared connector, tracked so the connector is closed after it."""
+        connector = self.connector(proxy)
+        session = aiohttp.ClientSession(
+            connector=connector, connector_owner=False, **kwargs
+        )
+        self._sessions[connector].add(session)
+        return session
+
+    def _retire_connector(self, proxy: str) -> None:
+        current = self._connectors.pop(proxy, None)
+        if current is not None and not current[0].closed:
+            self._draining.append(current[0])
+
+    def _close_drained(self) -> None:
+        """Closes retired connectors that no open session uses anymore."""
+        if not self._draining:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Closing needs the loop, the next call from it will close them
+            return
+        still_used = []
+        for connector in self._draining:
+            sessions = self._sessions.get(connector, ())
+            if any(not session.closed for session in sessions):
+                still_used.append(connector)
+                continue
+            self._sessions.pop(connector, None)
+            if not connector.closed:
+                asyncio.ensure_future(_close_connector(connector))
+                self.connectors_closed += 1
+        self._draining = still_used
+
+    def record(
+        self,
+        proxy: str,
+        latency: float | None = None,
+        error: bool = False,
+        throttled: bool = False,
+    ) -> None:
+        """Records the outcome of one request through a proxy, retiring it if it keeps failing."""
+        entry = self._entries.get(proxy)
+        if entry is None:
+            return
+
+        entry.requests += 1
+        entry.errors += error
+        entry.throttled += throttled
+        if latency is not None:
+            entry.latency = (
+                latency
+                if entry.latency is None
+                else (1 - _LATENCY_ALPHA) * entry.latency + _LATENCY_ALPHA * latency
+            )
+
+        if not entry.retired and entry.requests >= PROXY_RETIRE_MIN_REQUESTS and (
+            entry.error_rate > PROXY_RETIRE_ERROR_RATE
+            or entry.throttle_rate > PROXY_RETIRE_THROTTLE_RATE
+        ):
+            entry.retired = True
+            self.retired_count += 1
+            logger.warning(
+                f"Retiring proxy session after {entry.requests} requests "
+                f"(error rate {entry.error_rate:.0%}, 429 rate {entry.throttle_rate:.0%})"
+            )
+
+    async def close(self) -> None:
+        """Closes the connectors of every proxy, for use at the end of a run once its sessions are closed."""
+        connectors = [connector for connector, _ in self._connectors.values()]
+        connectors += self._draining
+        self._connectors.clear()
+        self._sessions.clear()
+        self._draining = []
+        for connector in connectors:
+            if not connector.closed:
+                await _close_connector(connector)
+                self.connectors_closed += 1
+
+    def stats(self) -> dict[str, int | float | None]:
+        self._close_drained()
+        entries = list(self._entries.values())
+        latencies = [entry.latency for entry in entries if entry.latency is not None]
+        return {
+            "proxies": len(entries),
+            "pinned_accounts": len(self._pins),
+            "retired": self.retired_count,
+            "connectors_draining": len(self._draining),
+            "connectors_closed": self.connectors_closed,
+            "requests": sum(entry.requests for entry in entries),
+            "errors": sum(entry.errors for entry in entries),
+            "throttled": sum(entry.throttled for entry in entries),
+            "avg_latency": round(sum(latencies) / len(latencies), 3)
+            if latencies
+            else None,
+        }
+
+
+def redact_proxy(proxy: str) -> str:
+    """
+    host:port of a proxy URL for logs and stats, without its credentials. Sticky
+    sessions share the gateway's host:port, so a short hash of the credentials
+    keeps them apart.
+    """
+    parts = urlsplit(proxy)
+    label = f"{parts.hostname}:{parts.port}" if parts.port else str(parts.hostname)
+    if parts.username or parts.password:
+        credentials = f"{parts.username}:{parts.password}".encode()
+        label += f"#{hashlib.sha256(credentials).hexdigest()[:8]}"
+    return label
+
+
+async def _close_connector(connector: aiohttp.TCPConnector) -> None:
+    try:
+        await connector.close()
+    except Exception as e:
+        logger.warning(f"Failed to close proxy connector: {e}")
+
+
+proxy_pool = ProxyPool(PROXY_POOL_SIZE, PROXY_SESSION_MINUTES, PROXY_MAX_CONNECTIONS)
+
+
+def get_proxy_pool_stats() -> dict[str, int | float | None]:
+    return proxy_pool.stats()
+
+
+async def close_proxy_pool() -> None:
+    """Closes every proxy connector, for use at the end of a run."""
+    await proxy_pool.close()
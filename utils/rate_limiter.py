@@ -0,0 +1,224 @@
+import asyncio
+import re
+import sys
+import time
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+from aiosteampy.exceptions import RateLimitExceeded
+
+from utils.logger import get_custom_logger
+
+logger = get_custom_logger()
+
+
+# Requests per second and burst size allowed per account or proxy for each endpoint class
+DEFAULT_RATE_LIMITS = {
+    "histogram": {"rate": 2.0, "burst": 4},
+    "search": {"rate": 0.3, "burst": 2},
+    "inventory": {"rate": 0.5, "burst": 2},
+    "sell": {"rate": 5.0, "burst": 3},
+    "cancel": {"rate": 5.0, "burst": 5},
+    "trade": {"rate": 1.0, "burst": 2},
+    "ticktick": {"rate": 3.0, "burst": 1},
+}
+RATE_LIMITS = {**DEFAULT_RATE_LIMITS, **(_config.get("RATE_LIMITS") or {})}
+RATE_LIMIT_BACKOFF_FACTOR = _config.get("RATE_LIMIT_BACKOFF_FACTOR", 0.5)
+RATE_LIMIT_RECOVERY_STEP = _config.get("RATE_LIMIT_RECOVERY_STEP", 0.05)
+RATE_LIMIT_MIN_RATE = _config.get("RATE_LIMIT_MIN_RATE", 0.05)
+
+# aiosteampy method name -> endpoint class, used by steam_api_call_with_retry
+ENDPOINT_BY_METHOD = {
+    "get_item_orders_histogram": "histogram",
+    "get_market_search_results": "search",
+    "get_inventory": "inventory",
+    "get_user_inventory": "inventory",
+    "get_item_listings": "inventory",
+    "place_sell_listing": "sell",
+    "confirm_sell_listing": "sell",
+    "get_confirmations": "sell",
+    "allow_confirmation": "sell",
+    "allow_multiple_confirmations": "sell",
+    "cancel_sell_listing": "cancel",
+    "get_my_listings": "cancel",
+    "make_trade_offer": "trade",
+    "accept_trade_offer": "trade",
+    "decline_trade_offer": "trade",
+    "cancel_trade_offer": "trade",
+    "get_trade_token": "trade",
+}
+
+# A 429 status in an error message: leading as in aiohttp's "429, message=...",
+# or right after a status keyword, so asset ids or prices containing 429 don't match
+_THROTTLED_MESSAGE = re.compile(
+    r"too many requests"
+    r"|^\s*429\b"
+    r"|\b(?:status(?: code)?|code|error|http(?:/\d(?:\.\d)?)?)\W{0,3}429\b",
+    re.IGNORECASE,
+)
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """True for errors that mean the endpoint is being hit too hard (429 or 5xx)."""
+    if isinstance(error, RateLimitExceeded):
+        return True
+    status = getattr(error, "status", None)
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return True
+    return is_throttling_message(str(error))
+
+
+def is_throttling_message(message: str) -> bool:
+    """True if an error message reports a 429 / Too Many Requests response."""
+    return _THROTTLED_MESSAGE.search(message) is not None
+
+
+class TokenBucket:
+    """
+    Token bucket for one (endpoint class, account/proxy) pair.
+
+    The refill rate is cut by RATE_LIMIT_BACKOFF_FACTOR on every throttled
+    response and recovers by RATE_LIMIT_RECOVERY_STEP of the base rate on every
+    successful one, so callers settle just under what Steam tolerates.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Waits for a token and returns how many seconds were spent waiting."""
+        waited = 0.0
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    self.total_wait += waited
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def on_success(self) -> None:
+        if self.rate < self.base_rate:
+            self.rate = min(
+                self.base_rate, self.rate + self.base_rate * RATE_LIMIT_RECOVERY_STEP
+            )
+
+    def on_throttled(self, retry_after: float | None = None) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        self.throttled += 1
+        self.rate = max(RATE_LIMIT_MIN_RATE, self.rate * RATE_LIMIT_BACKOFF_FACTOR)
+        self.tokens = 0.0
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self.blocked_until = max(self.blocked_until, now + pause)
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "rate": round(self.rate, 3),
+            "base_rate": self.base_rate,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "total_wait_seconds": round(self.total_wait, 2),
+        }
+
+
+class RateLimiter:
+    """Token buckets keyed by endpoint class and account/proxy, created on first use."""
+
+    def __init__(self, limits: dict[str, dict[str, float]]):
+        self.limits = limits
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+
+    def bucket(self, endpoint: str, key: str = "global") -> TokenBucket | None:
+        """Returns the bucket for this endpoint class and key, or None if the endpoint is not limited."""
+        limit = self.limits.get(endpoint)
+        if limit is None:
+            return None
+        bucket = self._buckets.get((endpoint, key))
+        if bucket is None:
+            bucket = TokenBucket(limit["rate"], limit["burst"])
+            self._buckets[(endpoint, key)] = bucket
+        return bucket
+
+    async def acquire(self, endpoint: str, key: str = "global") -> float:
+        """Waits until a request to this endpoint class may be sent for this account/proxy."""
+        bucket = self.bucket(endpoint, key)
+        if bucket is None:
+            return 0.0
+        waited = await bucket.acquire()
+        if waited > 1:
+            logger.trace(f"Waited {waited:.2f}s for a {endpoint} token for {key}")
+        return waited
+
+    def report(
+        self,
+        endpoint: str,
+        key: str = "global",
+        error: BaseException | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Feeds the outcome of a request back into its bucket."""
+        bucket = self.bucket(endpoint, key)
+        if bucket is None:
+            return
+        if error is None:
+            bucket.on_success()
+        elif is_throttling_error(error):
+            bucket.on_throttled(retry_after)
+            logger.warning(
+                f"Throttled on {endpoint} for {key}, slowing to {bucket.rate:.2f} requests/s"
+            )
+
+    def penalize(
+        self, endpoint: str, key: str = "global", retry_after: float | None = None
+    ) -> None:
+        """Backs off an endpoint after a failure that was not classified as throttling."""
+        bucket = self.bucket(endpoint, key)
+        if bucket is not None:
+            bucket.on_throttled(retry_after)
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        return {
+            f"{endpoint}/{key}": bucket.stats()
+            for (endpoint, key), bucket in self._buckets.items()
+        }
+
+
+rate_limiter = RateLimiter(RATE_LIMITS)
+
+
+def get_rate_limiter_stats() -> dict[str, dict[str, float | int]]:
+    """Returns current rate, token grants, throttle events and total wait per bucket."""
+    return rate_limiter.stats()
@@ -0,0 +1,218 @@
+import asyncio
+import random
+import sys
+import time
+
+import yaml
+
+
+def load_config():
+    config_path = r"C:\Users\Sivasai\Documents\GitHub\CaseFarm\config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    return config
+
+
+_config = load_config()
+ROOT_DIR = _config["ROOT_DIR"]
+sys.path.insert(0, ROOT_DIR)
+import aiohttp
+from aiosteampy.constants import EResult
+from aiosteampy.exceptions import (
+    EResultError,
+    RateLimitExceeded,
+    SessionExpired,
+)
+
+from utils.logger import get_custom_logger
+from utils.rate_limiter import is_throttling_message
+
+logger = get_custom_logger()
+
+
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = _config.get("CIRCUIT_BREAKER_FAILURE_THRESHOLD", 5)
+CIRCUIT_BREAKER_RESET_SECONDS = _config.get("CIRCUIT_BREAKER_RESET_SECONDS", 120)
+RATE_LIMITED_MAX_BACKOFF_SECONDS = _config.get("RATE_LIMITED_MAX_BACKOFF_SECONDS", 120)
+
+# Error classes returned by classify_error
+TRANSIENT = "transient"  # retry soon with jitter
+RATE_LIMITED = "rate_limited"  # back off, honouring Retry-After when Steam sends it
+AUTH_EXPIRED = "auth_expired"  # refresh the session, then retry
+PERMANENT = "permanent"  # retrying cannot help, fail fast
+
+# Market errors that mean the request itself is wrong for the current item state
+PERMANENT_MESSAGES = (
+    "no longer in your inventory",
+    "you already have a listing for this item pending confirmation",
+)
+
+TRANSIENT_ERESULTS = {
+    EResult.FAIL,
+    EResult.BUSY,
+    EResult.TIMEOUT,
+    EResult.SERVICE_UNAVAILABLE,
+    EResult.TRY_ANOTHER_CM,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Steam while an account's or proxy's circuit breaker is open."""
+
+
+def classify_error(error: BaseException) -> str:
+    """Sorts an exception from a Steam call into TRANSIENT, RATE_LIMITED, AUTH_EXPIRED or PERMANENT."""
+    message = str(error).lower()
+    if any(text in message for text in PERMANENT_MESSAGES):
+        return PERMANENT
+
+    if isinstance(error, RateLimitExceeded):
+        return RATE_LIMITED
+    if isinstance(error, SessionExpired):
+        return AUTH_EXPIRED
+    if isinstance(error, EResultError):
+        if error.result == EResult.RATE_LIMIT_EXCEEDED:
+            return RATE_LIMITED
+        if error.result in (EResult.NOT_LOGGED_ON, EResult.EXPIRED):
+            return AUTH_EXPIRED
+        return TRANSIENT if error.result in TRANSIENT_ERESULTS else PERMANENT
+
+    status = getattr(error, "status", None)
+    if isinstance(status, int):
+        if status == 429:
+            return RATE_LIMITED
+        if status in (401, 403):
+            return AUTH_EXPIRED
+        if status >= 500:
+            return TRANSIENT
+        if 400 <= status < 500:
+            return PERMANENT
+
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError, ConnectionError)):
+        return TRANSIENT
+    if isinstance(error, (TypeError, ValueError, KeyError, AttributeError)):
+        return PERMANENT
+    if is_throttling_message(message):
+        return RATE_LIMITED
+
+    # Unknown errors get a short retry first; the caller escalates to a session refresh
+    return TRANSIENT
+
+
+def retry_after_hint(error: BaseException) -> float | None:
+    """Seconds to wait taken from a Retry-After header on the error, if there is one."""
+    headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(error_class: str, attempt: int, hint: float | None = None) -> float:
+    """How long to wait before retry number `attempt` (starting at 1) for this error class."""
+    if error_class == RATE_LIMITED:
+        base = hint if hint is not None else 5 * 2 ** (attempt - 1)
+        return min(RATE_LIMITED_MAX_BACKOFF_SECONDS, base) * random.uniform(1.0, 1.25)
+    if error_class == AUTH_EXPIRED:
+        return random.uniform(1, 3)
+    # Full jitter around a small exponential step
+    return random.uniform(0, min(5.0, 0.5 * 2**attempt))
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and rejects calls for
+    reset_seconds. After that one trial call is let through (half-open): a
+    success closes the breaker again and a failure reopens it.
+
+    Callers check ready() on every breaker involved first and only then reserve
+    the trials with reserve_trial(), releasing them with release_trial() on any
+    exit that recorded neither a success nor a failure (permanent errors,
+    cancellation), so a half-open breaker never stays reserved forever.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        # Token of the caller holding the half-open trial, None if nobody does
+        self._trial: object | None = None
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    @property
+    def trial_in_flight(self) -> bool:
+        return self._trial is not None
+
+    def ready(self) -> bool:
+        """True if a call would be let through now. Reserves nothing."""
+        state = self.state
+        return state == "closed" or (state == "half_open" and self._trial is None)
+
+    def reserve_trial(self) -> object | None:
+        """Takes the half-open trial and returns its token, or None if no trial is needed or free."""
+        if self.state != "half_open" or self._trial is not None:
+            return None
+        self._trial = object()
+        return self._trial
+
+    def release_trial(self, trial: object | None) -> None:
+        """Frees a trial taken with reserve_trial() whose outcome was never recorded."""
+        if trial is not None and self._trial is trial:
+            self._trial = None
+
+    def allow(self) -> bool:
+        if not self.ready():
+            return False
+        self.reserve_trial()
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._trial is not None:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+        self._trial = None
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(key: str) -> CircuitBreaker:
+    """Returns the circuit breaker for a key such as "account:<username>" or "proxy:<host:port#hash>"."""
+    breaker = _breakers.get(key)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_RESET_SECONDS
+        )
+        _breakers[key] = breaker
+    return breaker
+
+
+def get_circuit_breaker_stats() -> dict[str, dict[str, int | str]]:
+    """Returns state, consecutive failures and open count for every breaker that has failed at least once."""
+    return {
+        key: {
+            "state": breaker.state,
+            "failures": breaker.failures,
+            "times_opened": breaker.times_opened,
+        }
+        for key, breaker in _breakers.items()
+        if breaker.failures or breaker.times_opened
+    }